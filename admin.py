@@ -0,0 +1,169 @@
+import hmac
+import os
+import tempfile
+from datetime import date, timedelta
+
+import streamlit as st
+
+from export import EXPORT_FORMATS, EXPORT_MIME, export_table
+from metrics import is_enabled as metrics_enabled
+from metrics import registry
+from rate_limit import ACCEPTED, outcome_counts
+from storage import ADMIN_TABLES, count_rows, daily_counts, page_rows
+
+# Páginas internas que no aparecen en la navegación de la web (web.py?admin=...).
+# Requieren la contraseña de ADMIN_PASSWORD (en el entorno o en .env); sin ella quedan desactivadas.
+
+ADMIN_VIEWS = ("dashboard", "metrics")
+ADMIN_PAGE_SIZE = 50
+
+# Periodos de la gráfica de altas por día (etiqueta -> días; None es todo el histórico)
+ADMIN_PERIODS = {"Últimos 30 días": 30, "Últimos 90 días": 90, "Último año": 365, "Todo": None}
+
+
+# Pide la contraseña de administración una vez por sesión. Devuelve True si la sesión está autenticada.
+def require_admin():
+    password = os.getenv("ADMIN_PASSWORD")
+    if not password:
+        st.error("El panel de administración no está configurado (falta ADMIN_PASSWORD).")
+        return False
+    if st.session_state.get("admin_authenticated"):
+        return True
+
+    with st.form("admin_login"):
+        attempt = st.text_input("Contraseña", type="password")
+        submitted = st.form_submit_button("Entrar")
+    if submitted:
+        if hmac.compare_digest(attempt.encode(), password.encode()):
+            st.session_state["admin_authenticated"] = True
+            st.rerun()
+        st.error("Contraseña incorrecta.")
+    return False
+
+
+# Punto de entrada de las páginas de administración
+def admin_page(view):
+    st.title("Administración")
+    if view not in ADMIN_VIEWS or not require_admin():
+        return
+    if view == "metrics":
+        metrics_page()
+    else:
+        dashboard_page()
+
+
+# Panel de newsletter y contactos: altas por día, navegación por páginas y exportación
+def dashboard_page():
+    outcomes = outcome_counts()
+    newsletter_col, contacts_col, accepted_col, rejected_col = st.columns(4)
+    newsletter_col.metric("Suscriptores", count_rows("newsletter"))
+    contacts_col.metric("Mensajes de contacto", count_rows("contacts"))
+    # Envíos de contacto desde el arranque del proceso (los rechazados no llegan a la base de datos)
+    accepted_col.metric("Envíos aceptados", outcomes.get(ACCEPTED, 0))
+    rejected_col.metric("Envíos rechazados", sum(outcomes.values()) - outcomes.get(ACCEPTED, 0))
+
+    # Altas por día, agregadas en SQLite: solo llega a Python una fila por día
+    period = st.selectbox("Periodo", list(ADMIN_PERIODS))
+    days = ADMIN_PERIODS[period]
+    since = (date.today() - timedelta(days=days)).isoformat() if days else None
+    per_day = {}
+    for table in ADMIN_TABLES:
+        for day, count in daily_counts(table, since):
+            per_day.setdefault(day, dict.fromkeys(ADMIN_TABLES, 0))[table] = count
+    if per_day:
+        chart = {"día": list(per_day)}
+        for table in ADMIN_TABLES:
+            chart[table] = [counts[table] for counts in per_day.values()]
+        st.bar_chart(chart, x="día", y=list(ADMIN_TABLES))
+    else:
+        st.info("No hay altas en este periodo.")
+
+    table = st.radio("Tabla", list(ADMIN_TABLES), horizontal=True)
+    browse_table(table)
+    export_buttons(table)
+
+
+# Avanzar o retroceder una página; la sesión guarda la pila de cursores de las páginas visitadas
+def _next_admin_page(table, cursor):
+    st.session_state.setdefault("admin_cursors", {}).setdefault(table, []).append(cursor)
+
+
+def _previous_admin_page(table):
+    st.session_state.setdefault("admin_cursors", {}).setdefault(table, []).pop()
+
+
+# Listado de la tabla de la fila más reciente a la más antigua, ADMIN_PAGE_SIZE filas por página
+def browse_table(table):
+    cursors = st.session_state.setdefault("admin_cursors", {}).setdefault(table, [])
+    before_id = cursors[-1] if cursors else None
+    rows, next_cursor = page_rows(table, before_id, ADMIN_PAGE_SIZE)
+
+    columns = ADMIN_TABLES[table]
+    st.dataframe([dict(zip(columns, row)) for row in rows], hide_index=True)
+
+    previous_col, info_col, next_col = st.columns([1, 2, 1])
+    previous_col.button("← Más recientes", key=f"admin_previous_{table}", disabled=not cursors,
+                        on_click=_previous_admin_page, args=(table,))
+    info_col.markdown(f"<p style='text-align: center;'>Página {len(cursors) + 1}</p>", unsafe_allow_html=True)
+    next_col.button("Más antiguos →", key=f"admin_next_{table}", disabled=next_cursor is None,
+                    on_click=_next_admin_page, args=(table, next_cursor))
+
+
+# Genera la exportación al pulsar el botón (Streamlit ejecuta la función solo entonces, dentro de la
+# sesión de administración). Las filas se escriben por bloques en un fichero temporal fuera de static/,
+# que se lee entero y se borra antes de devolver los bytes.
+def _export_file(table, fmt):
+    def generate():
+        fd, path = tempfile.mkstemp(suffix=f".{fmt}")
+        os.close(fd)
+        try:
+            export_table(table, fmt, path)
+            with open(path, "rb") as f:
+                return f.read()
+        finally:
+            os.remove(path)
+    return generate
+
+
+# Botones de descarga de la tabla completa
+def export_buttons(table):
+    for column, fmt in zip(st.columns(len(EXPORT_FORMATS)), EXPORT_FORMATS):
+        column.download_button(
+            f"Exportar {fmt.upper()}",
+            _export_file(table, fmt),
+            file_name=f"{table}.{fmt}",
+            mime=EXPORT_MIME[fmt],
+            key=f"admin_export_{table}_{fmt}",
+        )
+
+
+# Métricas de instrumentación (solo con METRICS_ENABLED=1)
+def metrics_page():
+    st.header("Métricas")
+    if not metrics_enabled():
+        st.info("La instrumentación está desactivada (METRICS_ENABLED=1 para activarla).")
+        return
+    st.caption("Histogramas acumulados en este proceso desde su arranque. Los cuantiles son el límite "
+               "superior del bucket en el que caen.")
+
+    rows = registry.summary()
+    if rows:
+        st.dataframe(
+            [
+                {"métrica": name, "etiquetas": labels, "n": count, "media": mean,
+                 "p50": p50, "p95": p95, "p99": p99}
+                for name, labels, count, mean, p50, p95, p99 in rows
+            ],
+            hide_index=True,
+        )
+    else:
+        st.info("Todavía no hay mediciones.")
+
+    text = registry.prometheus_text()
+    st.download_button("Descargar volcado Prometheus", text, file_name="analytiq_metrics.txt", mime="text/plain")
+    with st.expander("Volcado en formato Prometheus"):
+        st.code(text, language="text")
+
+    if st.button("Reiniciar métricas"):
+        registry.reset()
+        st.rerun()
@@ -0,0 +1,275 @@
+import base64
+import hashlib
+import mimetypes
+import os
+import threading
+
+from metrics import stage
+
+# Caché de assets estáticos compartida por todo el proceso.
+# Cada entrada se indexa por ruta y se invalida cuando cambia el mtime o el tamaño del fichero,
+# de modo que los bytes se leen una sola vez y nunca se decodifican ni se vuelven a codificar.
+_cache = {}
+_lock = threading.Lock()
+
+# Firmas de los formatos de imagen más comunes (la extensión no siempre coincide con el contenido)
+_MAGIC_MIME = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF8", "image/gif"),
+    (b"\x00\x00\x01\x00", "image/x-icon"),
+)
+
+
+# Huella del fichero en disco para detectar cambios sin leerlo
+def _fingerprint(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+# Tipo MIME real del fichero: primero por firma de contenido, después por extensión
+def _sniff_mime(path, data):
+    for magic, mime in _MAGIC_MIME:
+        if data.startswith(magic):
+            return mime
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if data[4:12] in (b"ftypavif", b"ftypavis"):
+        return "image/avif"
+    return mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+# Devuelve la entrada cacheada del asset, recargándola solo si el fichero ha cambiado
+def load_asset(path):
+    fingerprint = _fingerprint(path)
+    with _lock:
+        entry = _cache.get(path)
+        if entry is not None and entry["fingerprint"] == fingerprint:
+            return entry
+
+    with open(path, "rb") as f:
+        data = f.read()
+    mime = _sniff_mime(path, data)
+    entry = {
+        "fingerprint": fingerprint,
+        "bytes": data,
+        "hash": hashlib.sha256(data).hexdigest(),
+        "mime": mime,
+        "data_uri": None,
+    }
+    with _lock:
+        _cache[path] = entry
+    return entry
+
+
+# Bytes originales del asset, tal cual están en disco
+def asset_bytes(path):
+    return load_asset(path)["bytes"]
+
+
+# Hash de contenido del asset (sha256 en hexadecimal)
+def asset_hash(path):
+    return load_asset(path)["hash"]
+
+
+# Forma data-URI (base64) del asset, calculada una sola vez por versión del fichero
+def asset_data_uri(path):
+    entry = load_asset(path)
+    if entry["data_uri"] is None:
+        encoded = base64.b64encode(entry["bytes"]).decode()
+        entry["data_uri"] = f"data:{entry['mime']};base64,{encoded}"
+    return entry["data_uri"]
+
+
+# URL del asset en el almacén de medios de Streamlit (/media/...), el mismo que usa st.image.
+# El fichero se guarda una vez por proceso (su id sale del contenido) y cada sesión solo recibe
+# la URL, no una copia en base64. None si no hay servidor de Streamlit (scripts, AppTest).
+def media_url(path, coordinates):
+    from streamlit import runtime
+
+    if not runtime.exists():
+        return None
+    entry = load_asset(path)
+    return runtime.get_instance().media_file_mgr.add(entry["bytes"], entry["mime"], coordinates)
+
+
+# Vacía la caché (útil al desplegar nuevos assets sin reiniciar el proceso)
+def clear_asset_cache():
+    with _lock:
+        _cache.clear()
+
+
+# ---------------------------------------------------------------------------
+# Derivados responsive de imágenes
+# ---------------------------------------------------------------------------
+
+# Carpeta de la caché en disco de derivados (direccionada por contenido)
+DERIVATIVES_DIR = os.path.join(".cache", "images")
+
+# Formatos de salida soportados: extensión y parámetros de compresión de Pillow
+DERIVATIVE_FORMATS = {
+    "WEBP": {"ext": ".webp", "params": {"quality": 80, "method": 6}},
+    "AVIF": {"ext": ".avif", "params": {"quality": 60}},
+}
+
+# Anchos objetivo pregenerados por la CLI (px)
+DEFAULT_WIDTHS = (240, 480, 800, 1200, 1600)
+
+# Imágenes de las páginas que se pregeneran en el paso offline
+PAGE_IMAGES = (
+    "Logos/AnalytIQ.png",
+    "Logos/cabecera.png",
+    "Logos/inicio.png",
+    "Logos/make.png",
+    "Logos/PowerBI.png",
+)
+
+mimetypes.add_type("image/webp", ".webp")
+mimetypes.add_type("image/avif", ".avif")
+
+_variant_lock = threading.Lock()
+_best_cache = {}
+
+
+# Comprueba si Pillow puede codificar el formato indicado (AVIF depende de la compilación)
+def _format_supported(fmt):
+    from PIL import features
+
+    return fmt != "AVIF" or bool(features.check("avif"))
+
+
+# Ruta en disco del derivado: el nombre depende del hash del original y de los parámetros
+def _variant_path(path, width, fmt):
+    spec = DERIVATIVE_FORMATS[fmt]
+    key = f"{asset_hash(path)}:{width}:{fmt}:{sorted(spec['params'].items())}"
+    digest = hashlib.sha256(key.encode()).hexdigest()[:24]
+    return os.path.join(DERIVATIVES_DIR, digest + spec["ext"])
+
+
+# Genera (si no existe ya) el derivado de `path` reescalado a `width` px en el formato `fmt`
+def build_variant(path, width, fmt="WEBP"):
+    from PIL import Image
+
+    target = _variant_path(path, width, fmt)
+    if os.path.exists(target):
+        return target
+
+    with _variant_lock:
+        if os.path.exists(target):
+            return target
+        os.makedirs(DERIVATIVES_DIR, exist_ok=True)
+        with Image.open(path) as image:
+            if image.width > width:
+                height = round(image.height * width / image.width)
+                image = image.resize((width, height), Image.LANCZOS)
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA")
+            # Escritura atómica para que otra sesión nunca lea un fichero a medias
+            tmp = target + ".tmp"
+            with stage("image_encode"):
+                image.save(tmp, format=fmt, **DERIVATIVE_FORMATS[fmt]["params"])
+            os.replace(tmp, target)
+    return target
+
+
+# Devuelve la variante más ligera que cubre `display_width` px (o el original si ninguna lo mejora).
+# Por defecto solo WebP: es la única variante que se sirve sola (st.image y url() del CSS no tienen
+# alternativa para navegadores sin AVIF) y el PNG original queda como último recurso.
+# Con build=False (la web) solo se usan derivados ya generados: la codificación no se hace nunca
+# durante una petición (build_all_variants los genera al desplegar o al arrancar el proceso) y,
+# mientras tanto, se sirve el original.
+def best_variant(path, display_width, formats=("WEBP",), build=False):
+    key = (path, _fingerprint(path), display_width, tuple(formats))
+    cached = _best_cache.get(key)
+    if cached is not None and os.path.exists(cached):
+        return cached
+
+    from PIL import Image
+
+    with Image.open(path) as image:
+        source_width = image.width
+    width = min(display_width, source_width)
+
+    best = path
+    best_size = os.path.getsize(path)
+    complete = True
+    for fmt in formats:
+        if not _format_supported(fmt):
+            continue
+        if build:
+            try:
+                candidate = build_variant(path, width, fmt)
+            except (OSError, ValueError):
+                continue
+        else:
+            candidate = _variant_path(path, width, fmt)
+            if not os.path.exists(candidate):
+                complete = False
+                continue
+        size = os.path.getsize(candidate)
+        if size < best_size:
+            best, best_size = candidate, size
+    # Si falta algún derivado no se guarda la elección: se repite cuando ya estén generados
+    if complete:
+        _best_cache[key] = best
+    return best
+
+
+# Paso offline: pregenera todos los derivados para que ninguna visita pague la conversión
+def build_all_variants(paths=PAGE_IMAGES, widths=DEFAULT_WIDTHS, formats=("WEBP",)):
+    from PIL import Image
+
+    built = []
+    for path in paths:
+        with Image.open(path) as image:
+            source_width = image.width
+        # Los anchos mayores que el original producirían el mismo derivado
+        for width in sorted({min(width, source_width) for width in widths}):
+            for fmt in formats:
+                if _format_supported(fmt):
+                    built.append(build_variant(path, width, fmt))
+    return built
+
+
+# ---------------------------------------------------------------------------
+# Publicación como fichero estático de Streamlit
+# ---------------------------------------------------------------------------
+
+# Carpeta servida por Streamlit en /app/static (requiere server.enableStaticServing)
+STATIC_DIR = "static"
+GENERATED_STATIC_DIR = os.path.join(STATIC_DIR, "generated")
+
+_published = {}
+
+
+# Escribe `data` en la carpeta estática con un nombre derivado de su contenido y devuelve su URL
+def publish_static(data, ext, digest=None):
+    digest = digest or hashlib.sha256(data).hexdigest()
+    url = _published.get(digest)
+    if url is not None:
+        return url
+
+    name = digest[:16] + ext
+    target = os.path.join(GENERATED_STATIC_DIR, name)
+    if not os.path.exists(target):
+        os.makedirs(GENERATED_STATIC_DIR, exist_ok=True)
+        tmp = target + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, target)
+    url = f"app/static/generated/{name}"
+    _published[digest] = url
+    return url
+
+
+# Copia el asset a la carpeta estática con un nombre derivado de su contenido y devuelve su URL.
+# El navegador lo descarga una vez y lo reutiliza de su caché en todos los reruns y sesiones.
+def static_url(path):
+    entry = load_asset(path)
+    ext = os.path.splitext(path)[1] or mimetypes.guess_extension(entry["mime"]) or ""
+    return publish_static(entry["bytes"], ext, entry["hash"])
+
+
+if __name__ == "__main__":
+    for variant in build_all_variants():
+        print(f"{os.path.getsize(variant):>9} {variant}")
@@ -0,0 +1,165 @@
+# Backends de almacenamiento (storage.py): SQLite frente a PostgreSQL.
+#
+#   1. Conformidad: la misma secuencia de altas, contactos, consultas del panel y envíos de la
+#      newsletter debe dar exactamente los mismos resultados con los dos backends.
+#   2. Réplicas: --replicas procesos independientes envían contactos a la vez por el escritor en
+#      segundo plano contra la misma base de datos; no se debe perder ninguno.
+#
+# PostgreSQL: --postgres-url, DATABASE_URL o, si está instalado pgserver, un servidor temporal.
+# Requiere psycopg 3 (pip install "psycopg[binary]").
+# Uso: python benchmarks/bench_backends.py --replicas 4 --contacts 2000
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import storage  # noqa: E402
+from postgres import display_location, is_postgres_url  # noqa: E402
+from write_behind import get_writer  # noqa: E402
+
+FLOOD = "Hola, somos una agencia SEO y podemos posicionar su web en el top {} de Google en pocos días."
+
+
+# Vacía las tablas para que los dos backends partan del mismo estado (ids incluidos)
+def reset(location):
+    tables = ("newsletter_deliveries", "newsletter_issues", "contacts", "newsletter")
+    with storage.connect_to_database(location) as conn:
+        with conn:
+            for table in tables:
+                if is_postgres_url(location):
+                    conn.execute(f"TRUNCATE {table} RESTART IDENTITY CASCADE;")
+                else:
+                    conn.execute(f"DELETE FROM {table};")
+                    conn.execute("DELETE FROM sqlite_sequence WHERE name = ?;", (table,))
+
+
+# Secuencia de operaciones de la aplicación; devuelve sus resultados (sin fechas, que dependen del reloj)
+def scenario(location):
+    reset(location)
+    results = {}
+    results["subscribe"] = [
+        storage.subscribe("Ana", "ana@example.com", location),
+        storage.subscribe("Ana", " ANA@example.com ", location),
+        storage.subscribe("Luis", "no-es-un-correo", location),
+    ]
+    writer = get_writer(location)
+    futures = [writer.submit_subscriber(f"Suscriptor {i}", f"user{i}@example.com") for i in range(20)]
+    futures.append(writer.submit_subscriber("Repetido", "user3@example.com"))
+    futures += [writer.submit_contact(f"Bot {i}", f"bot{i}@example.com", FLOOD.format(i)) for i in range(3)]
+    futures.append(writer.submit_contact("Marta", "marta@example.com", "Quería un presupuesto para un panel."))
+    writer.flush(timeout=30)
+    results["write_behind"] = [future.result() for future in futures]
+    results["registered"] = [storage.is_email_registered(email, location)
+                             for email in ("user7@example.com", "nadie@example.com")]
+    results["counts"] = [storage.count_rows(table, location) for table in storage.ADMIN_TABLES]
+    results["daily"] = [[count for _, count in storage.daily_counts(table, None, location)]
+                        for table in storage.ADMIN_TABLES]
+    rows, cursor = storage.page_rows("contacts", None, 3, location)
+    results["page"] = ([row[:5] for row in rows], cursor)
+    results["chunks"] = [[row[0] for row in chunk] for chunk in storage.iter_row_chunks("newsletter", 8, location)]
+    issue_id = storage.ensure_issue("numero-1", "Número 1", location)
+    results["issue"] = (issue_id, storage.ensure_issue("numero-1", "Número 1", location))
+    pending = [row[0] for chunk in storage.iter_pending_recipients(issue_id, 5, db_path=location) for row in chunk]
+    storage.record_deliveries(issue_id, [(subscriber_id, storage.DELIVERY_SENDING, None)
+                                         for subscriber_id in pending], location)
+    storage.record_deliveries(issue_id, [(pending[0], storage.DELIVERY_SENT, None),
+                                         (pending[1], storage.DELIVERY_DEFERRED, "421 ocupado")], location)
+    results["deliveries"] = storage.delivery_counts(issue_id, location)
+    results["retry"] = [row[0] for chunk in storage.iter_pending_recipients(issue_id, 5, db_path=location)
+                        for row in chunk]
+    return results
+
+
+# Proceso réplica: envía `count` contactos por su propio escritor y pool
+def replica(location, replica_id, count, ready, start):
+    get_writer(location)
+    storage.count_rows("contacts", location)
+    ready.wait()
+    start.wait()
+    writer = get_writer(location)
+    futures = [writer.submit_contact(f"Réplica {replica_id}", f"r{replica_id}-{i}@example.com",
+                                     f"Mensaje {i} de la réplica {replica_id}") for i in range(count)]
+    writer.flush(timeout=120)
+    if not all(future.result() for future in futures):
+        sys.exit(1)
+
+
+def run_replicas(location, replicas, contacts):
+    reset(location)
+    context = multiprocessing.get_context("spawn")
+    ready = context.Barrier(replicas + 1)
+    start = context.Barrier(replicas + 1)
+    processes = [context.Process(target=replica, args=(location, i, contacts, ready, start)) for i in range(replicas)]
+    for process in processes:
+        process.start()
+    ready.wait()
+    t0 = time.perf_counter()
+    start.wait()
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - t0
+    stored = storage.count_rows("contacts", location)
+    return elapsed, stored, all(process.exitcode == 0 for process in processes)
+
+
+def postgres_location(explicit, workdir):
+    url = explicit or os.getenv("DATABASE_URL")
+    if url:
+        return url, None
+    try:
+        import pgserver
+    except ImportError:
+        return None, None
+    server = pgserver.get_server(os.path.join(workdir, "pgdata"), cleanup_mode="stop")
+    return server.get_uri(), server
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--postgres-url")
+    parser.add_argument("--replicas", type=int, default=4)
+    parser.add_argument("--contacts", type=int, default=2000, help="contactos por réplica")
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as workdir:
+        sqlite_path = os.path.join(workdir, "newsletter.db")
+        pg_url, server = postgres_location(args.postgres_url, workdir)
+        locations = [("SQLite", sqlite_path)]
+        if pg_url:
+            locations.append(("PostgreSQL", pg_url))
+        else:
+            print("PostgreSQL no disponible (usa --postgres-url o instala pgserver): solo se prueba SQLite")
+
+        # 1. Conformidad
+        results = {label: scenario(location) for label, location in locations}
+        if len(results) == 2:
+            for key, value in results["SQLite"].items():
+                if results["PostgreSQL"][key] != value:
+                    failures.append(f"{key}: SQLite {value!r} frente a PostgreSQL {results['PostgreSQL'][key]!r}")
+            print(f"Conformidad: {len(results['SQLite'])} comprobaciones, {len(failures)} diferencias")
+
+        # 2. Réplicas escribiendo a la vez
+        total = args.replicas * args.contacts
+        for label, location in locations:
+            elapsed, stored, ok = run_replicas(location, args.replicas, args.contacts)
+            print(f"{label:<11} {args.replicas} réplicas: {stored}/{total} contactos en {elapsed:.2f} s "
+                  f"({stored / elapsed:.0f}/s)  [{display_location(location)}]")
+            if stored != total or not ok:
+                failures.append(f"{label}: {stored} de {total} contactos guardados")
+        if server is not None:
+            server.cleanup()
+
+    for failure in failures:
+        print(f"ERROR {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
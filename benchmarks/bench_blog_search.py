@@ -0,0 +1,85 @@
+# Benchmark de la búsqueda de texto completo del blog (search.py)
+# Genera un corpus sintético a partir de blog_entries.json, construye el índice y mide la latencia de consulta.
+#
+# Uso: python benchmarks/bench_blog_search.py --posts 10000 --queries 500
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from blog import BlogStore  # noqa: E402
+
+# Objetivo de latencia por consulta (ms)
+TARGET_P99_MS = 10.0
+
+
+# Corpus sintético: mezcla aleatoria de palabras de las entradas reales
+def synthetic_posts(count, seed=42):
+    with open(os.path.join(ROOT, "blog_entries.json"), "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    vocabulary = " ".join(f"{e['title']} {e['summary']} {e['content']}" for e in entries).split()
+    rng = random.Random(seed)
+    posts = []
+    for i in range(count):
+        posts.append({
+            "title": f"{' '.join(rng.choices(vocabulary, k=8))} {i}",
+            "date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "summary": " ".join(rng.choices(vocabulary, k=25)),
+            "content": " ".join(rng.choices(vocabulary, k=250)),
+            "emoji": "🤖",
+        })
+    return posts, vocabulary
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    posts, vocabulary = synthetic_posts(args.posts)
+    rng = random.Random(7)
+    queries = [" ".join(rng.choices(vocabulary, k=rng.randint(1, 3))) for _ in range(args.queries)]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "blog_entries.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(posts, f, ensure_ascii=False)
+
+        store = BlogStore(path)
+        t0 = time.perf_counter()
+        store.warm_search()
+        build_s = time.perf_counter() - t0
+
+        latencies = []
+        for query in queries:
+            t0 = time.perf_counter()
+            store.search(query)
+            latencies.append((time.perf_counter() - t0) * 1000)
+        latencies.sort()
+
+        # Reindexado incremental: se modifica una sola entrada
+        posts[0]["content"] += " actualizacion"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(posts, f, ensure_ascii=False)
+        t0 = time.perf_counter()
+        store.warm_search()
+        update_s = time.perf_counter() - t0
+
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"publicaciones: {args.posts}  construcción: {build_s:.2f} s  recarga con 1 cambio: {update_s:.2f} s")
+    print(f"consulta p50={p50:.3f} ms  p99={p99:.3f} ms  máx={latencies[-1]:.3f} ms")
+    if p99 > TARGET_P99_MS:
+        print(f"AVISO: p99 por encima del objetivo de {TARGET_P99_MS} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# Carga del blog desde blog_entries.json frente al snapshot de blog_snapshot.py
+# Para cada formato, un proceso nuevo abre el almacén, pinta la primera página del listado y
+# despliega una publicación, como la primera visita al Blog tras arrancar la aplicación.
+# Mide el tiempo hasta tener esa publicación y el pico de memoria de Python de la carga (con tracemalloc,
+# en una segunda carga para que la medición no altere el tiempo).
+#
+# Uso: python benchmarks/bench_blog_snapshot.py --posts 10000
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_blog_search import synthetic_posts  # noqa: E402
+from blog_snapshot import validate_post, write_snapshot  # noqa: E402
+
+# Código de cada proceso de medición: imprime segundos y pico de memoria de la carga (bytes)
+PROBE = """
+import sys, time, tracemalloc
+sys.path.insert(0, {root!r})
+from blog import BlogStore
+t0 = time.perf_counter()
+store = BlogStore({path!r})
+posts, _, _ = store.page(0, 5)
+store.get(posts[-1]["slug"])["content_html"]
+elapsed = time.perf_counter() - t0
+tracemalloc.start()
+store = BlogStore({path!r})
+posts, _, _ = store.page(0, 5)
+store.get(posts[-1]["slug"])["content_html"]
+print(elapsed, tracemalloc.get_traced_memory()[1])
+"""
+
+
+def probe(path):
+    output = subprocess.check_output([sys.executable, "-c", PROBE.format(root=ROOT, path=path)], text=True)
+    seconds, peak = output.split()
+    return float(seconds), int(peak)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=10_000)
+    args = parser.parse_args()
+
+    posts, _ = synthetic_posts(args.posts)
+    with tempfile.TemporaryDirectory() as workdir:
+        json_path = os.path.join(workdir, "blog_entries.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(posts, f, ensure_ascii=False)
+        snapshot_path = os.path.join(workdir, "blog.snapshot")
+        write_snapshot([validate_post(post) for post in posts], snapshot_path)
+
+        print(f"publicaciones: {args.posts}")
+        for label, path in (("JSON", json_path), ("snapshot", snapshot_path)):
+            seconds, peak = probe(path)
+            print(f"{label:<9} {os.path.getsize(path) / 1e6:>7.1f} MB  primera publicación: {seconds * 1000:>8.1f} ms  "
+                  f"pico de memoria: {peak / 2**20:>6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
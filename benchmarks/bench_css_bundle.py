@@ -0,0 +1,102 @@
+# Ahorro de la hoja de estilos única y las fuentes propias (bundle.py)
+# Compara, por página, los bytes de CSS que cada rerun enviaba en bloques <style> (con el @import de
+# Google Fonts) con la etiqueta <link> actual, y la latencia de la hoja de Google Fonts (otro dominio,
+# bloquea la primera pintura) con la de la hoja servida desde static/ por un servidor local.
+#
+# Uso: python benchmarks/bench_css_bundle.py --repeat 50
+import argparse
+import gzip
+import http.server
+import os
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+from functools import partial
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from bundle import FONT_FACES, FONTS_DIR, stylesheet_css, stylesheet_url  # noqa: E402
+from sections import CONTACT_CSS, GLOBAL_CSS, SERVICES_CSS, SIDEBAR_CSS, STYLESHEET_LINK_HTML  # noqa: E402
+
+GOOGLE_FONTS_CSS = "https://fonts.googleapis.com/css2?family=Nunito+Sans:ital,wght@0,300;1,900&display=swap"
+FONDO_URL = "app/static/generated/0123456789abcdef.avif"
+
+# Bloques de estilos que inyectaba cada página antes de la hoja única
+PAGE_STYLES = {
+    "Inicio": [],
+    "Servicios": [SERVICES_CSS],
+    "Demo": [SERVICES_CSS],
+    "Contacto": [CONTACT_CSS],
+    "Blog": [],
+    "Política y Términos": [],
+}
+
+
+# CSS en línea que enviaba un rerun de la página (bloques <style> sin minificar)
+def inline_css_bytes(page):
+    global_css = f"@import url('{GOOGLE_FONTS_CSS}');\n" + GLOBAL_CSS.format(fondo_url=FONDO_URL)
+    blocks = [global_css, SIDEBAR_CSS] + PAGE_STYLES[page]
+    return sum(len(f"<style>{css}</style>".encode()) for css in blocks)
+
+
+# Mediana en ms de `repeat` descargas de la URL (None si no hay conexión)
+def fetch_median_ms(url, repeat):
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        try:
+            with urllib.request.urlopen(url, timeout=5) as response:
+                response.read()
+        except OSError as exc:
+            return None, str(exc)
+        timings.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(timings), None
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    link_bytes = len(STYLESHEET_LINK_HTML.format(href=stylesheet_url(FONDO_URL)).encode())
+    print(f"{'página':<20} {'antes (B/rerun)':>16} {'ahora (B/rerun)':>16}")
+    for page in PAGE_STYLES:
+        print(f"{page:<20} {inline_css_bytes(page):>16} {link_bytes:>16}")
+
+    unminified = "\n".join([GLOBAL_CSS.format(fondo_url=FONDO_URL), SIDEBAR_CSS, SERVICES_CSS, CONTACT_CSS])
+    bundled = stylesheet_css(os.path.basename(FONDO_URL))
+    print(f"\nHoja única: {len(unminified.encode())} B sin minificar -> {len(bundled.encode())} B minificada "
+          f"({len(gzip.compress(bundled.encode()))} B con gzip); se descarga una vez por sesión")
+
+    fonts = [(name, os.path.join(FONTS_DIR, name)) for name, _, _ in FONT_FACES]
+    for name, path in fonts:
+        size = f"{os.path.getsize(path)} B" if os.path.exists(path) else "no generada (python bundle.py fonts ...)"
+        print(f"Fuente {name}: {size}")
+
+    # Latencia: hoja de Google Fonts (DNS + TLS con otro dominio) frente a static/ servida en local
+    handler = partial(QuietHandler, directory=os.path.join(ROOT, "static"))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    local_url = f"http://127.0.0.1:{server.server_port}/" + stylesheet_url(FONDO_URL).split("app/static/", 1)[1]
+    local_ms, _ = fetch_median_ms(local_url, args.repeat)
+    google_ms, error = fetch_median_ms(GOOGLE_FONTS_CSS, args.repeat)
+    server.shutdown()
+
+    print(f"\nHoja local (static/): mediana {local_ms:.2f} ms")
+    if google_ms is None:
+        print(f"Google Fonts: sin respuesta ({error}); con el @import la cabecera esperaba a este fallo")
+    else:
+        print(f"Google Fonts (solo la hoja, sin las fuentes): mediana {google_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# Envío de la newsletter (dispatch.py) contra un servidor SMTP local de pruebas (aiosmtpd).
+# El servidor acepta todos los correos, tarda --latency segundos en responder a cada uno (como un
+# proveedor real) y cuenta cuántos recibe cada destinatario.
+#
+#   1. Velocidad: envío a --subscribers suscriptores con 1 conexión y con --concurrency conexiones.
+#   2. Reanudación: un envío se interrumpe a mitad y se repite; ningún destinatario debe recibir
+#      el número dos veces y, con --resend-unconfirmed, todos deben acabar recibiéndolo.
+#   3. Cabeceras: un nombre con saltos de línea (CRLF) no debe añadir cabeceras al correo, ni al
+#      darse de alta ni si ya estaba guardado así en la base de datos.
+#
+# Requiere aiosmtpd y aiosmtplib.
+# Uso: python benchmarks/bench_dispatch.py --subscribers 2000 --concurrency 16 --latency 0.02
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import time
+from collections import Counter
+from email import policy
+from email.parser import BytesParser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from aiosmtpd.controller import Controller  # noqa: E402
+
+from blog import get_blog_store  # noqa: E402
+from dispatch import Issue, dispatch  # noqa: E402
+from migrations import apply_migrations  # noqa: E402
+from storage import (  # noqa: E402
+    DELIVERY_SENT,
+    connect_to_database,
+    delivery_counts,
+    ensure_issue,
+    subscriber_params,
+)
+
+INJECTED_NAME = "Eve\r\nReply-To: attacker@evil.com\r\nX-Injected: 1"
+
+
+class CountingHandler:
+    def __init__(self, latency):
+        self.latency = latency
+        self.received = Counter()
+        self.messages = {}
+
+    async def handle_DATA(self, server, session, envelope):
+        await asyncio.sleep(self.latency)
+        self.received.update(envelope.rcpt_tos)
+        for recipient in envelope.rcpt_tos:
+            self.messages[recipient] = envelope.content
+        return "250 OK"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def fresh_database(workdir, name, subscribers):
+    db_path = os.path.join(workdir, name)
+    apply_migrations(db_path)
+    rows = [(f"Suscriptor {i}", f"user{i}@example.com", f"user{i}@example.com") for i in range(subscribers)]
+    with connect_to_database(db_path) as conn:
+        with conn:
+            conn.executemany("INSERT INTO newsletter (name, email, email_normalized) VALUES (?, ?, ?);", rows)
+    return db_path
+
+
+def run(issue, db_path, settings, concurrency, timeout=None, resend_unconfirmed=False):
+    issue_id = ensure_issue(issue.slug, issue.subject, db_path)
+    coroutine = dispatch(issue, issue_id, settings, concurrency=concurrency, rate=0,
+                         resend_unconfirmed=resend_unconfirmed, db_path=db_path)
+    t0 = time.perf_counter()
+    try:
+        asyncio.run(asyncio.wait_for(coroutine, timeout))
+    except TimeoutError:
+        pass
+    return time.perf_counter() - t0, delivery_counts(issue_id, db_path)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subscribers", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.02, help="segundos que tarda el servidor por correo")
+    args = parser.parse_args()
+
+    handler = CountingHandler(args.latency)
+    port = free_port()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    settings = {"hostname": "127.0.0.1", "port": port, "timeout": 30}
+    store = get_blog_store()
+    issue = Issue(store.get(store.posts()[0]["slug"]), "analytiq.es@gmail.com", "https://analytiq.es/")
+
+    failures = []
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            # 1. Velocidad con una sola conexión y con varias
+            for concurrency in (1, args.concurrency):
+                handler.received.clear()
+                db_path = fresh_database(workdir, f"speed_{concurrency}.db", args.subscribers)
+                elapsed, counts = run(issue, db_path, settings, concurrency)
+                print(f"{concurrency:>3} conexiones: {counts.get(DELIVERY_SENT, 0)} enviados en {elapsed:.2f} s "
+                      f"({args.subscribers / elapsed:.0f} correos/s)")
+
+            # 2. Interrupción a mitad del envío y reanudación
+            handler.received.clear()
+            db_path = fresh_database(workdir, "resume.db", args.subscribers)
+            full_time = args.subscribers * args.latency / args.concurrency
+            _, counts = run(issue, db_path, settings, args.concurrency, timeout=full_time / 2)
+            print(f"\nInterrumpido a mitad: {counts}")
+            _, counts = run(issue, db_path, settings, args.concurrency)
+            print(f"Reanudado:            {counts}")
+            repeated = sum(1 for count in handler.received.values() if count > 1)
+            if repeated:
+                failures.append(f"{repeated} destinatarios recibieron el número más de una vez")
+            _, counts = run(issue, db_path, settings, args.concurrency, resend_unconfirmed=True)
+            repeated = sum(1 for count in handler.received.values() if count > 1)
+            print(f"Con --resend-unconfirmed: {counts}; recibidos {len(handler.received)} de {args.subscribers}, "
+                  f"{repeated} duplicados (entregados pero sin confirmar al interrumpir)")
+            if len(handler.received) != args.subscribers:
+                failures.append(f"solo {len(handler.received)} de {args.subscribers} destinatarios recibieron el número")
+
+            # 3. Nombre con CRLF: limpiado en el alta y, si ya estaba guardado, al generar el correo
+            params = subscriber_params(INJECTED_NAME, "eve@example.com")
+            if params is None or "\r" in params[0] or "\n" in params[0]:
+                failures.append(f"el alta no limpia el nombre con CRLF: {params!r}")
+            handler.messages.clear()
+            db_path = fresh_database(workdir, "headers.db", 0)
+            with connect_to_database(db_path) as conn:
+                with conn:
+                    conn.execute("INSERT INTO newsletter (name, email, email_normalized) VALUES (?, ?, ?);",
+                                 (INJECTED_NAME, "eve@example.com", "eve@example.com"))
+            run(issue, db_path, settings, 1)
+            raw = handler.messages.get("eve@example.com")
+            if raw is None:
+                failures.append("el destinatario con CRLF en el nombre no recibió el número")
+            else:
+                message = BytesParser(policy=policy.default).parsebytes(raw)
+                injected = [name for name in ("Reply-To", "X-Injected") if message[name] is not None]
+                print(f"\nNombre con CRLF: To: {message['To']}; cabeceras inyectadas: {injected or 'ninguna'}")
+                if injected or len(message.get_all("To", [])) != 1:
+                    failures.append(f"cabeceras inyectadas desde el nombre: {injected}")
+    finally:
+        controller.stop()
+
+    for failure in failures:
+        print(f"ERROR {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
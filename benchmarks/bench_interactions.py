@@ -0,0 +1,79 @@
+# Latencia por interacción: rerun completo de web.py frente a rerun parcial del fragmento
+# Con st.fragment, escribir en un formulario o pulsar sus botones solo ejecuta la función del
+# fragmento; antes cada interacción volvía a ejecutar web.py entero.
+#
+# Uso: python benchmarks/bench_interactions.py --repeat 30
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Fragmentos medidos: (página, función de forms.py)
+FRAGMENTS = [
+    ("Inicio", "newsletter_form"),
+    ("Servicios", "servicios_contact"),
+    ("Demo", "demo_contact"),
+    ("Contacto", "contacto_form"),
+]
+
+
+# Copia la app a un directorio temporal para no tocar newsletter.db ni las cachés del repositorio
+def copy_app(workdir):
+    for name in os.listdir(ROOT):
+        if name in (".git", ".cache", "newsletter.db", "benchmarks"):
+            continue
+        src = os.path.join(ROOT, name)
+        dst = os.path.join(workdir, name)
+        if os.path.isdir(src):
+            shutil.copytree(src, dst)
+        else:
+            shutil.copy(src, dst)
+
+
+# Mediana en ms de `repeat` ejecuciones de AppTest.run()
+def median_run_ms(app, repeat):
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        app.run()
+        timings.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(timings)
+
+
+# Script mínimo que solo ejecuta un fragmento (equivale a su rerun parcial)
+def fragment_script(function_name):
+    import forms
+
+    getattr(forms, function_name)()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        copy_app(workdir)
+        os.chdir(workdir)
+        sys.path.insert(0, workdir)
+
+        full_app = AppTest.from_file(os.path.join(workdir, "web.py"), default_timeout=60).run()
+        print(f"{'página':<12} {'rerun completo (ms)':>20} {'fragmento (ms)':>15}")
+        for page, function_name in FRAGMENTS:
+            full_app.sidebar.radio[0].set_value(page).run()
+            full_ms = median_run_ms(full_app, args.repeat)
+
+            fragment_app = AppTest.from_function(fragment_script, args=(function_name,), default_timeout=60).run()
+            fragment_ms = median_run_ms(fragment_app, args.repeat)
+            print(f"{page:<12} {full_ms:>20.2f} {fragment_ms:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# Mantenimiento de newsletter.db (maintenance.py) con la aplicación escribiendo a la vez.
+# Un hilo inserta contactos sin parar, como el formulario de Contacto, y se mide cuánto espera cada
+# inserción mientras se hace la copia de seguridad, el archivado y el VACUUM: por pasos (maintenance.py)
+# y de golpe (backup en un solo paso, DELETE de todos los contactos antiguos en una transacción y VACUUM
+# completo). Comprueba además que la copia está completa y que ningún contacto se pierde ni se duplica
+# al archivarlo.
+#
+# Uso: python benchmarks/bench_maintenance.py --contacts 200000
+import argparse
+import glob
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import maintenance  # noqa: E402
+from migrations import apply_migrations  # noqa: E402
+
+MESSAGE = "Hola, me gustaría recibir información sobre vuestros servicios de análisis de datos. " * 4
+
+
+# Base de datos con contactos repartidos por los últimos tres años
+def fresh_database(workdir, name, contacts):
+    db_path = os.path.join(workdir, name)
+    apply_migrations(db_path)
+    now = datetime.now(timezone.utc)
+    rng = random.Random(1)
+    rows = []
+    for i in range(contacts):
+        created_at = now - timedelta(seconds=rng.randrange(3 * 365 * 86400))
+        rows.append((f"Contacto {i}", f"user{i}@example.com", MESSAGE, created_at.strftime("%Y-%m-%d %H:%M:%S")))
+    rows.sort(key=lambda row: row[3])
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL;")
+    with conn:
+        conn.executemany("INSERT INTO contacts (name, email, message, created_at) VALUES (?, ?, ?, ?);", rows)
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+    conn.close()
+    return db_path
+
+
+# Hilo que inserta un contacto cada milisegundo y guarda cuánto tarda cada inserción
+class Writer(threading.Thread):
+    def __init__(self, db_path):
+        super().__init__(daemon=True)
+        self.db_path = db_path
+        self.latencies = []
+        self.inserted = 0
+        self.stopped = threading.Event()
+
+    def run(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        while not self.stopped.is_set():
+            t0 = time.perf_counter()
+            with conn:
+                conn.execute("INSERT INTO contacts (name, email, message) VALUES (?, ?, ?);",
+                             ("Nuevo", "nuevo@example.com", MESSAGE))
+            self.latencies.append(time.perf_counter() - t0)
+            self.inserted += 1
+            time.sleep(0.001)
+        conn.close()
+
+
+# Ejecuta operation con el hilo escritor activo; devuelve (segundos, latencias del escritor, inserciones)
+def with_writer(db_path, operation):
+    writer = Writer(db_path)
+    writer.start()
+    time.sleep(0.05)
+    t0 = time.perf_counter()
+    operation()
+    elapsed = time.perf_counter() - t0
+    writer.stopped.set()
+    writer.join()
+    return elapsed, writer.latencies, writer.inserted
+
+
+def report(label, elapsed, latencies):
+    latencies = sorted(latencies)
+    p99 = latencies[int(len(latencies) * 0.99)] if latencies else 0
+    print(f"  {label:<26} {elapsed:>7.2f} s   escritor p50 {statistics.median(latencies) * 1000:>6.2f} ms  "
+          f"p99 {p99 * 1000:>7.2f} ms  máx {latencies[-1] * 1000:>7.1f} ms")
+    return latencies[-1]
+
+
+def count(db_path, where=""):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM contacts {where};").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def naive_archive(db_path, cutoff):
+    conn = sqlite3.connect(db_path, timeout=30)
+    with conn:
+        conn.execute("DELETE FROM contacts WHERE created_at < ?;", (cutoff,))
+    conn.close()
+
+
+def full_vacuum(db_path):
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.execute("VACUUM;")
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--contacts", type=int, default=200_000)
+    parser.add_argument("--retention-days", type=int, default=365)
+    args = parser.parse_args()
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=args.retention_days)).strftime("%Y-%m-%d %H:%M:%S")
+
+    failures = []
+    with tempfile.TemporaryDirectory() as workdir:
+        # Por pasos: maintenance.py
+        db_path = fresh_database(workdir, "steps.db", args.contacts)
+        size = os.path.getsize(db_path)
+        old = count(db_path, f"WHERE created_at < '{cutoff}'")
+        print(f"{args.contacts} contactos ({old} con más de {args.retention_days} días), {size / 1e6:.1f} MB")
+        print("Por pasos (maintenance.py):")
+        backup_dir = os.path.join(workdir, "backups")
+        result = {}
+        elapsed, latencies, _ = with_writer(db_path, lambda: result.update(
+            backup=maintenance.backup(db_path, backup_dir)))
+        report(f"backup ({result['backup'][1]} reinicios)", elapsed, latencies)
+        backup_rows = count(result["backup"][0])
+        if backup_rows < args.contacts:
+            failures.append(f"la copia de seguridad tiene {backup_rows} contactos de {args.contacts}")
+        before = count(db_path)
+        archive_dir = os.path.join(workdir, "archive")
+        elapsed, latencies, inserted = with_writer(db_path, lambda: result.update(
+            archived=maintenance.archive_contacts(db_path, args.retention_days, archive_dir)))
+        report(f"archivado ({len(result['archived'])} meses)", elapsed, latencies)
+        archived_ids = []
+        for path in glob.glob(os.path.join(archive_dir, "*.db")):
+            conn = sqlite3.connect(path)
+            archived_ids.extend(row[0] for row in conn.execute("SELECT id FROM contacts;"))
+            conn.close()
+        if len(archived_ids) != old or len(set(archived_ids)) != old:
+            failures.append(f"archivados {len(archived_ids)} contactos ({len(set(archived_ids))} distintos) de {old}")
+        if count(db_path) + len(archived_ids) != before + inserted:
+            failures.append("la suma de la base de datos y los archivos no coincide con los contactos que había")
+        elapsed, latencies, _ = with_writer(db_path, lambda: result.update(
+            freed=maintenance.incremental_vacuum(db_path)))
+        report("VACUUM incremental", elapsed, latencies)
+        print(f"  tamaño: {size / 1e6:.1f} MB -> {maintenance._size(db_path) / 1e6:.1f} MB")
+
+        # De golpe
+        db_path = fresh_database(workdir, "naive.db", args.contacts)
+        print("De golpe:")
+        target = sqlite3.connect(os.path.join(workdir, "naive-backup.db"))
+        source = sqlite3.connect(db_path)
+        elapsed, latencies, _ = with_writer(db_path, lambda: source.backup(target))
+        source.close()
+        target.close()
+        report("backup en un paso", elapsed, latencies)
+        elapsed, latencies, _ = with_writer(db_path, lambda: naive_archive(db_path, cutoff))
+        report("DELETE en una transacción", elapsed, latencies)
+        elapsed, latencies, _ = with_writer(db_path, lambda: full_vacuum(db_path))
+        report("VACUUM completo", elapsed, latencies)
+
+    for failure in failures:
+        print(f"ERROR {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
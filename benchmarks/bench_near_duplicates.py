@@ -0,0 +1,123 @@
+# Detección de casi duplicados en los mensajes de contacto (near_duplicates.py).
+# Mezcla mensajes legítimos distintos entre sí con una avalancha de un bot que repite una plantilla
+# cambiando nombres, cifras y alguna palabra, y mide:
+#   - tiempo por mensaje de la comprobación con MinHash + LSH (firma, búsqueda e inserción en el índice)
+#   - avalancha detectada (todas las copias salvo la primera) y mensajes legítimos marcados por error
+#   - la misma decisión por comparación exacta de Jaccard con todos los mensajes anteriores, en una muestra
+# Falla (código 1) si la mediana supera 1 ms, si se detecta menos del 95 % de la avalancha o si se
+# marca más del 1 % de los mensajes legítimos.
+#
+# Uso: python benchmarks/bench_near_duplicates.py --legit 20000 --flood 5000
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from near_duplicates import SIMILARITY_THRESHOLD, NearDuplicateIndex, shingles  # noqa: E402
+
+WORDS = ("datos análisis empresa informe ventas clientes proyecto presupuesto reunión equipo panel métricas "
+         "predicción modelo almacén calidad integración automatizar procesos tienda campaña marketing stock "
+         "inventario facturación previsión temporada producción logística precios margen objetivos consulta "
+         "formación demo plazo coste licencia servidor nube seguridad migración hoja cálculo excel power").split()
+NAMES = ("Ana", "Luis", "Marta", "Javier", "Lucía", "Pablo", "Elena", "Carlos", "Sara", "Diego")
+FLOOD_TEMPLATE = ("Hola {name}, somos una agencia SEO y podemos posicionar su web en el top {n} de Google en "
+                  "{days} días. Más de {clients} clientes satisfechos. Escríbanos hoy y obtenga un {discount}% "
+                  "de descuento en su primer mes {extra}.")
+FLOOD_EXTRAS = ("", "sin compromiso", "garantizado", "por tiempo limitado", "solo esta semana")
+
+
+def legit_message(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(15, 60))).capitalize() + "."
+
+
+def flood_message(rng):
+    return FLOOD_TEMPLATE.format(name=rng.choice(NAMES), n=rng.randint(1, 10), days=rng.randint(7, 90),
+                                 clients=rng.randint(100, 999), discount=rng.choice((10, 20, 30, 50)),
+                                 extra=rng.choice(FLOOD_EXTRAS))
+
+
+# Jaccard exacta con todos los mensajes anteriores (lo que haría una comparación por pares)
+def pairwise_is_duplicate(values, previous):
+    current = set(values.tolist())
+    for other in previous:
+        if len(current & other) / len(current | other) >= SIMILARITY_THRESHOLD:
+            return True
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--legit", type=int, default=20_000)
+    parser.add_argument("--flood", type=int, default=5_000)
+    parser.add_argument("--pairwise-sample", type=int, default=2_000, help="mensajes de la comparación por pares")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    messages = [(legit_message(rng), False) for _ in range(args.legit)]
+    messages += [(flood_message(rng), True) for _ in range(args.flood)]
+    rng.shuffle(messages)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = os.path.join(workdir, "newsletter.db")
+        index = NearDuplicateIndex(db_path)
+        index.load()
+        timings = []
+        flagged_flood = flagged_legit = 0
+        for message, is_flood in messages:
+            t0 = time.perf_counter()
+            signature, similarity = index.check(message)
+            timings.append(time.perf_counter() - t0)
+            # Con CONTACT_NEAR_DUPLICATES=flag todos los mensajes se guardan y pasan al índice
+            if signature is not None:
+                index.add(signature)
+            if similarity >= SIMILARITY_THRESHOLD:
+                if is_flood:
+                    flagged_flood += 1
+                else:
+                    flagged_legit += 1
+
+    timings.sort()
+    p50 = statistics.median(timings)
+    p99 = timings[int(len(timings) * 0.99)]
+    recall = flagged_flood / max(args.flood - 1, 1)
+    false_positive = flagged_legit / max(args.legit, 1)
+    print(f"{len(messages)} mensajes ({args.legit} legítimos, {args.flood} de la avalancha), índice: {len(index)}")
+    print(f"MinHash + LSH: p50 {p50 * 1e6:.0f} µs  p99 {p99 * 1e6:.0f} µs por mensaje")
+    print(f"avalancha detectada: {flagged_flood} ({recall:.1%}); legítimos marcados: {flagged_legit} "
+          f"({false_positive:.2%})")
+
+    # Comparación por pares con los mensajes anteriores: el coste crece con el historial
+    sample = messages[:args.pairwise_sample]
+    previous = []
+    t0 = time.perf_counter()
+    for message, _ in sample:
+        values = shingles(message)
+        if values is None:
+            continue
+        pairwise_is_duplicate(values, previous)
+        previous.append(set(values.tolist()))
+    elapsed = time.perf_counter() - t0
+    print(f"Jaccard por pares con {len(sample)} mensajes: {elapsed / len(sample) * 1e6:.0f} µs por mensaje de media "
+          f"(último: contra {len(previous)} anteriores)")
+
+    failures = []
+    if p50 > 0.001:
+        failures.append(f"la comprobación tarda {p50 * 1000:.2f} ms por mensaje (mediana)")
+    if recall < 0.95:
+        failures.append(f"solo se detecta el {recall:.1%} de la avalancha")
+    if false_positive > 0.01:
+        failures.append(f"se marca el {false_positive:.2%} de los mensajes legítimos")
+    for failure in failures:
+        print(f"ERROR {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# Benchmark de escrituras concurrentes en newsletter.db
+# Compara la ruta antigua (conexión nueva por envío, journal por defecto) con el pool WAL de storage.py.
+#
+# Uso: python benchmarks/bench_sqlite_writers.py --threads 1 4 8 16 --inserts 200
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import storage  # noqa: E402
+from migrations import apply_migrations  # noqa: E402
+
+
+# Ruta antigua: abre, inserta, confirma y cierra una conexión por envío
+def legacy_insert(db_path, name, email, message):
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute(
+        "INSERT INTO contacts (name, email, message) VALUES (?, ?, ?);",
+        (name, email, message),
+    )
+    conn.commit()
+    conn.close()
+
+
+# Ruta nueva: conexión prestada por el pool y sentencia preparada reutilizada
+def pooled_insert(db_path, name, email, message):
+    storage.save_contact(name, email, message, db_path=db_path)
+
+
+# Lanza `threads` hilos que insertan `inserts` filas cada uno; devuelve (envíos/s, errores)
+def run(insert, db_path, threads, inserts):
+    errors = []
+    start = threading.Barrier(threads + 1)
+
+    def worker(n):
+        start.wait()
+        for i in range(inserts):
+            try:
+                insert(db_path, f"Usuario {n}", f"user{n}.{i}@example.com", "Mensaje de prueba " * 10)
+            except sqlite3.OperationalError as e:
+                errors.append(str(e))
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in pool:
+        t.start()
+    start.wait()
+    t0 = time.perf_counter()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    return (threads * inserts - len(errors)) / elapsed, len(errors)
+
+
+# Crea una base de datos vacía con el esquema actual en un directorio temporal
+def fresh_database(workdir, label):
+    db_path = os.path.join(workdir, f"{label}.db")
+    apply_migrations(db_path)
+    return db_path
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--inserts", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'hilos':>6} {'antiguo (env/s)':>16} {'errores':>8} {'pool WAL (env/s)':>17} {'errores':>8}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for threads in args.threads:
+            legacy_db = os.path.join(workdir, f"legacy_{threads}.db")
+            conn = sqlite3.connect(legacy_db)
+            conn.execute("""
+            CREATE TABLE contacts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                email TEXT NOT NULL,
+                message TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            """)
+            conn.close()
+            legacy_rate, legacy_errors = run(legacy_insert, legacy_db, threads, args.inserts)
+
+            pooled_db = fresh_database(workdir, f"pooled_{threads}")
+            pooled_rate, pooled_errors = run(pooled_insert, pooled_db, threads, args.inserts)
+            storage.get_pool(pooled_db).close()
+
+            print(f"{threads:>6} {legacy_rate:>16.0f} {legacy_errors:>8} {pooled_rate:>17.0f} {pooled_errors:>8}")
+
+
+if __name__ == "__main__":
+    main()
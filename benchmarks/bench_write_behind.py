@@ -0,0 +1,70 @@
+# Benchmark del escritor en segundo plano (write_behind.py)
+# Mide la latencia que percibe el formulario (síncrono frente a encolado) y el rendimiento por tamaño de lote.
+#
+# Uso: python benchmarks/bench_write_behind.py --submissions 2000 --batch-sizes 1 10 100 500
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import storage  # noqa: E402
+from migrations import apply_migrations  # noqa: E402
+from write_behind import BackgroundWriter  # noqa: E402
+
+
+# Crea una base de datos vacía con el esquema actual en un directorio temporal
+def fresh_database(workdir, label):
+    db_path = os.path.join(workdir, f"{label}.db")
+    apply_migrations(db_path)
+    return db_path
+
+
+# Percentil p de una lista de latencias (en ms)
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--submissions", type=int, default=2000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100, 500])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # Latencia síncrona: el rerun espera al commit de cada envío
+        db_path = fresh_database(workdir, "sync")
+        latencies = []
+        for i in range(args.submissions):
+            t0 = time.perf_counter()
+            storage.save_contact("Usuario", f"user{i}@example.com", "Mensaje de prueba", db_path=db_path)
+            latencies.append((time.perf_counter() - t0) * 1000)
+        storage.get_pool(db_path).close()
+        print(f"síncrono      p50={statistics.median(latencies):.3f} ms  p99={percentile(latencies, 0.99):.3f} ms")
+
+        print(f"{'lote':>6} {'p50 encolar (ms)':>17} {'p99 encolar (ms)':>17} {'envíos/s':>10}")
+        for batch_size in args.batch_sizes:
+            db_path = fresh_database(workdir, f"batch_{batch_size}")
+            writer = BackgroundWriter(db_path, batch_size=batch_size)
+            latencies = []
+            t_start = time.perf_counter()
+            for i in range(args.submissions):
+                t0 = time.perf_counter()
+                writer.submit_contact("Usuario", f"user{i}@example.com", "Mensaje de prueba")
+                latencies.append((time.perf_counter() - t0) * 1000)
+            writer.flush()
+            elapsed = time.perf_counter() - t_start
+            writer.shutdown()
+            storage.get_pool(db_path).close()
+            print(
+                f"{batch_size:>6} {statistics.median(latencies):>17.4f} {percentile(latencies, 0.99):>17.4f} "
+                f"{args.submissions / elapsed:>10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# Informe de arranque de web.py: tiempos de importación (python -X importtime) y módulos que carga
+# cada página en un proceso recién arrancado, con el tiempo del primer run y de los reruns.
+# Con --check falla (código 1) si una página de solo lectura carga módulos que no necesita
+# (SQLite, formularios, administración...), para que un import al principio de web.py no vuelva
+# a encarecer el arranque de todas las páginas sin que nadie lo note.
+#
+# Uso: python benchmarks/import_report.py --check
+#      python benchmarks/import_report.py --root /ruta/a/otra/copia   (para comparar versiones)
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = ["Inicio", "Servicios", "Demo", "Contacto", "Blog", "Política y Términos"]
+
+# Módulos que no debe cargar cada página de solo lectura
+FORBIDDEN = {
+    "Política y Términos": ("sqlite3", "storage", "write_behind", "forms", "admin", "export", "blog", "search"),
+    "Blog": ("sqlite3", "storage", "write_behind", "forms", "admin", "export"),
+}
+
+# Proceso de medición de una página: módulos nuevos respecto a un script vacío y tiempos
+PAGE_PROBE = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+AppTest.from_string("import streamlit as st").run()
+baseline = set(sys.modules)
+at = AppTest.from_file("web.py", default_timeout=60)
+at.query_params["pagina"] = {page!r}
+t0 = time.perf_counter()
+at.run()
+first = time.perf_counter() - t0
+reruns = []
+for _ in range({reruns}):
+    t0 = time.perf_counter()
+    at.run()
+    reruns.append(time.perf_counter() - t0)
+print(json.dumps({{"first": first, "reruns": reruns, "exception": [str(e.value) for e in at.exception],
+                  "modules": sorted(set(sys.modules) - baseline)}}))
+"""
+
+
+# Módulos que web.py importa en su nivel superior (los que paga cualquier página)
+def top_level_imports(root):
+    with open(os.path.join(root, "web.py"), "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.append(node.module)
+    return modules
+
+
+# Líneas de -X importtime: (módulo, tiempo propio en µs, acumulado en µs, nivel de anidamiento)
+def importtime(root, statement):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=root,
+                            capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def probe_page(root, page, reruns):
+    output = subprocess.run([sys.executable, "-c", PAGE_PROBE.format(page=page, reruns=reruns)], cwd=root,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--root", default=ROOT, help="copia del repositorio a medir")
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--check", action="store_true", help="falla si una página ligera carga módulos prohibidos")
+    args = parser.parse_args()
+    root = os.path.abspath(args.root)
+
+    # Coste de los imports del nivel superior de web.py, descontando Streamlit
+    modules = [module for module in top_level_imports(root) if module != "streamlit"]
+    baseline = {name for name, *_ in importtime(root, "import streamlit")}
+    rows = [row for row in importtime(root, "import streamlit; import " + ", ".join(modules))
+            if row[0] not in baseline]
+    eager_us = sum(self_us for _, self_us, _, _ in rows)
+    print(f"Imports de nivel superior de web.py (sin Streamlit): {eager_us / 1000:.1f} ms, {len(rows)} módulos")
+    for name, _, cumulative_us, depth in sorted(rows, key=lambda row: -row[2])[:15]:
+        print(f"  {cumulative_us / 1000:>7.2f} ms  {'  ' * depth}{name}")
+    eager = {name for name, *_ in rows}
+
+    failures = []
+    print(f"\n{'página':<20} {'primer run':>11} {'rerun p50':>10}  módulos nuevos")
+    for page in PAGES:
+        result = probe_page(root, page, args.reruns)
+        loaded = set(result["modules"])
+        ours = sorted(name for name in loaded if os.path.exists(os.path.join(root, f"{name}.py")))
+        print(f"{page:<20} {result['first'] * 1000:>8.1f} ms {statistics.median(result['reruns']) * 1000:>7.1f} ms"
+              f"  {len(loaded):>4} ({', '.join(ours)})")
+        if result["exception"]:
+            failures.append(f"{page}: excepción {result['exception']}")
+        for module in FORBIDDEN.get(page, ()):
+            if module in loaded or module in eager:
+                failures.append(f"{page}: carga '{module}'")
+
+    if args.check and failures:
+        print()
+        for failure in failures:
+            print(f"ERROR {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
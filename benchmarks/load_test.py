@@ -0,0 +1,335 @@
+# Prueba de carga de web.py sin navegador con AppTest de Streamlit.
+# Recorre cada página y envía cada formulario, y para cada paso mide el tiempo del rerun, los bytes
+# emitidos (markdown, imágenes y resto de elementos) y las sentencias ejecutadas en SQLite.
+# Después lanza N sesiones simultáneas contra la misma newsletter.db temporal. Cada sesión va en su
+# propio proceso: AppTest monta un runtime simulado global y no admite varias ejecuciones a la vez
+# en el mismo proceso.
+# El resultado se guarda en un JSON pensado para compararlo entre commits.
+#
+# Uso: python benchmarks/load_test.py --repeat 10 --sessions 8 --output load_report.json
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+import streamlit
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.testing.v1 import AppTest
+
+from bench_interactions import ROOT, copy_app
+
+PAGES = ["Inicio", "Servicios", "Demo", "Contacto", "Blog", "Política y Términos"]
+
+_db_ops = Counter()
+_db_ops_lock = threading.Lock()
+_media_bytes = [0]
+
+
+# Cuenta las sentencias SQL por tipo (SELECT, INSERT, ...) en todas las conexiones del pool
+def install_db_counter():
+    import storage
+
+    open_connection = storage.ConnectionPool._open
+
+    def _open(self):
+        conn = open_connection(self)
+        conn.set_trace_callback(_count_statement)
+        return conn
+
+    storage.ConnectionPool._open = _open
+
+
+# Cuenta los bytes de las imágenes y demás ficheros que la app registra para servirlos (st.image, ...)
+def install_media_counter():
+    load_and_get_id = MemoryMediaFileStorage.load_and_get_id
+
+    def _load_and_get_id(self, path_or_data, *args, **kwargs):
+        if isinstance(path_or_data, (bytes, bytearray)):
+            _media_bytes[0] += len(path_or_data)
+        else:
+            _media_bytes[0] += os.path.getsize(path_or_data)
+        return load_and_get_id(self, path_or_data, *args, **kwargs)
+
+    MemoryMediaFileStorage.load_and_get_id = _load_and_get_id
+
+
+def _count_statement(sql):
+    keyword = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else "?"
+    with _db_ops_lock:
+        _db_ops[keyword] += 1
+
+
+# Recorre todos los nodos del árbol de elementos de AppTest
+def _walk(node):
+    yield node
+    for child in getattr(node, "children", {}).values():
+        yield from _walk(child)
+
+
+# Bytes serializados de los elementos que la app ha enviado en el último rerun, por tipo
+def payload_bytes(app):
+    sizes = Counter()
+    for node in _walk(app._tree):
+        proto = getattr(node, "proto", None)
+        if proto is not None and hasattr(proto, "ByteSize"):
+            sizes[node.type] += proto.ByteSize()
+    return sizes
+
+
+# Espera a que el escritor en segundo plano haya volcado los envíos pendientes
+def flush_writes():
+    from write_behind import get_writer
+
+    get_writer().flush()
+
+
+# Ejecuta una acción sobre la app y devuelve la medición del rerun que provoca
+def measure(app, action):
+    with _db_ops_lock:
+        before = Counter(_db_ops)
+    media_before = _media_bytes[0]
+    t0 = time.perf_counter()
+    action(app)
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    media = _media_bytes[0] - media_before
+    flush_writes()
+    with _db_ops_lock:
+        ops = _db_ops - before
+    if app.exception:
+        raise RuntimeError(f"la app ha lanzado una excepción: {app.exception[0].value}")
+    sizes = payload_bytes(app)
+    return {
+        "wall_ms": elapsed_ms,
+        "payload_bytes": sum(sizes.values()) + media,
+        "markdown_bytes": sizes["markdown"],
+        "image_bytes": media,
+        "db_ops": dict(ops),
+    }
+
+
+def go_to(page):
+    def action(app):
+        app.sidebar.radio[0].set_value(page).run()
+    return action
+
+
+# Cambio de página; `n` no se usa, pero todas las acciones se construyen igual
+def visit(page):
+    return lambda n: go_to(page)
+
+
+# Rellena un formulario. Cada envío usa una clave de límite distinta para medir la escritura y no
+# el rechazo por exceso de envíos de la misma sesión (rate_limit.py)
+def _fill(app, name, email, message=None):
+    app.session_state["rate_limit_key"] = email
+    app.text_input[0].input(name)
+    app.text_input[1].input(email)
+    if message is not None:
+        app.text_area[0].input(message)
+
+
+# Acciones de cada formulario; `n` hace único el correo de cada envío
+def submit_newsletter(n):
+    def action(app):
+        _fill(app, "Carga", f"carga{n}@example.com")
+        app.button[0].click().run()
+    return action
+
+
+def submit_servicios(n):
+    def action(app):
+        if not app.text_area:
+            app.button[0].click().run()
+        _fill(app, "Carga", f"carga{n}@example.com", "Mensaje de prueba")
+        app.button[1].click().run()
+    return action
+
+
+def submit_demo(n):
+    def action(app):
+        if not app.text_area:
+            app.button[0].click().run()
+        _fill(app, "Carga", f"carga{n}@example.com", "Mensaje de prueba")
+        app.button[0].click().run()
+    return action
+
+
+def submit_contacto(n):
+    def action(app):
+        _fill(app, "Carga", f"carga{n}@example.com", "Mensaje de prueba")
+        app.button[0].click().run()
+    return action
+
+
+def search_blog(n):
+    def action(app):
+        app.text_input[0].input(["clientes", "automatización", "datos", "ia"][n % 4]).run()
+    return action
+
+
+# Escenarios: (nombre, página de partida, constructor de la acción medida).
+# Las visitas parten de otra página para que el rerun medido sea un cambio de página real.
+SCENARIOS = [(f"page:{page}", "Blog" if page == "Inicio" else "Inicio", visit(page)) for page in PAGES] + [
+    ("form:newsletter", "Inicio", submit_newsletter),
+    ("form:servicios", "Servicios", submit_servicios),
+    ("form:demo", "Demo", submit_demo),
+    ("form:contacto", "Contacto", submit_contacto),
+    ("blog:search", "Blog", search_blog),
+]
+
+
+def new_session():
+    return AppTest.from_file(os.path.join(os.getcwd(), "web.py"), default_timeout=60).run()
+
+
+# Mediana, p95 y máximo de una lista de tiempos en ms
+def wall_stats(timings):
+    timings = sorted(timings)
+    return {
+        "median": round(statistics.median(timings), 3),
+        "p95": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        "max": round(timings[-1], 3),
+    }
+
+
+# Resumen estadístico de una lista de mediciones
+def summarize(samples):
+    db_ops = Counter()
+    for sample in samples:
+        db_ops.update(sample["db_ops"])
+    return {
+        "runs": len(samples),
+        "wall_ms": wall_stats(sample["wall_ms"] for sample in samples),
+        "payload_bytes": max(sample["payload_bytes"] for sample in samples),
+        "markdown_bytes": max(sample["markdown_bytes"] for sample in samples),
+        "image_bytes": max(sample["image_bytes"] for sample in samples),
+        "db_ops_per_run": {op: round(count / len(samples), 2) for op, count in sorted(db_ops.items())},
+    }
+
+
+# Mide cada escenario `repeat` veces en una única sesión
+def run_scenarios(repeat):
+    results = {}
+    app = new_session()
+    counter = 0
+    for name, page, make_action in SCENARIOS:
+        samples = []
+        for _ in range(repeat):
+            go_to(page)(app)
+            counter += 1
+            samples.append(measure(app, make_action(counter)))
+        results[name] = summarize(samples)
+    return results
+
+
+# Una sesión simulada: recorre `rounds` veces todas las páginas y formularios y devuelve sus tiempos
+def run_session(workdir, index, rounds, start):
+    os.chdir(workdir)
+    sys.path.insert(0, workdir)
+    app = new_session()
+    start.wait()
+    timings = []
+    for round_number in range(rounds):
+        for _, page, make_action in SCENARIOS:
+            go_to(page)(app)
+            action = make_action(100_000 * (index + 1) + round_number)
+            t0 = time.perf_counter()
+            action(app)
+            timings.append((time.perf_counter() - t0) * 1000)
+            if app.exception:
+                raise RuntimeError(f"la app ha lanzado una excepción: {app.exception[0].value}")
+    flush_writes()
+    return timings
+
+
+# N sesiones simultáneas, cada una en su proceso, contra la misma base de datos
+def run_concurrent(workdir, sessions, rounds):
+    # AppTest sustituye __main__ por web.py, así que la función se pasa desde el módulo importado por nombre
+    from load_test import run_session as session_worker
+
+    context = multiprocessing.get_context("spawn")
+    with context.Manager() as manager:
+        start = manager.Event()
+        with context.Pool(sessions) as pool:
+            pending = [pool.apply_async(session_worker, (workdir, i, rounds, start)) for i in range(sessions)]
+            # Todas las sesiones arrancan a la vez, una vez cargada la app en cada proceso
+            time.sleep(0.5)
+            t0 = time.perf_counter()
+            start.set()
+            timings = []
+            errors = []
+            for result in pending:
+                try:
+                    timings.extend(result.get())
+                except Exception as exc:
+                    errors.append(repr(exc))
+            elapsed = time.perf_counter() - t0
+
+    return {
+        "sessions": sessions,
+        "rounds": rounds,
+        "elapsed_s": round(elapsed, 3),
+        "reruns_per_s": round(len(timings) / elapsed, 2),
+        "wall_ms": wall_stats(timings) if timings else None,
+        "errors": errors,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10, help="mediciones por escenario")
+    parser.add_argument("--sessions", type=int, default=8, help="sesiones simultáneas")
+    parser.add_argument("--rounds", type=int, default=2, help="recorridos completos por sesión simultánea")
+    parser.add_argument("--output", default="load_report.json")
+    args = parser.parse_args()
+    output = os.path.abspath(args.output)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        copy_app(workdir)
+        os.chdir(workdir)
+        sys.path.insert(0, workdir)
+        install_db_counter()
+        install_media_counter()
+
+        report = {
+            "meta": {
+                "commit": git_commit(),
+                "python": platform.python_version(),
+                "streamlit": streamlit.__version__,
+                "repeat": args.repeat,
+            },
+            "scenarios": run_scenarios(args.repeat),
+            "concurrency": run_concurrent(workdir, args.sessions, args.rounds),
+        }
+
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False, sort_keys=True)
+        f.write("\n")
+
+    print(f"{'escenario':<28} {'mediana (ms)':>12} {'p95 (ms)':>9} {'bytes':>8} {'SQL/rerun':>10}")
+    for name, result in report["scenarios"].items():
+        print(f"{name:<28} {result['wall_ms']['median']:>12.2f} {result['wall_ms']['p95']:>9.2f} "
+              f"{result['payload_bytes']:>8} {sum(result['db_ops_per_run'].values()):>10.2f}")
+    concurrency = report["concurrency"]
+    print(f"\n{concurrency['sessions']} sesiones simultáneas: {concurrency['reruns_per_s']} reruns/s, "
+          f"{len(concurrency['errors'])} errores")
+    print(f"Informe guardado en {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# Memoria y datos por sesión de la web, contra un servidor de Streamlit real.
+# Arranca `streamlit run web.py` con python -X tracemalloc y METRICS_ENABLED=1, y para cada página abre
+# --sessions sesiones (clientes websocket, como navegadores) que se quedan conectadas. Mide:
+#   - datos enviados a cada sesión en su primera carga (bytes recibidos por el websocket)
+#   - memoria de Python que el servidor retiene por sesión: analytiq_python_traced_bytes de /metrics
+#     antes y después de abrir las sesiones, dividido entre el número de sesiones
+#   - memoria residente por sesión (RSS; orientativa, el asignador de memoria la redondea) y sesiones por GB
+# Con --check falla (código 1) si alguna página supera los presupuestos, para que un asset embebido
+# o un session_state que crece sin control no lleguen a producción sin que nadie lo note.
+#
+# Requiere websockets (dependencia del servidor de Streamlit).
+# Uso: python benchmarks/session_budget.py --sessions 50 --check
+#      python benchmarks/session_budget.py --no-static-serving   (medios de Streamlit en lugar de static/)
+import argparse
+import asyncio
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+import urllib.parse
+import urllib.request
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = ["Inicio", "Servicios", "Demo", "Contacto", "Blog", "Política y Términos"]
+
+# Presupuestos por sesión (KiB): memoria de Python retenida en el servidor y datos de la primera carga
+RESIDENT_BUDGET_KIB = 192
+PAYLOAD_BUDGET_KIB = 32
+
+STARTUP_TIMEOUT_SECONDS = 60
+SETTLE_SECONDS = 1.0
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def read_metrics(port):
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=10) as response:
+        text = response.read().decode()
+    return {match[0]: float(match[1]) for match in re.findall(r"^(analytiq_\w+) ([0-9.e+]+)$", text, re.M)}
+
+
+def wait_for_server(port):
+    deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=2):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError("El servidor de Streamlit no ha arrancado")
+
+
+# Abre una sesión en la página y espera al final del primer run. Devuelve (websocket, bytes recibidos).
+async def open_session(port, page):
+    ws = await websockets.connect(f"ws://127.0.0.1:{port}/_stcore/stream", max_size=None)
+    message = BackMsg()
+    message.rerun_script.query_string = urllib.parse.urlencode({"pagina": page})
+    await ws.send(message.SerializeToString())
+    received = 0
+    while True:
+        raw = await ws.recv()
+        received += len(raw)
+        forward = ForwardMsg()
+        forward.ParseFromString(raw)
+        if forward.WhichOneof("type") == "script_finished":
+            return ws, received
+
+
+# Memoria y datos por sesión de una página
+async def measure_page(port, metrics_port, page, sessions):
+    ws, _ = await open_session(port, page)  # calienta las cachés del proceso para esta página
+    await ws.close()
+    await asyncio.sleep(SETTLE_SECONDS)
+    before = read_metrics(metrics_port)
+    connections = []
+    payload = 0
+    for _ in range(sessions):
+        ws, received = await open_session(port, page)
+        connections.append(ws)
+        payload += received
+    await asyncio.sleep(SETTLE_SECONDS)
+    after = read_metrics(metrics_port)
+    for ws in connections:
+        await ws.close()
+
+    def per_session(name):
+        return (after.get(name, 0) - before.get(name, 0)) / sessions
+
+    return {
+        "payload": payload / sessions,
+        "traced": per_session("analytiq_python_traced_bytes"),
+        "resident": per_session("analytiq_process_resident_bytes"),
+        "sessions": after.get("analytiq_sessions"),
+    }
+
+
+async def measure(root, sessions, static_serving):
+    port, metrics_port = free_port(), free_port()
+    env = dict(os.environ, METRICS_ENABLED="1", METRICS_PORT=str(metrics_port))
+    server = subprocess.Popen(
+        [sys.executable, "-X", "tracemalloc", "-m", "streamlit", "run", "web.py", "--server.headless", "true",
+         "--server.port", str(port), "--server.enableStaticServing", str(static_serving).lower(),
+         "--browser.gatherUsageStats", "false"],
+        cwd=root, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_server(port)
+        return {page: await measure_page(port, metrics_port, page, sessions) for page in PAGES}
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--root", default=ROOT, help="copia del repositorio a medir")
+    parser.add_argument("--sessions", type=int, default=50, help="sesiones abiertas por página")
+    parser.add_argument("--no-static-serving", action="store_true", help="sin server.enableStaticServing")
+    parser.add_argument("--resident-budget-kib", type=float, default=RESIDENT_BUDGET_KIB)
+    parser.add_argument("--payload-budget-kib", type=float, default=PAYLOAD_BUDGET_KIB)
+    parser.add_argument("--check", action="store_true", help="falla si alguna página supera los presupuestos")
+    args = parser.parse_args()
+
+    results = asyncio.run(measure(os.path.abspath(args.root), args.sessions, not args.no_static_serving))
+
+    failures = []
+    print(f"{args.sessions} sesiones por página; presupuesto por sesión: {args.resident_budget_kib:.0f} KiB "
+          f"de memoria de Python, {args.payload_budget_kib:.0f} KiB de datos")
+    print(f"{'página':<20} {'datos':>10} {'Python':>11} {'RSS':>11} {'sesiones/GB':>12}")
+    for page, result in results.items():
+        traced_kib = result["traced"] / 1024
+        per_gb = 2**30 / result["traced"] if result["traced"] > 0 else float("inf")
+        print(f"{page:<20} {result['payload'] / 1024:>6.1f} KiB {traced_kib:>7.1f} KiB "
+              f"{result['resident'] / 1024:>7.1f} KiB {per_gb:>12,.0f}")
+        if traced_kib > args.resident_budget_kib:
+            failures.append(f"{page}: {traced_kib:.1f} KiB de memoria por sesión (máximo {args.resident_budget_kib:.0f})")
+        if result["payload"] / 1024 > args.payload_budget_kib:
+            failures.append(f"{page}: {result['payload'] / 1024:.1f} KiB de datos por sesión "
+                            f"(máximo {args.payload_budget_kib:.0f})")
+
+    if args.check and failures:
+        print()
+        for failure in failures:
+            print(f"ERROR {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
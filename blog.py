@@ -0,0 +1,198 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+
+from blog_snapshot import SNAPSHOT_PATH, BlogSnapshot
+from markup import render_post_body
+from metrics import stage
+from search import SearchIndex
+
+# Ruta del archivo con las entradas del blog
+BLOG_PATH = "blog_entries.json"
+
+# Extensión de los snapshots generados por blog_snapshot.py
+SNAPSHOT_SUFFIX = ".snapshot"
+
+
+# Fuente del blog: el snapshot si se ha generado y, si no, el JSON editado a mano
+def default_blog_path():
+    return SNAPSHOT_PATH if os.path.exists(SNAPSHOT_PATH) else BLOG_PATH
+
+
+# Slug estable a partir del título: sin acentos, en minúsculas y con guiones
+def slugify(text):
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-") or "post"
+
+
+# Hash del contenido de una entrada para detectar qué publicaciones han cambiado
+def _entry_hash(entry):
+    return hashlib.sha1(json.dumps(entry, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+
+# Almacén en memoria de las publicaciones del blog, leídas de blog_entries.json o del snapshot
+# generado por blog_snapshot.py.
+# El fichero se lee una vez por versión (mtime/tamaño); al cambiar, solo se reprocesan las
+# entradas cuyo contenido es distinto. Lista ordenada por fecha, búsqueda por slug en O(1)
+# e índice de texto completo que se actualiza solo con las publicaciones añadidas, cambiadas o borradas.
+# Con el snapshot, el listado solo usa su índice: el cuerpo de una publicación se lee de su
+# registro al desplegarla (o al indexarla para la primera búsqueda).
+class BlogStore:
+    def __init__(self, path=None):
+        self.path = path or default_blog_path()
+        self._fingerprint = None
+        self._by_hash = {}
+        self._by_slug = {}
+        self._ordered = []
+        self._slug_digests = {}
+        self._index = SearchIndex()
+        self._pending = set()
+        self._snapshot = None
+        self._locations = {}
+        self._records = {}
+        self._lock = threading.Lock()
+
+    # Recarga el índice si el fichero ha cambiado desde la última lectura
+    def refresh(self):
+        stat = os.stat(self.path)
+        fingerprint = (stat.st_mtime_ns, stat.st_size)
+        if fingerprint == self._fingerprint:
+            return
+        with self._lock:
+            if fingerprint == self._fingerprint:
+                return
+            with stage("blog_load"):
+                if self.path.endswith(SNAPSHOT_SUFFIX):
+                    self._snapshot = BlogSnapshot(self.path)
+                    entries = self._snapshot.entries()
+                else:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        entries = json.load(f)
+                self._rebuild(entries)
+            self._fingerprint = fingerprint
+
+    # Reconstruye el índice reutilizando las entradas que no han cambiado
+    def _rebuild(self, entries):
+        by_hash = {}
+        by_slug = {}
+        slug_digests = {}
+        locations = {}
+        ordered = []
+        for position, entry in enumerate(entries):
+            # Las entradas del snapshot ya traen el hash de su registro
+            digest = entry.get("digest") or _entry_hash(entry)
+            post = self._by_hash.get(digest)
+            if post is None:
+                post = self._index_entry(entry)
+            by_hash[digest] = post
+            if "offset" in entry:
+                locations[digest] = (entry["offset"], entry["length"])
+
+            slug = post["slug"]
+            suffix = 2
+            while slug in by_slug:
+                slug = f"{post['slug']}-{suffix}"
+                suffix += 1
+            if slug != post["slug"]:
+                post = dict(post, slug=slug)
+            by_slug[slug] = post
+            slug_digests[slug] = digest
+            ordered.append((post["date"], -position, post))
+
+        # Actualización incremental del índice de búsqueda: las bajas se aplican ya y las altas
+        # quedan pendientes hasta la siguiente búsqueda
+        for slug, digest in self._slug_digests.items():
+            if slug_digests.get(slug) != digest:
+                self._index.remove(slug)
+                self._pending.discard(slug)
+        for slug, digest in slug_digests.items():
+            if self._slug_digests.get(slug) != digest:
+                self._pending.add(slug)
+
+        ordered.sort(key=lambda item: item[:2], reverse=True)
+        self._slug_digests = slug_digests
+        self._by_hash = by_hash
+        self._by_slug = by_slug
+        self._ordered = [post for _, _, post in ordered]
+        self._locations = locations
+        # Los registros se identifican por su contenido: los que siguen en el snapshot siguen siendo válidos
+        self._records = {digest: record for digest, record in self._records.items() if digest in locations}
+
+    # Campos derivados de una entrada nueva o modificada
+    def _index_entry(self, entry):
+        post = {field: value for field, value in entry.items() if field not in ("offset", "length")}
+        post["slug"] = slugify(entry["title"])
+        if "content" in entry:
+            post["content_html"] = render_post_body(entry["content"])
+        return post
+
+    # Publicación con su cuerpo; del snapshot solo se lee el registro de esa publicación (con self._lock)
+    def _full_post(self, post):
+        if "content" in post:
+            return post
+        digest = post["digest"]
+        record = self._records.get(digest)
+        if record is None:
+            record = self._records[digest] = self._snapshot.read(*self._locations[digest])
+        return dict(record, slug=post["slug"], digest=digest)
+
+    # Añade al índice de búsqueda las publicaciones nuevas o cambiadas. Se hace en la primera
+    # búsqueda tras cada recarga, así que abrir el blog no lee el cuerpo de todas las publicaciones.
+    def warm_search(self):
+        self.refresh()
+        with self._lock:
+            if not self._pending:
+                return
+            for slug in self._pending:
+                post = self._full_post(self._by_slug[slug])
+                self._index.add(slug, {field: post.get(field, "") for field in ("title", "summary", "content")})
+            self._pending.clear()
+            self._index.warm()
+
+    # Publicaciones ordenadas de la más reciente a la más antigua
+    def posts(self):
+        self.refresh()
+        return self._ordered
+
+    # Página `page` (empezando en 0) con `page_size` publicaciones y el número total de páginas
+    def page(self, page, page_size):
+        posts = self.posts()
+        pages = max(1, -(-len(posts) // page_size))
+        page = min(max(page, 0), pages - 1)
+        start = page * page_size
+        return posts[start:start + page_size], page, pages
+
+    # Publicación por slug (None si no existe)
+    def get(self, slug):
+        self.refresh()
+        with self._lock:
+            post = self._by_slug.get(slug)
+            return None if post is None else self._full_post(post)
+
+    # Búsqueda de texto completo: publicaciones ordenadas por relevancia
+    def search(self, query, limit=20):
+        self.warm_search()
+        results = (self._by_slug.get(slug) for slug, _ in self._index.search(query, limit))
+        return [post for post in results if post is not None]
+
+    def __len__(self):
+        self.refresh()
+        return len(self._ordered)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+# Almacén compartido por todo el proceso para la ruta indicada
+def get_blog_store(path=None):
+    path = path or default_blog_path()
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = BlogStore(path)
+        return store
@@ -0,0 +1,217 @@
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from datetime import date
+
+from markup import render_post_body
+
+# Ingesta del blog: publicaciones en Markdown (o el antiguo blog_entries.json) -> blog.snapshot.
+#
+# El snapshot es un fichero binario versionado que la página del blog abre con mmap:
+#   cabecera | registros | índice
+# - cabecera: firma, versión del formato, número de publicaciones y posición/tamaño del índice
+# - registros: una publicación completa por registro (JSON compacto con el cuerpo ya convertido a
+#   HTML escapado). Cada registro se identifica por el hash de su contenido, así que dos
+#   publicaciones idénticas comparten registro y una publicación sin cambios conserva su hash.
+# - índice: lista compacta con los campos de la tarjeta de cada publicación y la posición de su
+#   registro, ordenada de la más reciente a la más antigua.
+# Para pintar el listado solo se lee el índice; para desplegar una publicación se lee solo su registro.
+#
+# Uso: python blog_snapshot.py posts/ blog_entries.json --output blog.snapshot
+
+SNAPSHOT_PATH = "blog.snapshot"
+SNAPSHOT_MAGIC = b"AQBS"
+SNAPSHOT_VERSION = 1
+
+# Cabecera: firma, versión, reservado, nº de publicaciones, posición y tamaño del índice
+_HEADER = struct.Struct("<4sHHIQQ")
+
+# Campos de cada entrada del índice (en este orden)
+INDEX_FIELDS = ("digest", "offset", "length", "title", "date", "summary", "emoji")
+
+# Campos de una publicación y sus límites
+REQUIRED_FIELDS = ("title", "date", "summary", "content")
+MAX_TITLE_LENGTH = 120
+MAX_SUMMARY_LENGTH = 300
+MAX_EMOJI_LENGTH = 8
+
+
+# Comprueba y normaliza una publicación. Lanza ValueError con todos los problemas encontrados.
+def validate_post(post, source="?"):
+    if not isinstance(post, dict):
+        raise ValueError(f"{source}: se esperaba un objeto con los campos de la publicación")
+    problems = []
+    unknown = set(post) - set(REQUIRED_FIELDS) - {"emoji"}
+    if unknown:
+        problems.append(f"campos desconocidos: {', '.join(sorted(unknown))}")
+
+    clean = {}
+    for field in REQUIRED_FIELDS + ("emoji",):
+        value = post.get(field, "")
+        if not isinstance(value, str):
+            problems.append(f"'{field}' debe ser texto")
+            value = ""
+        clean[field] = value.strip()
+        if field in REQUIRED_FIELDS and not clean[field]:
+            problems.append(f"falta '{field}'")
+
+    if len(clean["title"]) > MAX_TITLE_LENGTH:
+        problems.append(f"'title' supera {MAX_TITLE_LENGTH} caracteres")
+    if len(clean["summary"]) > MAX_SUMMARY_LENGTH:
+        problems.append(f"'summary' supera {MAX_SUMMARY_LENGTH} caracteres")
+    if len(clean["emoji"]) > MAX_EMOJI_LENGTH:
+        problems.append(f"'emoji' supera {MAX_EMOJI_LENGTH} caracteres")
+    if clean["date"]:
+        try:
+            clean["date"] = date.fromisoformat(clean["date"]).isoformat()
+        except ValueError:
+            problems.append(f"'date' no es una fecha AAAA-MM-DD: {clean['date']!r}")
+
+    if problems:
+        raise ValueError(f"{source}: " + "; ".join(problems))
+    return clean
+
+
+# Lee una publicación en Markdown: cabecera "clave: valor" entre dos líneas "---" y el cuerpo
+def read_markdown_post(path):
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    lines = text.splitlines()
+    if not lines or lines[0].strip() != "---":
+        raise ValueError(f"{path}: falta la cabecera (primera línea '---')")
+    try:
+        end = lines.index("---", 1)
+    except ValueError:
+        raise ValueError(f"{path}: la cabecera no se cierra con '---'") from None
+
+    post = {}
+    for number, line in enumerate(lines[1:end], start=2):
+        if not line.strip():
+            continue
+        key, colon, value = line.partition(":")
+        if not colon:
+            raise ValueError(f"{path}:{number}: se esperaba 'clave: valor'")
+        post[key.strip()] = value.strip()
+    post["content"] = "\n".join(lines[end + 1:]).strip()
+    return post
+
+
+# Publicaciones de una ruta: fichero .md, carpeta con ficheros .md o fichero JSON con una lista
+def read_posts(path):
+    if os.path.isdir(path):
+        names = sorted(name for name in os.listdir(path) if name.endswith(".md"))
+        return [(read_markdown_post(os.path.join(path, name)), os.path.join(path, name)) for name in names]
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+        return [(entry, f"{path}[{position}]") for position, entry in enumerate(entries)]
+    return [(read_markdown_post(path), path)]
+
+
+# Registro de una publicación ya validada: JSON compacto con el cuerpo convertido una sola vez
+def _record(post):
+    record = dict(post, content_html=render_post_body(post["content"]))
+    return json.dumps(record, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode()
+
+
+# Contenido binario del snapshot para las publicaciones (en el orden en que se leyeron)
+def build_snapshot(posts):
+    ordered = sorted(enumerate(posts), key=lambda item: (item[1]["date"], -item[0]), reverse=True)
+    body = bytearray()
+    offsets = {}
+    index = []
+    for _, post in ordered:
+        record = _record(post)
+        digest = hashlib.sha256(record).hexdigest()[:32]
+        if digest not in offsets:
+            offsets[digest] = (_HEADER.size + len(body), len(record))
+            body += record
+        offset, length = offsets[digest]
+        index.append([digest, offset, length, post["title"], post["date"], post["summary"], post["emoji"]])
+
+    index_bytes = json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode()
+    index_offset = _HEADER.size + len(body)
+    header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, len(index), index_offset, len(index_bytes))
+    return header + bytes(body) + index_bytes
+
+
+# Escribe el snapshot de forma atómica. Si el contenido no ha cambiado no toca el fichero, así
+# que los procesos que ya lo tienen abierto no lo recargan. Devuelve True si lo ha reescrito.
+def write_snapshot(posts, path=SNAPSHOT_PATH):
+    data = build_snapshot(posts)
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return True
+
+
+# Lectura de un snapshot proyectado en memoria. El fichero se reemplaza entero al regenerarlo,
+# así que la proyección abierta sigue siendo coherente hasta que el almacén la sustituye.
+class BlogSnapshot:
+    def __init__(self, path=SNAPSHOT_PATH):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            raise ValueError(f"{path}: snapshot truncado")
+        magic, version, _, count, index_offset, index_length = _HEADER.unpack_from(self._map)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{path}: no es un snapshot del blog")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"{path}: versión de snapshot {version} no soportada (se espera {SNAPSHOT_VERSION})")
+        if index_offset + index_length > len(self._map):
+            raise ValueError(f"{path}: snapshot truncado")
+        index = json.loads(self._map[index_offset:index_offset + index_length])
+        if len(index) != count:
+            raise ValueError(f"{path}: el índice no coincide con la cabecera")
+        self._entries = [dict(zip(INDEX_FIELDS, row)) for row in index]
+
+    # Campos de la tarjeta de cada publicación (sin el cuerpo), de la más reciente a la más antigua
+    def entries(self):
+        return self._entries
+
+    # Publicación completa a partir de la posición de su registro: solo se lee y se decodifica ese registro
+    def read(self, offset, length):
+        return json.loads(self._map[offset:offset + length])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera el snapshot del blog a partir de publicaciones en Markdown")
+    parser.add_argument("sources", nargs="+", help="ficheros .md, carpetas con ficheros .md o ficheros JSON")
+    parser.add_argument("--output", default=SNAPSHOT_PATH)
+    parser.add_argument("--check", action="store_true", help="solo valida, no escribe el snapshot")
+    args = parser.parse_args()
+
+    posts, errors = [], []
+    for source in args.sources:
+        try:
+            entries = read_posts(source)
+        except (OSError, ValueError) as exc:
+            errors.append(str(exc))
+            continue
+        for post, origin in entries:
+            try:
+                posts.append(validate_post(post, origin))
+            except ValueError as exc:
+                errors.append(str(exc))
+
+    for error in errors:
+        print(f"ERROR {error}", file=sys.stderr)
+    if errors:
+        sys.exit(1)
+    if args.check:
+        print(f"{len(posts)} publicaciones válidas")
+    else:
+        changed = write_snapshot(posts, args.output)
+        state = "actualizado" if changed else "sin cambios"
+        print(f"{args.output}: {len(posts)} publicaciones, {os.path.getsize(args.output)} B ({state})")
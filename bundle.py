@@ -0,0 +1,136 @@
+import os
+import re
+import threading
+from functools import lru_cache
+
+from assets import STATIC_DIR, media_url, publish_static
+from sections import CONTACT_CSS, GLOBAL_CSS, SERVICES_CSS, SIDEBAR_CSS
+
+# Hoja de estilos única de la web y tipografías propias.
+# Todo el CSS de sections.py se une en una hoja minificada que se publica en static/generated con un
+# nombre derivado de su contenido: cada rerun envía solo una etiqueta <link> y el navegador descarga
+# la hoja una vez. Las fuentes se sirven desde static/fonts en lugar de Google Fonts, así que la
+# primera pintura no depende de otro dominio y la web funciona sin conexión a internet. Sin carpeta
+# estática, la hoja va en línea y las fuentes se sirven desde el almacén de medios de Streamlit.
+#
+# Las fuentes de static/fonts son subconjuntos de Nunito Sans (licencia SIL OFL 1.1, static/fonts/OFL.txt).
+# Para generar las fuentes (requiere fonttools y brotli, solo en el momento de generarlas):
+#   python bundle.py fonts NunitoSans[wght].ttf NunitoSans-Italic[wght].ttf
+
+FONTS_DIR = os.path.join(STATIC_DIR, "fonts")
+FONT_FAMILY = "Nunito Sans"
+
+# Caras que usa la web (las mismas que se pedían a Google Fonts): fichero, estilo y peso
+FONT_FACES = (
+    ("nunito-sans-300.woff2", "normal", 300),
+    ("nunito-sans-900-italic.woff2", "italic", 900),
+)
+
+# Caracteres incluidos en el subconjunto: el rango "latin" de Google Fonts (español incluido)
+FONT_UNICODE_RANGE = ("U+0000-00FF,U+0131,U+0152-0153,U+02BB-02BC,U+02C6,U+02DA,U+02DC,U+0304,U+0308,"
+                      "U+0329,U+2000-206F,U+20AC,U+2122,U+2191,U+2193,U+2212,U+2215,U+FEFF,U+FFFD")
+
+_COMMENTS = re.compile(r"/\*.*?\*/", re.S)
+_SPACES = re.compile(r"\s+")
+_PUNCTUATION = re.compile(r"\s*([{}:;,>])\s*")
+
+
+# Minificación sencilla: sin comentarios, sin espacios sobrantes y sin el último ';' de cada bloque
+def minify_css(css):
+    css = _COMMENTS.sub("", css)
+    css = _SPACES.sub(" ", css)
+    css = _PUNCTUATION.sub(r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+# Reglas @font-face de FONT_FACES. Por defecto apuntan a static/fonts con rutas relativas a
+# static/generated; `font_urls` da otra URL para cada cara (una tupla vacía deja la hoja sin fuentes).
+def font_faces_css(font_urls=None):
+    if font_urls is None:
+        font_urls = tuple(f"../fonts/{filename}" for filename, _, _ in FONT_FACES)
+    rules = []
+    for (_, style, weight), url in zip(FONT_FACES, font_urls):
+        rules.append(
+            f"@font-face {{ font-family: '{FONT_FAMILY}'; font-style: {style}; font-weight: {weight}; "
+            f"font-display: swap; src: url('{url}') format('woff2'); "
+            f"unicode-range: {FONT_UNICODE_RANGE}; }}"
+        )
+    return "\n".join(rules)
+
+
+# URLs de las fuentes en el almacén de medios de Streamlit, para la hoja en línea (sin carpeta
+# estática). Tupla vacía si no hay servidor de Streamlit (AppTest).
+def media_font_urls():
+    urls = tuple(media_url(os.path.join(FONTS_DIR, filename), f"analytiq-font-{style}-{weight}")
+                 for filename, style, weight in FONT_FACES)
+    return () if None in urls else urls
+
+
+# CSS completo de la web, minificado. `font_urls` como en font_faces_css.
+@lru_cache(maxsize=8)
+def stylesheet_css(fondo_url, font_urls=None):
+    parts = [font_faces_css(font_urls)]
+    parts += [GLOBAL_CSS.format(fondo_url=fondo_url), SIDEBAR_CSS, SERVICES_CSS, CONTACT_CSS]
+    return minify_css("\n".join(parts))
+
+
+_stylesheets = {}
+_lock = threading.Lock()
+
+
+# Publica la hoja de estilos en static/generated y devuelve su URL. La imagen de fondo se publica
+# en la misma carpeta, así que la hoja la referencia por su nombre.
+def stylesheet_url(fondo_url):
+    with _lock:
+        url = _stylesheets.get(fondo_url)
+        if url is None:
+            css = stylesheet_css(os.path.basename(fondo_url))
+            url = _stylesheets[fondo_url] = publish_static(css.encode(), ".css")
+        return url
+
+
+# Genera una cara de la fuente en woff2: fija el peso de la fuente variable y deja solo los
+# caracteres de FONT_UNICODE_RANGE
+def subset_font(source, target, weight):
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+    from fontTools.varLib import instancer
+
+    font = TTFont(source)
+    if "fvar" in font:
+        axes = {axis.axisTag: axis.defaultValue for axis in font["fvar"].axes}
+        axes["wght"] = weight
+        font = instancer.instantiateVariableFont(font, axes, updateFontNames=True)
+
+    unicodes = []
+    for part in FONT_UNICODE_RANGE.split(","):
+        start, _, end = part[2:].partition("-")
+        unicodes.extend(range(int(start, 16), int(end or start, 16) + 1))
+
+    options = subset.Options()
+    options.flavor = "woff2"
+    options.layout_features = ["kern", "liga", "calt", "locl", "mark", "mkmk"]
+    options.name_IDs = [0, 1, 2, 3, 4, 5, 6]
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=unicodes)
+    subsetter.subset(font)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    font.flavor = "woff2"
+    font.save(target)
+    return target
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Genera las fuentes de static/fonts")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    fonts_parser = subparsers.add_parser("fonts", help="subconjuntos woff2 a partir de las fuentes variables")
+    fonts_parser.add_argument("regular", help="Nunito Sans variable (normal)")
+    fonts_parser.add_argument("italic", help="Nunito Sans variable (cursiva)")
+    args = parser.parse_args()
+
+    sources = {"normal": args.regular, "italic": args.italic}
+    for filename, style, weight in FONT_FACES:
+        target = subset_font(sources[style], os.path.join(FONTS_DIR, filename), weight)
+        print(f"{os.path.getsize(target):>8} {target}")
@@ -0,0 +1,305 @@
+import argparse
+import asyncio
+import html
+import os
+import re
+import sys
+import time
+from email import policy
+from email.headerregistry import Address
+from email.message import EmailMessage
+from email.utils import make_msgid
+
+from blog import get_blog_store
+from sections import NEWSLETTER_ISSUE_HTML, NEWSLETTER_ISSUE_TEXT
+from startup import load_environment
+from storage import (
+    DELIVERY_DEFERRED,
+    DELIVERY_FAILED,
+    DELIVERY_SENDING,
+    DELIVERY_SENT,
+    delivery_counts,
+    ensure_issue,
+    iter_pending_recipients,
+    record_deliveries,
+)
+from validation import clean_name
+
+# Envío de la newsletter: cada número es una publicación del blog.
+# Los suscriptores se leen de la base de datos en bloques por clave y se reparten entre varias conexiones
+# SMTP asíncronas (aiosmtplib) con un ritmo máximo de mensajes por segundo. El número se
+# renderiza una sola vez; cada correo solo inserta el nombre del destinatario en la plantilla.
+#
+# Cada destinatario queda registrado en newsletter_deliveries: antes de enviar un bloque se
+# marca como "sending" y después como "sent", "deferred" (error temporal) o "failed" (rechazo
+# permanente). Al repetir el comando solo se envía a los que faltan y a los aplazados; los que
+# quedaron en "sending" por una interrupción no se repiten salvo con --resend-unconfirmed.
+#
+# Configuración (entorno o .env): SMTP_HOST, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD,
+# SMTP_STARTTLS=1, NEWSLETTER_FROM, SITE_URL.
+#
+# Uso: python dispatch.py <slug-de-la-publicación> --concurrency 8 --rate 20
+#      python dispatch.py <slug> --status
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE = 20.0             # mensajes por segundo entre todas las conexiones
+DEFAULT_CHUNK_SIZE = 500        # suscriptores por lectura de la base de datos
+MESSAGES_PER_CONNECTION = 100   # se reabre la conexión cada N mensajes (límite habitual de los servidores)
+SEND_ATTEMPTS = 3               # intentos por mensaje ante desconexiones antes de aplazarlo
+RETRY_DELAY_SECONDS = 1.0
+RECORD_BATCH = 200              # estados que se guardan por transacción
+RECORD_INTERVAL_SECONDS = 1.0   # y como mucho cada segundo, aunque el lote no esté completo
+SMTP_TIMEOUT_SECONDS = 30.0
+
+# Marcas donde va el nombre del destinatario en el número ya codificado (texto y HTML)
+TEXT_NAME_MARKER = "@@ANALYTIQ_NAME_TEXT@@"
+HTML_NAME_MARKER = "@@ANALYTIQ_NAME_HTML@@"
+_MARKERS = re.compile(f"({TEXT_NAME_MARKER}|{HTML_NAME_MARKER})".encode())
+
+# Longitud máxima de línea del cuerpo (el límite de SMTP es 998 bytes)
+MAX_LINE_LENGTH = 900
+
+
+# Parámetros SMTP del entorno
+def smtp_settings():
+    return {
+        "hostname": os.getenv("SMTP_HOST", "localhost"),
+        "port": int(os.getenv("SMTP_PORT", "25")),
+        "username": os.getenv("SMTP_USERNAME") or None,
+        "password": os.getenv("SMTP_PASSWORD") or None,
+        "start_tls": os.getenv("SMTP_STARTTLS", "").strip().lower() in ("1", "true", "yes", "on"),
+        "timeout": SMTP_TIMEOUT_SECONDS,
+    }
+
+
+# Parte las líneas largas por el último espacio antes de MAX_LINE_LENGTH (en HTML y en texto
+# un salto de línea entre palabras se muestra igual que un espacio)
+def _wrap_long_lines(text):
+    lines = []
+    for line in text.splitlines():
+        while len(line) > MAX_LINE_LENGTH:
+            cut = line.rfind(" ", 0, MAX_LINE_LENGTH)
+            if cut <= 0:
+                break
+            lines.append(line[:cut])
+            line = line[cut + 1:]
+        lines.append(line)
+    return "\n".join(lines)
+
+
+# Número de la newsletter compilado una vez: el correo completo (cabeceras comunes y las dos
+# versiones, en 8 bits) se codifica al crearlo y se guarda partido por las marcas del nombre.
+# Cada destinatario solo añade sus cabeceras To y Message-ID y une las partes con su nombre.
+class Issue:
+    def __init__(self, post, sender, site_url):
+        self.slug = post["slug"]
+        self.subject = f"{post['title'].strip()} {post.get('emoji', '')}".strip()
+        self.sender = sender
+        self._domain = sender.rpartition("@")[2] or None
+        fields = {
+            "title": post["title"], "emoji": post.get("emoji", ""), "date": post["date"],
+            "summary": post["summary"], "site_url": site_url,
+        }
+        text = NEWSLETTER_ISSUE_TEXT.format(name=TEXT_NAME_MARKER, content=post["content"], **fields)
+        body = NEWSLETTER_ISSUE_HTML.format(name=HTML_NAME_MARKER, content=post["content_html"],
+                                            **{field: html.escape(value) for field, value in fields.items()})
+
+        msg = EmailMessage()
+        msg["From"] = sender
+        msg["Subject"] = self.subject
+        msg["List-Unsubscribe"] = f"<mailto:{sender}?subject=baja>"
+        msg.set_content(_wrap_long_lines(text), cte="8bit")
+        msg.add_alternative(_wrap_long_lines(body), subtype="html", cte="8bit")
+        self._segments = _MARKERS.split(msg.as_bytes(policy=policy.SMTP))
+
+    # Correo de un destinatario, ya codificado. Las cabeceras se generan con el paquete email, que
+    # codifica el nombre y rechaza los saltos de línea; el nombre se limpia antes por si es una fila
+    # guardada antes de que el alta lo limpiara.
+    def message(self, name, email):
+        name = clean_name(name)
+        values = {
+            TEXT_NAME_MARKER.encode(): name.encode(),
+            HTML_NAME_MARKER.encode(): html.escape(name).encode(),
+        }
+        headers = EmailMessage(policy=policy.SMTP)
+        headers["To"] = Address(display_name=name, addr_spec=email)
+        headers["Message-ID"] = make_msgid(domain=self._domain)
+        # as_bytes termina con la línea en blanco que separa cabeceras y cuerpo: las cabeceras
+        # comunes del número van a continuación
+        return headers.as_bytes()[:-2] + b"".join(values.get(segment, segment) for segment in self._segments)
+
+
+# Ritmo máximo común a todas las conexiones: cada mensaje reserva el siguiente hueco libre
+class SendPacer:
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+
+    async def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next)
+        self._next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+# Conexión SMTP de un trabajador; se abre al enviar el primer mensaje y se renueva cada
+# MESSAGES_PER_CONNECTION mensajes o tras una desconexión
+class SmtpConnection:
+    def __init__(self, settings):
+        self.settings = settings
+        self._client = None
+        self._sent = 0
+
+    async def send(self, sender, recipient, message):
+        import aiosmtplib
+
+        if self._client is not None and self._sent >= MESSAGES_PER_CONNECTION:
+            await self.close()
+        if self._client is None:
+            client = aiosmtplib.SMTP(**self.settings)
+            await client.connect()
+            self._client, self._sent = client, 0
+        # El cuerpo va en 8 bits (UTF-8 sin recodificar): se anuncia si el servidor lo admite
+        options = ["BODY=8BITMIME"] if self._client.supports_extension("8bitmime") else []
+        await self._client.sendmail(sender, [recipient], message, mail_options=options)
+        self._sent += 1
+
+    async def close(self):
+        client, self._client = self._client, None
+        if client is not None:
+            try:
+                await client.quit()
+            except Exception:
+                client.close()
+
+
+# Envía un correo y devuelve (estado, error). Los rechazos 5xx son permanentes; las desconexiones
+# y los errores 4xx se reintentan con una conexión nueva y, si persisten, el envío se aplaza.
+async def deliver(connection, sender, recipient, message):
+    import aiosmtplib
+
+    error = None
+    for attempt in range(SEND_ATTEMPTS):
+        try:
+            await connection.send(sender, recipient, message)
+            return DELIVERY_SENT, None
+        except aiosmtplib.SMTPRecipientsRefused as exc:
+            codes = [response.code for response in exc.recipients]
+            status = DELIVERY_FAILED if all(code >= 500 for code in codes) else DELIVERY_DEFERRED
+            return status, str(exc)
+        except aiosmtplib.SMTPResponseException as exc:
+            if exc.code >= 500:
+                return DELIVERY_FAILED, f"{exc.code} {exc.message}"
+            error = f"{exc.code} {exc.message}"
+        except (aiosmtplib.SMTPException, OSError) as exc:
+            error = str(exc) or type(exc).__name__
+        await connection.close()
+        await asyncio.sleep(RETRY_DELAY_SECONDS * (attempt + 1))
+    return DELIVERY_DEFERRED, error
+
+
+# Envía el número a todos los destinatarios pendientes. Devuelve el recuento de estados de esta ejecución.
+async def dispatch(issue, issue_id, settings, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE,
+                   chunk_size=DEFAULT_CHUNK_SIZE, resend_unconfirmed=False, db_path=None):
+    recipients = asyncio.Queue(maxsize=concurrency * 4)
+    results = asyncio.Queue()
+    pacer = SendPacer(rate)
+    totals = {}
+    # Marcados como "sending" que ningún trabajador ha empezado a enviar todavía
+    queued = set()
+
+    # Lee los bloques de la base de datos (en un hilo, para no bloquear el bucle) y los marca antes de encolarlos
+    async def produce():
+        chunks = iter_pending_recipients(issue_id, chunk_size, resend_unconfirmed, db_path)
+        while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+            await asyncio.to_thread(record_deliveries, issue_id,
+                                    [(subscriber_id, DELIVERY_SENDING, None) for subscriber_id, _, _ in chunk],
+                                    db_path)
+            queued.update(subscriber_id for subscriber_id, _, _ in chunk)
+            for recipient in chunk:
+                await recipients.put(recipient)
+        for _ in range(concurrency):
+            await recipients.put(None)
+
+    async def work():
+        connection = SmtpConnection(settings)
+        try:
+            while (recipient := await recipients.get()) is not None:
+                subscriber_id, name, email = recipient
+                queued.discard(subscriber_id)
+                await pacer.wait()
+                status, error = await deliver(connection, issue.sender, email, issue.message(name, email))
+                await results.put((subscriber_id, status, error))
+        finally:
+            await connection.close()
+
+    # Guarda los estados por lotes (RECORD_BATCH o cada RECORD_INTERVAL_SECONDS), una transacción por lote
+    async def record():
+        batch = []
+        flushed = time.monotonic()
+        while (result := await results.get()) is not None:
+            batch.append(result)
+            totals[result[1]] = totals.get(result[1], 0) + 1
+            if len(batch) >= RECORD_BATCH or time.monotonic() - flushed >= RECORD_INTERVAL_SECONDS:
+                await asyncio.to_thread(record_deliveries, issue_id, batch, db_path)
+                batch = []
+                flushed = time.monotonic()
+        if batch:
+            await asyncio.to_thread(record_deliveries, issue_id, batch, db_path)
+
+    recorder = asyncio.create_task(record())
+    try:
+        await asyncio.gather(produce(), *(work() for _ in range(concurrency)))
+    finally:
+        # También al cancelar: los envíos ya confirmados se guardan antes de salir
+        await results.put(None)
+        await asyncio.shield(recorder)
+        # Si se interrumpe, los que no llegaron a enviarse quedan aplazados y no "sin confirmar"
+        if queued:
+            record_deliveries(issue_id, [(subscriber_id, DELIVERY_DEFERRED, "interrumpido antes del envío")
+                                         for subscriber_id in queued], db_path)
+    return totals
+
+
+# Número de la newsletter a partir de una publicación del blog
+def load_issue(slug, sender, site_url):
+    store = get_blog_store()
+    post = store.get(slug)
+    if post is None:
+        available = ", ".join(post["slug"] for post in store.posts())
+        raise SystemExit(f"No existe la publicación '{slug}'. Disponibles: {available}")
+    return Issue(post, sender, site_url)
+
+
+if __name__ == "__main__":
+    load_environment()
+    parser = argparse.ArgumentParser(description="Envía una publicación del blog a los suscriptores de la newsletter")
+    parser.add_argument("slug", help="slug de la publicación del blog")
+    parser.add_argument("--db", default=None, help="base de datos (por defecto DATABASE_URL o newsletter.db)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="conexiones SMTP simultáneas")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="mensajes por segundo (0 sin límite)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--resend-unconfirmed", action="store_true",
+                        help="reenvía a los destinatarios que quedaron sin confirmar en una ejecución interrumpida")
+    parser.add_argument("--status", action="store_true", help="solo muestra el estado de los envíos")
+    args = parser.parse_args()
+
+    issue = load_issue(args.slug, os.getenv("NEWSLETTER_FROM", "analytiq.es@gmail.com"),
+                       os.getenv("SITE_URL", "https://analytiq.es/"))
+    issue_id = ensure_issue(issue.slug, issue.subject, args.db)
+    if not args.status:
+        t0 = time.perf_counter()
+        try:
+            totals = asyncio.run(dispatch(issue, issue_id, smtp_settings(), args.concurrency, args.rate,
+                                          args.chunk_size, args.resend_unconfirmed, args.db))
+        except KeyboardInterrupt:
+            print("Interrumpido: los envíos confirmados están guardados; vuelve a ejecutar para continuar.",
+                  file=sys.stderr)
+            sys.exit(130)
+        elapsed = time.perf_counter() - t0
+        sent = totals.get(DELIVERY_SENT, 0)
+        print(f"Esta ejecución: {totals or 'nada pendiente'} en {elapsed:.1f} s ({sent / elapsed:.1f} correos/s)")
+    print(f"Estado de '{issue.slug}': {delivery_counts(issue_id, args.db)}")
@@ -0,0 +1,181 @@
+import uuid
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import streamlit as st
+
+from fragments import render_fragment
+from metrics import stage
+from rate_limit import ACCEPTED, REJECTED_DUPLICATE, check_contact
+from sections import CONTACT_BANNER_HTML
+from storage import SUBSCRIBE_EXISTING, SUBSCRIBE_INVALID, SUBSCRIBE_NEW
+from validation import EMAIL_DISPOSABLE, EMAIL_VALID, MAX_NAME_LENGTH, check_email, clean_name
+from write_behind import get_writer
+
+# Formularios de la web. Cada uno es un fragmento de Streamlit: al enviar o pulsar sus botones
+# solo se vuelve a ejecutar su propia función, no todo web.py.
+
+# Tiempo máximo (s) que el formulario de la newsletter espera a que se confirme el alta
+NEWSLETTER_WAIT_SECONDS = 0.5
+
+
+# Mensaje de error para un correo no aceptado (None si es válido). Lo usan los cuatro formularios.
+def email_error(email):
+    verdict, _ = check_email(email)
+    if verdict == EMAIL_VALID:
+        return None
+    if verdict == EMAIL_DISPOSABLE:
+        return "No se admiten direcciones de correo temporales. Usa tu correo habitual."
+    return "Por favor, introduce un correo electrónico válido."
+
+
+# Guardar en la sesión una escritura pendiente para informar de su resultado en el siguiente rerun
+def track_write(kind, future):
+    st.session_state.setdefault("pending_writes", []).append((kind, future))
+
+
+# Mostrar el resultado de las escrituras en segundo plano ya confirmadas
+def report_pending_writes():
+    pending = []
+    for kind, future in st.session_state.get("pending_writes", []):
+        if not future.done():
+            pending.append((kind, future))
+        elif future.exception() is not None:
+            st.toast(f"Error al guardar los datos: {future.exception()}", icon="⚠️")
+        elif kind == "newsletter" and future.result() == SUBSCRIBE_EXISTING:
+            st.toast("Este correo ya está registrado en nuestra Newsletter.", icon="⚠️")
+        elif kind == "newsletter" and future.result() == SUBSCRIBE_NEW:
+            st.toast("Suscripción a la Newsletter confirmada.", icon="✅")
+    st.session_state["pending_writes"] = pending
+
+
+# Formulario de suscripción a la newsletter
+@st.fragment
+def newsletter_form():
+    report_pending_writes()
+    with st.form("newsletter_form"):
+        name = st.text_input("Nombre", placeholder="Ingresa tu nombre completo", max_chars=MAX_NAME_LENGTH)
+        email = st.text_input("Correo electrónico", placeholder="Ingresa tu correo electrónico")
+        submitted = st.form_submit_button("🎉 ¡Suscribirme ahora!")
+
+        if submitted:
+            name = clean_name(name)
+            if not name or not email:
+                st.error("Por favor, completa todos los campos para suscribirte.")
+            elif error := email_error(email):
+                st.error(error)
+            else:
+                # Alta atómica (una sola sentencia) a través del escritor en segundo plano.
+                # Si el lote tarda más de lo previsto solo se acusa recibo: el resultado real (alta,
+                # correo ya registrado o error) se comunica en el siguiente rerun.
+                with stage("form:newsletter"):
+                    future = get_writer().submit_subscriber(name, email)
+                    try:
+                        result = future.result(timeout=NEWSLETTER_WAIT_SECONDS)
+                    except FutureTimeoutError:
+                        track_write("newsletter", future)
+                        result = None
+                    except Exception as e:
+                        result = e
+
+                if result is None:
+                    st.info(f"Hemos recibido tu solicitud, {name}. Estamos confirmando tu suscripción…")
+                elif isinstance(result, Exception):
+                    st.error(f"Error al guardar los datos: {result}")
+                elif result == SUBSCRIBE_INVALID:
+                    st.error("Por favor, introduce un correo electrónico válido.")
+                elif result == SUBSCRIBE_EXISTING:
+                    st.error("Este correo ya está registrado en nuestra Newsletter.")
+                else:
+                    st.success(f"¡Gracias {name}! Te has unido a nuestra Newsletter.")
+                    st.balloons()  # Solo aparecen si el correo es válido y no está registrado
+
+
+# Formulario de contacto compartido por Servicios, Demo y Contacto. Devuelve True si se ha enviado.
+# Los campos van dentro de un st.form para que escribir en ellos no provoque ningún rerun.
+def contact_form(form_key, email_label="Correo electrónico",
+                 email_placeholder="Ingresa tu correo electrónico",
+                 message_placeholder="Escribe tu consulta o mensaje aquí...",
+                 submit_label="Enviar", success_message=None,
+                 missing_message="Por favor, completa todos los campos antes de enviar el mensaje."):
+    report_pending_writes()
+    get_writer().warm_contacts()
+    with st.form(form_key):
+        name = st.text_input("Nombre", placeholder="Ingresa tu nombre completo", max_chars=MAX_NAME_LENGTH)
+        email = st.text_input(email_label, placeholder=email_placeholder)
+        message = st.text_area("Mensaje", placeholder=message_placeholder)
+        submitted = st.form_submit_button(submit_label)
+
+    if not submitted:
+        return False
+    name = clean_name(name)
+    if not (name and email and message):
+        st.error(missing_message)
+        return False
+    error = email_error(email)
+    if error:
+        st.error(error)
+        return False
+
+    # Límite de envíos por sesión y por correo, y descarte de mensajes repetidos, antes de tocar SQLite
+    session_key = st.session_state.setdefault("rate_limit_key", uuid.uuid4().hex)
+    outcome = check_contact(session_key, email, message)
+    if outcome == REJECTED_DUPLICATE:
+        st.info("Ya hemos recibido este mensaje. Nos pondremos en contacto contigo pronto.")
+        return False
+    if outcome != ACCEPTED:
+        st.warning("Has enviado demasiados mensajes seguidos. Inténtalo de nuevo en unos minutos.")
+        return False
+
+    # Guardar los datos en la base de datos (en segundo plano)
+    with stage(f"form:{form_key}"):
+        track_write("contact", get_writer().submit_contact(name, email, message))
+    st.success((success_message or "¡Gracias por contactarnos! Nos pondremos en contacto contigo pronto.").format(
+        name=name, email=email))
+    return True
+
+
+# Llamada a la acción y formulario de contacto de la página Servicios
+@st.fragment
+def servicios_contact():
+    # Botón que alterna el formulario de contacto
+    if st.button("¡Contáctanos para Más Información!"):
+        st.session_state["show_form"] = not st.session_state.get("show_form", False)  # Alternar el estado
+
+    # Mostrar el formulario si el estado es True
+    if st.session_state.get("show_form", False):
+        st.markdown(render_fragment("contact_banner", CONTACT_BANNER_HTML), unsafe_allow_html=True)
+        contact_form("servicios_contact_form", message_placeholder="Escribe qué necesitas")
+
+
+def _show_demo_form():
+    st.session_state["show_demo_form"] = True
+
+
+# Llamada a la acción y formulario de contacto de la página Demo
+@st.fragment
+def demo_contact():
+    # Alternar entre llamada a la acción y formulario
+    if "show_demo_form" not in st.session_state:
+        st.session_state["show_demo_form"] = False
+
+    if not st.session_state["show_demo_form"]:
+        # Llamada a la acción (el callback se ejecuta antes de volver a pintar el fragmento)
+        st.button("Rellenar Formulario de Contacto", on_click=_show_demo_form)
+    else:
+        # Formulario de contacto
+        st.markdown(render_fragment("contact_banner", CONTACT_BANNER_HTML), unsafe_allow_html=True)
+        if contact_form("demo_contact_form"):
+            st.session_state["show_demo_form"] = False
+
+
+# Formulario de la página Contacto
+@st.fragment
+def contacto_form():
+    contact_form(
+        "contacto_form",
+        email_label="Email",
+        email_placeholder="Tu correo electrónico",
+        submit_label="Enviar Mensaje",
+        success_message="¡Gracias por tu mensaje, {name}! Te contactaremos pronto a través de {email}.",
+        missing_message="Por favor, completa todos los campos antes de enviar tu mensaje.",
+    )
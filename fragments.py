@@ -0,0 +1,28 @@
+import threading
+
+# Caché de fragmentos HTML estáticos compartida por todo el proceso.
+# La clave es (sección, hash del contenido de la plantilla, valores); el hash de un str se calcula
+# una vez y Python lo guarda en el propio objeto, así que consultar la caché no recorre el texto.
+MAX_FRAGMENTS = 256
+
+_cache = {}
+_lock = threading.Lock()
+
+
+# Devuelve el HTML de la sección, ensamblándolo solo la primera vez para cada plantilla y valores
+def render_fragment(section, template, **values):
+    key = (section, hash(template), tuple(sorted(values.items())))
+    html = _cache.get(key)
+    if html is None:
+        html = template.format(**values) if values else template
+        with _lock:
+            if len(_cache) >= MAX_FRAGMENTS:
+                _cache.clear()
+            _cache[key] = html
+    return html
+
+
+# Vacía la caché de fragmentos
+def clear_fragment_cache():
+    with _lock:
+        _cache.clear()
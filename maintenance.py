@@ -0,0 +1,273 @@
+import argparse
+import glob
+import os
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from migrations import apply_migrations
+from postgres import is_postgres_url
+from startup import load_environment
+from storage import BUSY_TIMEOUT_SECONDS, database_location
+
+# Mantenimiento de newsletter.db sin parar la aplicación: copia de seguridad en caliente,
+# archivado de contactos antiguos en bases de datos mensuales y VACUUM incremental.
+# Cada paso trabaja por partes pequeñas para que las altas y los contactos que entran a la vez
+# nunca esperen más de unos milisegundos.
+#
+# Solo para SQLite: en PostgreSQL (DATABASE_URL) las copias, el archivado y el VACUUM son cosa del
+# servidor (pg_dump o réplicas, particiones por fecha, autovacuum).
+#
+# Uso: python maintenance.py all                 (backup, archivado y vacuum, para un cron diario)
+#      python maintenance.py backup --keep 7
+#      python maintenance.py archive --retention-days 365
+#      python maintenance.py vacuum [--convert]
+
+BACKUP_DIR = "backups"
+ARCHIVE_DIR = "archive"
+
+# Copia de seguridad: páginas por paso y pausa entre pasos (la base de datos solo se lee durante cada paso)
+BACKUP_PAGES_PER_STEP = 256
+BACKUP_SLEEP_SECONDS = 0.005
+# Si otra conexión escribe durante la copia, SQLite la reinicia desde el principio. Tras este número de
+# reinicios se copia lo que queda en un solo paso: en modo WAL una lectura larga no bloquea a los escritores.
+BACKUP_MAX_RESTARTS = 3
+BACKUP_KEEP = 7
+
+# Archivado: contactos con más de CONTACTS_RETENTION_DAYS días pasan a archive/contacts-AAAA-MM.db
+CONTACTS_RETENTION_DAYS = 365
+ARCHIVE_BATCH_SIZE = 500
+
+# VACUUM incremental: páginas liberadas por paso
+VACUUM_PAGES_PER_STEP = 128
+VACUUM_SLEEP_SECONDS = 0.005
+
+ARCHIVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    message TEXT NOT NULL,
+    near_duplicate INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_contacts_created_at ON contacts (created_at);
+CREATE INDEX IF NOT EXISTS idx_contacts_email ON contacts (email);
+"""
+OLDEST_CONTACTS = """
+SELECT id, name, email, message, near_duplicate, created_at FROM contacts
+WHERE created_at < ? ORDER BY created_at LIMIT ?;
+"""
+ARCHIVE_CONTACT = """
+INSERT OR IGNORE INTO contacts (id, name, email, message, near_duplicate, created_at) VALUES (?, ?, ?, ?, ?, ?);
+"""
+DELETE_CONTACT = "DELETE FROM contacts WHERE id = ?;"
+
+
+# Conexión propia del mantenimiento (sin transacción implícita, con la misma espera ante bloqueos que la app)
+def _connect(db_path):
+    if is_postgres_url(db_path):
+        raise ValueError("maintenance.py solo trabaja con bases de datos SQLite")
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute(f"PRAGMA busy_timeout={int(BUSY_TIMEOUT_SECONDS * 1000)};")
+    return conn
+
+
+def _timestamp():
+    return datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+
+
+class _BackupRestarted(Exception):
+    pass
+
+
+# Copia de seguridad en caliente con la API de backup de SQLite, por pasos de pocas páginas.
+# Se escribe en un temporal y se renombra al final: en backups/ solo hay copias completas y verificadas.
+# Devuelve (ruta, reinicios).
+def backup(db_path=None, backup_dir=BACKUP_DIR, pages=BACKUP_PAGES_PER_STEP, sleep=BACKUP_SLEEP_SECONDS,
+           keep=BACKUP_KEEP):
+    db_path = database_location(db_path)
+    os.makedirs(backup_dir, exist_ok=True)
+    name = os.path.splitext(os.path.basename(db_path))[0]
+    target = os.path.join(backup_dir, f"{name}-{_timestamp()}.db")
+    tmp_path = f"{target}.tmp"
+    progress = {"remaining": None, "restarts": 0}
+
+    # remaining vuelve a crecer cuando SQLite reinicia la copia porque otra conexión ha escrito
+    def on_progress(status, remaining, total):
+        if progress["remaining"] is not None and remaining > progress["remaining"]:
+            progress["restarts"] += 1
+        progress["remaining"] = remaining
+        if progress["restarts"] >= BACKUP_MAX_RESTARTS:
+            raise _BackupRestarted
+
+    source = _connect(db_path)
+    try:
+        dest = sqlite3.connect(tmp_path)
+        try:
+            try:
+                source.backup(dest, pages=pages, progress=on_progress, sleep=sleep)
+            except _BackupRestarted:
+                source.backup(dest)
+            if dest.execute("PRAGMA quick_check;").fetchone()[0] != "ok":
+                raise sqlite3.DatabaseError(f"La copia {tmp_path} no supera quick_check")
+        finally:
+            dest.close()
+        os.replace(tmp_path, target)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        source.close()
+    _prune_backups(backup_dir, name, keep)
+    return target, progress["restarts"]
+
+
+# Conserva solo las keep copias más recientes (el nombre lleva la fecha, así que el orden alfabético vale)
+def _prune_backups(backup_dir, name, keep):
+    if keep <= 0:
+        return
+    for path in sorted(glob.glob(os.path.join(backup_dir, f"{name}-*.db")))[:-keep]:
+        os.remove(path)
+
+
+def _archive_path(archive_dir, month):
+    return os.path.join(archive_dir, f"contacts-{month}.db")
+
+
+# Abre (o crea) el archivo de un mes. Los archivos creados antes de la migración 6 no tienen la
+# columna near_duplicate y CREATE TABLE IF NOT EXISTS no la añade: se añade aquí.
+def _open_archive(path):
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.executescript(ARCHIVE_SCHEMA)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(contacts);")}
+    if "near_duplicate" not in columns:
+        conn.execute("ALTER TABLE contacts ADD COLUMN near_duplicate INTEGER NOT NULL DEFAULT 0;")
+    return conn
+
+
+# Mueve los contactos anteriores a la ventana de retención a archive/contacts-AAAA-MM.db, por lotes.
+# Cada lote se guarda primero en el archivo y solo después se borra de la base de datos principal, en una
+# transacción corta: si el proceso se corta a mitad, al repetirlo no se pierde ni se duplica ningún contacto
+# (el id se conserva y el archivo ignora los que ya tiene). Devuelve {mes: contactos archivados}.
+def archive_contacts(db_path=None, retention_days=CONTACTS_RETENTION_DAYS, archive_dir=ARCHIVE_DIR,
+                     batch_size=ARCHIVE_BATCH_SIZE):
+    db_path = database_location(db_path)
+    apply_migrations(db_path)
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=retention_days)).strftime("%Y-%m-%d %H:%M:%S")
+    os.makedirs(archive_dir, exist_ok=True)
+    archives = {}
+    archived = defaultdict(int)
+    conn = _connect(db_path)
+    try:
+        while True:
+            rows = conn.execute(OLDEST_CONTACTS, (cutoff, batch_size)).fetchall()
+            if not rows:
+                break
+            by_month = defaultdict(list)
+            for row in rows:
+                by_month[row[5][:7]].append(row)
+            for month, month_rows in by_month.items():
+                archive = archives.get(month)
+                if archive is None:
+                    archive = archives[month] = _open_archive(_archive_path(archive_dir, month))
+                with archive:
+                    archive.execute("BEGIN;")
+                    archive.executemany(ARCHIVE_CONTACT, month_rows)
+                archived[month] += len(month_rows)
+            conn.execute("BEGIN IMMEDIATE;")
+            try:
+                conn.executemany(DELETE_CONTACT, [(row[0],) for row in rows])
+                conn.execute("COMMIT;")
+            except BaseException:
+                conn.execute("ROLLBACK;")
+                raise
+    finally:
+        conn.close()
+        for archive in archives.values():
+            archive.close()
+    return dict(archived)
+
+
+# Pasa la base de datos a auto_vacuum=INCREMENTAL. Necesita un VACUUM completo (bloquea la base de datos
+# mientras dura), así que solo se hace una vez, a petición y en un momento de poco tráfico.
+def convert_to_incremental(db_path=None):
+    conn = _connect(database_location(db_path))
+    try:
+        if conn.execute("PRAGMA auto_vacuum;").fetchone()[0] == 2:
+            return False
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+        conn.execute("VACUUM;")
+        return True
+    finally:
+        conn.close()
+
+
+# Devuelve al sistema las páginas libres (las que deja el archivado) por pasos cortos.
+# Devuelve las páginas liberadas, o None si la base de datos no está en auto_vacuum=INCREMENTAL.
+def incremental_vacuum(db_path=None, pages=VACUUM_PAGES_PER_STEP, sleep=VACUUM_SLEEP_SECONDS):
+    conn = _connect(database_location(db_path))
+    try:
+        if conn.execute("PRAGMA auto_vacuum;").fetchone()[0] != 2:
+            return None
+        freed = 0
+        while True:
+            free = conn.execute("PRAGMA freelist_count;").fetchone()[0]
+            if not free:
+                break
+            # executescript ejecuta el PRAGMA hasta el final; execute solo daría el primer paso (una página)
+            conn.executescript(f"PRAGMA incremental_vacuum({min(free, pages)});")
+            freed += free - conn.execute("PRAGMA freelist_count;").fetchone()[0]
+            time.sleep(sleep)
+        # Checkpoint pasivo: no espera a los escritores; el fichero se recorta cuando el WAL se vuelca entero
+        conn.execute("PRAGMA wal_checkpoint(PASSIVE);")
+        return freed
+    finally:
+        conn.close()
+
+
+def _size(db_path):
+    return sum(os.path.getsize(path) for path in (db_path, f"{db_path}-wal") if os.path.exists(path))
+
+
+if __name__ == "__main__":
+    load_environment()
+    parser = argparse.ArgumentParser(description="Copia de seguridad, archivado y VACUUM de newsletter.db en caliente")
+    parser.add_argument("command", choices=("backup", "archive", "vacuum", "all"))
+    parser.add_argument("--db", default=None, help="base de datos (por defecto DATABASE_URL o newsletter.db)")
+    parser.add_argument("--backup-dir", default=BACKUP_DIR)
+    parser.add_argument("--keep", type=int, default=BACKUP_KEEP, help="copias de seguridad que se conservan")
+    parser.add_argument("--archive-dir", default=ARCHIVE_DIR)
+    parser.add_argument("--retention-days", type=int,
+                        default=int(os.getenv("CONTACTS_RETENTION_DAYS", CONTACTS_RETENTION_DAYS)),
+                        help="días que los contactos permanecen en la base de datos principal")
+    parser.add_argument("--convert", action="store_true",
+                        help="pasa una base de datos existente a auto_vacuum=INCREMENTAL (VACUUM completo, una vez)")
+    args = parser.parse_args()
+
+    args.db = database_location(args.db)
+    if is_postgres_url(args.db):
+        sys.exit("maintenance.py solo trabaja con SQLite; en PostgreSQL usa las herramientas del servidor")
+    if not os.path.exists(args.db):
+        sys.exit(f"No existe {args.db}")
+    if args.command in ("backup", "all"):
+        t0 = time.perf_counter()
+        path, restarts = backup(args.db, args.backup_dir, keep=args.keep)
+        print(f"Copia de seguridad: {path} en {time.perf_counter() - t0:.2f} s ({restarts} reinicios)")
+    if args.command in ("archive", "all"):
+        archived = archive_contacts(args.db, args.retention_days, args.archive_dir)
+        months = ", ".join(f"{month}: {count}" for month, count in sorted(archived.items()))
+        print(f"Contactos archivados: {sum(archived.values())}" + (f" ({months})" if months else ""))
+    if args.command in ("vacuum", "all"):
+        size = _size(args.db)
+        if args.convert and convert_to_incremental(args.db):
+            print("Base de datos convertida a auto_vacuum=INCREMENTAL")
+        freed = incremental_vacuum(args.db)
+        if freed is None:
+            print("La base de datos no usa auto_vacuum=INCREMENTAL: ejecuta 'vacuum --convert' una vez")
+        else:
+            print(f"VACUUM incremental: {freed} páginas liberadas, {size / 1e6:.1f} MB -> {_size(args.db) / 1e6:.1f} MB")
@@ -0,0 +1,73 @@
+import html
+import re
+
+# Conversión a HTML del subconjunto de Markdown que usa la web: títulos, negrita, enlaces, listas
+# con "- " y párrafos. La usan las páginas pre-renderizadas (prerender.py) para el contenido de
+# sections.py y la ingesta del blog (blog_snapshot.py) para el cuerpo de las publicaciones.
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*)$")
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+_LINK = re.compile(r"\[([^\]]+)\]\(([^)\s]+)\)")
+
+# Esquemas admitidos en los enlaces (o rutas relativas, sin esquema)
+LINK_SCHEMES = ("http:", "https:", "mailto:")
+
+
+def _link(match):
+    text, href = match.groups()
+    if ":" in href.split("/", 1)[0] and not href.lower().startswith(LINK_SCHEMES):
+        return text
+    return f'<a href="{href}">{text}</a>'
+
+
+# Formato en línea: negrita y enlaces
+def _inline_markdown(text):
+    text = _BOLD.sub(r"<strong>\1</strong>", text)
+    return _LINK.sub(_link, text)
+
+
+# Convierte el Markdown a HTML. Los bloques que empiezan por "<" se copian tal cual hasta la
+# siguiente línea en blanco (el HTML de sections.py que va mezclado con Markdown).
+def markdown_to_html(text):
+    out, paragraph, items = [], [], []
+    in_html = False
+
+    def flush():
+        if paragraph:
+            out.append(f"<p>{_inline_markdown(' '.join(paragraph))}</p>")
+            paragraph.clear()
+        if items:
+            out.append("<ul>" + "".join(f"<li>{_inline_markdown(item)}</li>" for item in items) + "</ul>")
+            items.clear()
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        if in_html:
+            out.append(line)
+            in_html = bool(stripped)
+        elif not stripped:
+            flush()
+        elif stripped.startswith("<"):
+            flush()
+            out.append(line)
+            in_html = True
+        elif heading := _HEADING.match(stripped):
+            flush()
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{_inline_markdown(heading.group(2))}</h{level}>")
+        elif stripped.startswith("- "):
+            if paragraph:
+                flush()
+            items.append(stripped[2:])
+        else:
+            if items:
+                flush()
+            paragraph.append(stripped)
+    flush()
+    return "\n".join(out)
+
+
+# Cuerpo de una publicación escrito por un autor: se escapa antes de convertirlo, así que el
+# HTML que contenga se muestra como texto y nunca se inyecta en la página
+def render_post_body(text):
+    return markdown_to_html(html.escape(text, quote=True))
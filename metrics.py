@@ -0,0 +1,339 @@
+import bisect
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Instrumentación opcional de la web. Se activa con METRICS_ENABLED=1 (en el entorno o en .env,
+# que web.py carga con load_dotenv) y, desactivada, cada llamada se reduce a comprobar una variable.
+# Con METRICS_PORT se publica además /metrics en ese puerto en formato de texto de Prometheus.
+#
+# Mide:
+#   - analytiq_stage_seconds{stage=...}: tiempo de cada etapa (assets, páginas, formularios, blog, SQLite, PIL)
+#   - analytiq_rerun_seconds / _rerun_db_queries: por cada rerun completo de web.py
+#   - analytiq_rerun_bytes{page=...}: bytes enviados al navegador por rerun, por página. Se miden
+#     envolviendo ScriptRunContext._enqueue, interno de Streamlit (requirements.txt fija las versiones
+#     probadas); si no se puede, analytiq_rerun_bytes_unavailable_total cuenta los reruns sin medir
+#   - analytiq_session_state_bytes{page=...}: tamaño del session_state de la sesión al final del rerun
+#   - analytiq_db_queries_total{kind=...}: sentencias SQL ejecutadas, por tipo
+#   - analytiq_sessions, analytiq_process_resident_bytes y analytiq_python_traced_bytes (con python -X
+#     tracemalloc): valores del proceso en el momento de leer /metrics, para seguir cuántas sesiones
+#     caben por GB (benchmarks/session_budget.py)
+
+# Límites superiores de los buckets de cada tipo de histograma
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+_HELP = {
+    "analytiq_stage_seconds": "Tiempo por etapa de web.py",
+    "analytiq_rerun_seconds": "Duración de cada rerun completo de web.py",
+    "analytiq_rerun_db_queries": "Sentencias SQL ejecutadas desde el hilo del rerun",
+    "analytiq_rerun_bytes": "Bytes de mensajes enviados al navegador por rerun",
+    "analytiq_rerun_bytes_unavailable_total": "Reruns sin medir los bytes enviados (Streamlit sin ScriptRunContext._enqueue)",
+    "analytiq_db_queries_total": "Sentencias SQL ejecutadas, por tipo",
+    "analytiq_reruns_total": "Reruns completos de web.py",
+    "analytiq_contact_submissions_total": "Envíos de los formularios de contacto, aceptados o rechazados",
+    "analytiq_session_state_bytes": "Tamaño aproximado del session_state al final de cada rerun",
+    "analytiq_sessions": "Sesiones de Streamlit activas en el proceso",
+    "analytiq_process_resident_bytes": "Memoria residente del proceso",
+    "analytiq_python_traced_bytes": "Memoria de Python reservada según tracemalloc (solo con -X tracemalloc)",
+}
+
+
+# ¿Está activada la instrumentación? Se lee del entorno en cada llamada para respetar load_dotenv
+def is_enabled():
+    return os.environ.get("METRICS_ENABLED", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+# Histograma acumulativo con buckets fijos (mismo modelo que Prometheus)
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    # Estimación del cuantil q (0-1): límite superior del bucket donde cae
+    def quantile(self, q):
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+
+# Registro de histogramas y contadores del proceso
+class Registry:
+    def __init__(self):
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, value, buckets=SECONDS_BUCKETS, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def increment(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    # Resumen legible de los histogramas: (nombre, etiquetas, n, media, p50, p95, p99)
+    def summary(self):
+        with self._lock:
+            rows = []
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                rows.append((
+                    name,
+                    ", ".join(f"{key}={value}" for key, value in labels),
+                    histogram.count,
+                    histogram.sum / histogram.count,
+                    histogram.quantile(0.5),
+                    histogram.quantile(0.95),
+                    histogram.quantile(0.99),
+                ))
+            return rows
+
+    # Volcado en el formato de texto de Prometheus
+    def prometheus_text(self):
+        lines = []
+        described = set()
+
+        def describe(name, kind):
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {name} {_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for name, value in process_gauges().items():
+            describe(name, "gauge")
+            lines.append(f"{name} {_number(value)}")
+        with self._lock:
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                describe(name, "histogram")
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(labels, le=_number(bound))} {cumulative}")
+                lines.append(f"{name}_bucket{_labels(labels, le='+Inf')} {histogram.count}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(histogram.sum)}")
+                lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+            for (name, labels), value in sorted(self._counters.items()):
+                describe(name, "counter")
+                lines.append(f"{name}{_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _labels(labels, **extra):
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+registry = Registry()
+
+# Contadores del rerun en curso (uno por hilo de script de Streamlit)
+_rerun = threading.local()
+
+
+# Mide el tiempo de una etapa con nombre
+@contextmanager
+def stage(name):
+    if not is_enabled():
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.observe("analytiq_stage_seconds", time.perf_counter() - t0, stage=name)
+
+
+# Registra la duración de una etapa medida a mano (bloques demasiado largos para envolverlos en `stage`)
+def record_stage(name, seconds):
+    if is_enabled():
+        registry.observe("analytiq_stage_seconds", seconds, stage=name)
+
+
+# Callback de traza de SQLite: cuenta cada sentencia por tipo y para el rerun del hilo actual
+def count_query(sql):
+    kind = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else "OTHER"
+    registry.increment("analytiq_db_queries_total", kind=kind)
+    if getattr(_rerun, "start", None) is not None:
+        _rerun.queries += 1
+
+
+# Cuenta los bytes de los mensajes que la sesión envía al navegador envolviendo su cola de salida.
+# Streamlit no ofrece un gancho público para esto. Devuelve False si el contexto no tiene la cola.
+def _wrap_enqueue():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    enqueue = getattr(ctx, "_enqueue", None)
+    if not callable(enqueue):
+        return False
+    if getattr(enqueue, "_analytiq_counted", False):
+        return True
+
+    def counting_enqueue(msg):
+        if getattr(_rerun, "start", None) is not None and _rerun.bytes is not None:
+            _rerun.bytes += msg.ByteSize()
+        enqueue(msg)
+
+    counting_enqueue._analytiq_counted = True
+    ctx._enqueue = counting_enqueue
+    return True
+
+
+# Marca el inicio de un rerun completo de web.py
+def begin_rerun():
+    if not is_enabled():
+        return
+    start_metrics_server()
+    _rerun.start = time.perf_counter()
+    _rerun.queries = 0
+    _rerun.bytes = 0
+    if not _wrap_enqueue():
+        _rerun.bytes = None
+        registry.increment("analytiq_rerun_bytes_unavailable_total")
+
+
+# Marca el final del rerun y registra su duración, sentencias SQL, bytes enviados (si se han podido
+# medir) y tamaño del session_state (estos dos, por página)
+def end_rerun(page=None):
+    start = getattr(_rerun, "start", None)
+    if start is None:
+        return
+    _rerun.start = None
+    labels = {"page": page} if page else {}
+    registry.observe("analytiq_rerun_seconds", time.perf_counter() - start)
+    registry.observe("analytiq_rerun_db_queries", _rerun.queries, buckets=COUNT_BUCKETS)
+    if _rerun.bytes is not None:
+        registry.observe("analytiq_rerun_bytes", _rerun.bytes, buckets=BYTES_BUCKETS, **labels)
+    registry.observe("analytiq_session_state_bytes", session_state_size(), buckets=BYTES_BUCKETS, **labels)
+    registry.increment("analytiq_reruns_total")
+
+
+# Tamaño aproximado en bytes de un objeto y de todo lo que contiene (contenedores y atributos),
+# contando una sola vez los objetos compartidos
+def deep_size(obj, seen=None):
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(key, seen) + deep_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, seen) for item in obj)
+    elif isinstance(getattr(obj, "__dict__", None), dict) and not isinstance(obj, type):
+        size += deep_size(obj.__dict__, seen)
+    return size
+
+
+# Tamaño del session_state de la sesión actual (claves propias y valores de los widgets)
+def session_state_size():
+    import streamlit as st
+
+    try:
+        return deep_size(st.session_state.to_dict())
+    except Exception:
+        return 0
+
+
+# Memoria residente actual del proceso (Linux: /proc/self/statm) o None si no se puede leer
+def _resident_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# Sesiones activas según el gestor de sesiones de Streamlit (None fuera del servidor)
+def _active_sessions():
+    from streamlit import runtime
+
+    if not runtime.exists():
+        return None
+    manager = getattr(runtime.get_instance(), "_session_mgr", None)
+    return manager.num_active_sessions() if manager is not None else None
+
+
+# Valores del proceso que se leen en el momento de publicar /metrics
+def process_gauges():
+    gauges = {
+        "analytiq_sessions": _active_sessions(),
+        "analytiq_process_resident_bytes": _resident_bytes(),
+    }
+    import tracemalloc
+
+    if tracemalloc.is_tracing():
+        gauges["analytiq_python_traced_bytes"] = tracemalloc.get_traced_memory()[0]
+    return {name: value for name, value in gauges.items() if value is not None}
+
+
+# Manejador de /metrics. http.server solo se importa si se publica el endpoint.
+def _metrics_handler():
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.prometheus_text().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsHandler
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+# Publica /metrics en METRICS_PORT (una sola vez por proceso)
+def start_metrics_server():
+    global _server
+    port = os.environ.get("METRICS_PORT")
+    if not port or _server is not None:
+        return
+    with _server_lock:
+        if _server is None:
+            from http.server import ThreadingHTTPServer
+
+            _server = ThreadingHTTPServer(("127.0.0.1", int(port)), _metrics_handler())
+            threading.Thread(target=_server.serve_forever, name="analytiq-metrics", daemon=True).start()
@@ -0,0 +1,252 @@
+import sqlite3
+import sys
+import threading
+
+from metrics import stage
+from postgres import connect as postgres_connect
+from postgres import display_location, is_postgres_url
+
+# Migraciones del esquema de newsletter.db, en orden. Cada una se aplica una sola vez y queda
+# registrada en la tabla schema_version. Nunca se modifica una migración ya publicada: los
+# cambios nuevos se añaden al final de MIGRATIONS.
+#
+# Las migraciones no importan código de la aplicación (por ejemplo la normalización de correos):
+# deben seguir haciendo exactamente lo mismo aunque ese código cambie más adelante.
+
+
+# 1. Tabla de la newsletter (esquema original)
+def _create_newsletter(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS newsletter (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        email TEXT NOT NULL UNIQUE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """)
+
+
+# 2. Tabla de contactos (esquema original)
+def _create_contacts(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS contacts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        email TEXT NOT NULL,
+        message TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """)
+
+
+# 3. Columna de correo normalizado con índice único.
+# Si ya había duplicados que solo difieren en mayúsculas, se conserva el más antiguo.
+def _add_email_normalized(conn):
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(newsletter);")}
+    if "email_normalized" not in columns:
+        conn.execute("ALTER TABLE newsletter ADD COLUMN email_normalized TEXT;")
+        seen = {}
+        for row_id, email in conn.execute("SELECT id, email FROM newsletter ORDER BY id;"):
+            seen.setdefault(email.strip().casefold(), row_id)
+        conn.executemany(
+            "UPDATE newsletter SET email_normalized = ? WHERE id = ?;",
+            seen.items(),
+        )
+    conn.execute("""
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_newsletter_email_normalized
+    ON newsletter (email_normalized);
+    """)
+
+
+# 4. Índices para consultar contactos y altas por fecha y contactos por correo
+def _add_created_at_indexes(conn):
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_contacts_created_at ON contacts (created_at);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_contacts_email ON contacts (email);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_newsletter_created_at ON newsletter (created_at);")
+
+
+# 5. Envíos de la newsletter: una fila por número y otra por cada destinatario con su estado,
+# para que un envío interrumpido se reanude sin repetir destinatarios (dispatch.py)
+def _create_newsletter_deliveries(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS newsletter_issues (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        slug TEXT NOT NULL UNIQUE,
+        subject TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS newsletter_deliveries (
+        issue_id INTEGER NOT NULL REFERENCES newsletter_issues (id),
+        subscriber_id INTEGER NOT NULL,
+        status TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        error TEXT,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (issue_id, subscriber_id)
+    ) WITHOUT ROWID;
+    """)
+
+
+# 6. Firma MinHash de cada mensaje de contacto y marca de casi duplicado (near_duplicates.py)
+def _add_contact_signatures(conn):
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(contacts);")}
+    if "signature" not in columns:
+        conn.execute("ALTER TABLE contacts ADD COLUMN signature BLOB;")
+    if "near_duplicate" not in columns:
+        conn.execute("ALTER TABLE contacts ADD COLUMN near_duplicate INTEGER NOT NULL DEFAULT 0;")
+
+
+# Esquema de PostgreSQL (postgres.py). Una base de datos nueva empieza directamente en la versión 6,
+# equivalente a SQLite tras las migraciones 1-6; las migraciones siguientes se añaden a las dos listas.
+# created_at se guarda como texto 'AAAA-MM-DD HH:MM:SS' en UTC, igual que CURRENT_TIMESTAMP en SQLite,
+# para que las consultas y las exportaciones den exactamente lo mismo con los dos backends.
+POSTGRES_NOW = "to_char(now() AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI:SS')"
+
+
+def _postgres_create_schema(conn):
+    conn.execute(f"""
+    CREATE TABLE IF NOT EXISTS newsletter (
+        id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+        name TEXT NOT NULL,
+        email TEXT NOT NULL UNIQUE,
+        created_at TEXT DEFAULT {POSTGRES_NOW},
+        email_normalized TEXT
+    );
+    """)
+    conn.execute(f"""
+    CREATE TABLE IF NOT EXISTS contacts (
+        id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+        name TEXT NOT NULL,
+        email TEXT NOT NULL,
+        message TEXT NOT NULL,
+        created_at TEXT DEFAULT {POSTGRES_NOW},
+        signature BYTEA,
+        near_duplicate INTEGER NOT NULL DEFAULT 0
+    );
+    """)
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_newsletter_email_normalized ON newsletter (email_normalized);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_contacts_created_at ON contacts (created_at);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_contacts_email ON contacts (email);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_newsletter_created_at ON newsletter (created_at);")
+    conn.execute(f"""
+    CREATE TABLE IF NOT EXISTS newsletter_issues (
+        id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+        slug TEXT NOT NULL UNIQUE,
+        subject TEXT NOT NULL,
+        created_at TEXT DEFAULT {POSTGRES_NOW}
+    );
+    """)
+    conn.execute(f"""
+    CREATE TABLE IF NOT EXISTS newsletter_deliveries (
+        issue_id BIGINT NOT NULL REFERENCES newsletter_issues (id),
+        subscriber_id BIGINT NOT NULL,
+        status TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        error TEXT,
+        updated_at TEXT DEFAULT {POSTGRES_NOW},
+        PRIMARY KEY (issue_id, subscriber_id)
+    );
+    """)
+
+
+POSTGRES_MIGRATIONS = [
+    (6, "create_schema", _postgres_create_schema),
+]
+
+# Clave del bloqueo consultivo que serializa las migraciones entre réplicas
+POSTGRES_MIGRATION_LOCK = 0x416E616C
+
+MIGRATIONS = [
+    (1, "create_newsletter", _create_newsletter),
+    (2, "create_contacts", _create_contacts),
+    (3, "add_email_normalized", _add_email_normalized),
+    (4, "add_created_at_indexes", _add_created_at_indexes),
+    (5, "create_newsletter_deliveries", _create_newsletter_deliveries),
+    (6, "add_contact_signatures", _add_contact_signatures),
+]
+
+_migrated = set()
+_lock = threading.Lock()
+
+
+# Versión actual del esquema (0 si la base de datos nunca se ha migrado)
+def current_version(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    """)
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version;").fetchone()[0]
+
+
+# Aplica las migraciones pendientes. Devuelve la lista de versiones aplicadas.
+# BEGIN IMMEDIATE toma el bloqueo de escritura, así que si varios procesos arrancan a la vez
+# solo uno aplica cada migración y el resto ve la versión ya actualizada.
+def apply_migrations(db_path):
+    if is_postgres_url(db_path):
+        return apply_postgres_migrations(db_path)
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    try:
+        # Solo tiene efecto en una base de datos nueva (antes de crear la primera tabla): permite
+        # devolver al sistema el espacio libre por partes (maintenance.py vacuum). Una base de datos
+        # existente se convierte una vez con maintenance.py vacuum --convert.
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+        conn.execute("BEGIN IMMEDIATE;")
+        try:
+            version = current_version(conn)
+            applied = []
+            for number, name, migration in MIGRATIONS:
+                if number <= version:
+                    continue
+                migration(conn)
+                conn.execute("INSERT INTO schema_version (version, name) VALUES (?, ?);", (number, name))
+                applied.append(number)
+            conn.execute("COMMIT;")
+        except BaseException:
+            conn.execute("ROLLBACK;")
+            raise
+        return applied
+    finally:
+        conn.close()
+
+
+# Lo mismo en PostgreSQL: el bloqueo consultivo hace de BEGIN IMMEDIATE entre réplicas
+def apply_postgres_migrations(url):
+    conn = postgres_connect(url)
+    try:
+        with conn:
+            conn.execute("SELECT pg_advisory_xact_lock(?);", (POSTGRES_MIGRATION_LOCK,))
+            version = current_version(conn)
+            applied = []
+            for number, name, migration in POSTGRES_MIGRATIONS:
+                if number <= version:
+                    continue
+                migration(conn)
+                conn.execute("INSERT INTO schema_version (version, name) VALUES (?, ?);", (number, name))
+                applied.append(number)
+        return applied
+    finally:
+        conn.close()
+
+
+# Garantiza que el esquema está al día; solo consulta la base de datos la primera vez por proceso
+def ensure_schema(db_path):
+    if db_path in _migrated:
+        return
+    with _lock:
+        if db_path in _migrated:
+            return
+        with stage("db_setup"):
+            apply_migrations(db_path)
+        _migrated.add(db_path)
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "newsletter.db"
+    applied = apply_migrations(path)
+    latest = (POSTGRES_MIGRATIONS if is_postgres_url(path) else MIGRATIONS)[-1][0]
+    print(f"{display_location(path)}: migraciones aplicadas {applied or 'ninguna'}; versión actual {latest}")
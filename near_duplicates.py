@@ -0,0 +1,249 @@
+import os
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from metrics import is_enabled as metrics_enabled
+from metrics import registry
+from storage import connect_to_database, database_location
+
+# Detección de mensajes de contacto casi duplicados (avalanchas de bots con pequeñas variaciones).
+# Cada mensaje se trocea en fragmentos de SHINGLE_SIZE caracteres y se resume en una firma MinHash
+# de NUM_PERMUTATIONS valores; dos firmas coinciden en una fracción de posiciones que estima la
+# similitud de Jaccard entre los textos. Un índice LSH (firma dividida en LSH_BANDS bandas) encuentra
+# los candidatos sin comparar con todos los mensajes, y solo a esos se les calcula la similitud.
+#
+# Las firmas se guardan con cada contacto en la base de datos (columna signature); el índice se carga
+# en segundo plano (warm_index) con los contactos de los últimos NEAR_DUPLICATE_WINDOW_DAYS días y solo
+# calcula las firmas que faltan (contactos anteriores a la migración 6). Solo se indexan los mensajes
+# que se han guardado: los descartados o rechazados no renuevan el índice.
+
+SHINGLE_SIZE = 5
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // LSH_BANDS
+SIMILARITY_THRESHOLD = 0.8
+
+# Los mensajes más cortos (normalizados) no se comparan: "Hola, quiero información" lo escribe mucha gente
+MIN_MESSAGE_LENGTH = 40
+
+NEAR_DUPLICATE_WINDOW_DAYS = 30
+MAX_INDEXED = 50_000
+# Cada cubeta guarda como mucho este número de mensajes: en una avalancha basta con unos cuantos
+# representantes y así la memoria y la comprobación no crecen con el número de copias
+MAX_BUCKET_SIZE = 64
+LOAD_CHUNK_SIZE = 5000
+
+# Qué hacer con un casi duplicado (variable de entorno CONTACT_NEAR_DUPLICATES)
+NEAR_DUPLICATE_FLAG = "flag"  # se guarda con near_duplicate = 1 para revisarlo aparte
+NEAR_DUPLICATE_DROP = "drop"  # no se guarda
+NEAR_DUPLICATE_OFF = "off"
+
+# Las firmas guardadas empiezan por este byte; si cambian los parámetros se recalculan
+SIGNATURE_VERSION = 1
+
+_NON_WORD = re.compile(r"[\W_]+")
+_DIGITS = re.compile(r"\d")
+
+# Funciones hash de la familia multiplicar-desplazar: ((a * x + b) mod 2^64) >> 32, con a impar.
+# La semilla es fija para que las firmas guardadas sigan valiendo entre procesos.
+_rng = np.random.default_rng(20240611)
+_HASH_A = (_rng.integers(1, 2**63, NUM_PERMUTATIONS, dtype=np.uint64) * np.uint64(2) + np.uint64(1))[:, None]
+_HASH_B = _rng.integers(0, 2**63, NUM_PERMUTATIONS, dtype=np.uint64)[:, None]
+_SHINGLE_WEIGHTS = (np.uint64(1) << (np.arange(SHINGLE_SIZE, dtype=np.uint64) * np.uint64(8)))
+
+
+def near_duplicate_action():
+    action = os.getenv("CONTACT_NEAR_DUPLICATES", NEAR_DUPLICATE_FLAG).strip().lower()
+    return action if action in (NEAR_DUPLICATE_FLAG, NEAR_DUPLICATE_DROP, NEAR_DUPLICATE_OFF) else NEAR_DUPLICATE_FLAG
+
+
+# Texto comparable: minúsculas, sin signos de puntuación y con todas las cifras iguales
+# (los bots suelen variar teléfonos, importes o contadores)
+def normalize_message(message):
+    return _DIGITS.sub("0", _NON_WORD.sub(" ", message.casefold())).strip()
+
+
+# Fragmentos de SHINGLE_SIZE bytes del texto normalizado como enteros (5 bytes caben en 40 bits
+# sin colisiones), sin repetir. None si el mensaje es demasiado corto para compararlo.
+def shingles(message):
+    text = normalize_message(message)
+    if len(text) < MIN_MESSAGE_LENGTH:
+        return None
+    data = np.frombuffer(text.encode("utf-8"), dtype=np.uint8).astype(np.uint64)
+    windows = np.lib.stride_tricks.sliding_window_view(data, SHINGLE_SIZE)
+    return np.unique(windows @ _SHINGLE_WEIGHTS)
+
+
+# Firma MinHash: el mínimo de cada función hash sobre todos los fragmentos
+def minhash(values):
+    return ((_HASH_A * values + _HASH_B) >> np.uint64(32)).min(axis=1).astype(np.uint32)
+
+
+def signature_of(message):
+    values = shingles(message)
+    return None if values is None else minhash(values)
+
+
+def encode_signature(signature):
+    return bytes([SIGNATURE_VERSION]) + signature.tobytes()
+
+
+# Firma guardada o None si falta o es de otra versión
+def decode_signature(blob):
+    if not blob or blob[0] != SIGNATURE_VERSION or len(blob) != 1 + NUM_PERMUTATIONS * 4:
+        return None
+    return np.frombuffer(blob, dtype=np.uint32, offset=1)
+
+
+# Índice LSH en memoria de las firmas recientes. Las firmas ocupan una matriz circular de max_indexed
+# filas: al llenarse, cada mensaje nuevo sustituye al más antiguo.
+class NearDuplicateIndex:
+    def __init__(self, db_path=None, window_days=NEAR_DUPLICATE_WINDOW_DAYS, max_indexed=MAX_INDEXED):
+        self.db_path = database_location(db_path)
+        self.window_days = window_days
+        self.max_indexed = max_indexed
+        self._matrix = np.zeros((max_indexed, NUM_PERMUTATIONS), dtype=np.uint32)
+        self._slot_bands = [None] * max_indexed
+        self._buckets = [{} for _ in range(LSH_BANDS)]
+        self._added = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _band_keys(signature):
+        rows = signature.reshape(LSH_BANDS, ROWS_PER_BAND)
+        return [row.tobytes() for row in rows]
+
+    # Similitud estimada con el mensaje indexado más parecido que comparta alguna banda (0 si ninguno).
+    # Todos los candidatos se comparan de una vez con una operación sobre la matriz.
+    def _best_match(self, signature, band_keys):
+        candidates = set()
+        for buckets, band_key in zip(self._buckets, band_keys):
+            candidates.update(buckets.get(band_key, ()))
+        if not candidates:
+            return 0.0
+        slots = np.fromiter(candidates, dtype=np.intp, count=len(candidates))
+        matches = np.count_nonzero(self._matrix[slots] == signature, axis=1).max()
+        return float(matches) / NUM_PERMUTATIONS
+
+    def _add(self, signature, band_keys):
+        slot = self._added % self.max_indexed
+        self._added += 1
+        old_band_keys = self._slot_bands[slot]
+        if old_band_keys is not None:
+            for buckets, band_key in zip(self._buckets, old_band_keys):
+                bucket = buckets.get(band_key)
+                if bucket is not None and slot in bucket:
+                    bucket.remove(slot)
+                    if not bucket:
+                        del buckets[band_key]
+        self._matrix[slot] = signature
+        self._slot_bands[slot] = band_keys
+        for buckets, band_key in zip(self._buckets, band_keys):
+            bucket = buckets.setdefault(band_key, [])
+            if len(bucket) < MAX_BUCKET_SIZE:
+                bucket.append(slot)
+
+    # Carga las firmas de los contactos recientes; las que faltan se calculan y se guardan
+    # (así el índice solo se reconstruye de forma incremental)
+    def _load(self):
+        since = (datetime.now(timezone.utc) - timedelta(days=self.window_days)).strftime("%Y-%m-%d %H:%M:%S")
+        last_id = 0
+        while True:
+            with connect_to_database(self.db_path) as conn:
+                rows = conn.execute(
+                    "SELECT id, message, signature FROM contacts WHERE id > ? AND created_at >= ? ORDER BY id LIMIT ?;",
+                    (last_id, since, LOAD_CHUNK_SIZE),
+                ).fetchall()
+            if not rows:
+                break
+            missing = []
+            for row_id, message, blob in rows:
+                signature = decode_signature(blob)
+                if signature is None:
+                    signature = signature_of(message)
+                    if signature is None:
+                        continue
+                    missing.append((encode_signature(signature), row_id))
+                self._add(signature, self._band_keys(signature))
+            if missing:
+                with connect_to_database(self.db_path) as conn:
+                    with conn:
+                        conn.executemany("UPDATE contacts SET signature = ? WHERE id = ?;", missing)
+            last_id = rows[-1][0]
+        self._loaded = True
+
+    # Carga el índice si aún no se ha cargado (warm_index lo hace en segundo plano al abrir un formulario)
+    def load(self):
+        with self._lock:
+            if not self._loaded:
+                self._load()
+
+    # Firma del mensaje y similitud con el más parecido de los recientes. No indexa el mensaje: eso se
+    # hace con add cuando se ha guardado, para que los descartados no ocupen el índice.
+    # Devuelve (firma codificada o None, similitud).
+    def check(self, message):
+        signature = signature_of(message)
+        if signature is None:
+            return None, 0.0
+        band_keys = self._band_keys(signature)
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            similarity = self._best_match(signature, band_keys)
+        return encode_signature(signature), similarity
+
+    # Indexa un mensaje ya guardado a partir de su firma codificada. Si el índice aún no se ha cargado
+    # no hace nada: la carga lo leerá de la base de datos.
+    def add(self, blob):
+        signature = decode_signature(blob)
+        if signature is None:
+            return
+        with self._lock:
+            if self._loaded:
+                self._add(signature, self._band_keys(signature))
+
+    def __len__(self):
+        return min(self._added, self.max_indexed)
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+# Índice compartido por todo el proceso para la ruta indicada
+def get_index(db_path=None):
+    db_path = database_location(db_path)
+    with _indexes_lock:
+        index = _indexes.get(db_path)
+        if index is None:
+            index = _indexes[db_path] = NearDuplicateIndex(db_path)
+        return index
+
+
+# Carga el índice de la ruta indicada (lo llama el escritor en segundo plano, fuera del hilo del script)
+def warm_index(db_path=None):
+    if near_duplicate_action() != NEAR_DUPLICATE_OFF:
+        get_index(db_path).load()
+
+
+# Indexa un mensaje de contacto después de guardarlo
+def index_contact(signature, db_path=None):
+    if signature is not None:
+        get_index(db_path).add(signature)
+
+
+# Clasifica un mensaje de contacto antes de guardarlo (sin indexarlo: ver index_contact).
+# Devuelve (firma codificada o None, near_duplicate 0/1, si hay que descartarlo).
+def classify_message(message, db_path=None):
+    action = near_duplicate_action()
+    if action == NEAR_DUPLICATE_OFF:
+        return None, 0, False
+    signature, similarity = get_index(db_path).check(message)
+    duplicate = similarity >= SIMILARITY_THRESHOLD
+    if duplicate and metrics_enabled():
+        registry.increment("analytiq_contact_near_duplicates_total", action=action)
+    return signature, int(duplicate), duplicate and action == NEAR_DUPLICATE_DROP
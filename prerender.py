@@ -0,0 +1,219 @@
+import argparse
+import hashlib
+import os
+import re
+import shutil
+from urllib.parse import urlencode
+
+from assets import best_variant, load_asset
+from blog import BlogStore
+from bundle import FONT_FACES, FONTS_DIR, minify_css, stylesheet_css
+from markup import markdown_to_html
+from sections import (
+    BLOG_CARD_HTML,
+    BLOG_CONTENT_HTML,
+    DEMO_LINK_HTML,
+    DIVIDER_HTML,
+    HEADER_HTML,
+    INICIO_MD,
+    NEWSLETTER_BANNER_HTML,
+    PRIVACY_MD,
+    SERVICES_HTML,
+    SIDEBAR_LOGO_HTML,
+    STATIC_BLOG_POST_HTML,
+    STATIC_CTA_HTML,
+    STATIC_FIGURE_HTML,
+    STATIC_NAV_LINK_HTML,
+    STATIC_PAGE_HTML,
+    STATIC_PAGER_HTML,
+    STATIC_SITE_CSS,
+    TERMS_MD,
+    TESTIMONIALS_HTML,
+)
+
+# Versión estática de las páginas sin formularios (Inicio, Servicios, Blog y Política y Términos).
+# Genera HTML plano con los assets renombrados por su hash, listo para cualquier servidor de
+# ficheros (nginx, un bucket, GitHub Pages...): una visita ya no abre una sesión de Streamlit ni
+# ejecuta web.py. Los formularios (newsletter, contacto, Demo) siguen en la aplicación, a la que
+# enlazan las páginas con ?pagina=... para abrir directamente la página correspondiente.
+#
+# Uso: python prerender.py --output site --app-url https://app.analytiq.es/
+
+OUTPUT_DIR = "site"
+ASSETS_SUBDIR = "assets"
+FONTS_SUBDIR = "fonts"
+
+# URL de la aplicación Streamlit con los formularios (configurable con APP_URL)
+DEFAULT_APP_URL = os.getenv("APP_URL", "http://localhost:8501/")
+
+# Los mismos anchos de visualización y tamaño de página del blog que usa web.py
+LOGO_DISPLAY_WIDTH = 240
+HEADER_DISPLAY_WIDTH = 1600
+PAGE_IMAGE_WIDTH = 1200
+BLOG_PAGE_SIZE = int(os.getenv("BLOG_PAGE_SIZE", "5"))
+
+# Páginas de la navegación: etiqueta -> fichero estático (None: solo en la aplicación)
+NAV_PAGES = {
+    "Inicio": "index.html",
+    "Servicios": "servicios.html",
+    "Demo": None,
+    "Contacto": None,
+    "Blog": "blog.html",
+    "Política y Términos": "politica.html",
+}
+
+# Escritura atómica: el servidor de ficheros nunca sirve una página a medias
+def _write_file(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+# Assets del sitio: cada fichero se copia una vez a assets/ con un nombre derivado de su contenido,
+# así el servidor puede marcarlos como inmutables (Cache-Control: max-age=31536000, immutable)
+class SiteAssets:
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.written = set()
+
+    def publish(self, data, ext):
+        name = hashlib.sha256(data).hexdigest()[:16] + ext
+        if name not in self.written:
+            target = os.path.join(self.output_dir, ASSETS_SUBDIR, name)
+            if not os.path.exists(target):
+                _write_file(target, data)
+            self.written.add(name)
+        return f"{ASSETS_SUBDIR}/{name}"
+
+    def publish_file(self, path):
+        return self.publish(load_asset(path)["bytes"], os.path.splitext(path)[1])
+
+    # Borra los assets de generaciones anteriores que ya no usa ninguna página
+    def prune(self):
+        assets_dir = os.path.join(self.output_dir, ASSETS_SUBDIR)
+        removed = 0
+        for name in os.listdir(assets_dir):
+            if name not in self.written:
+                os.remove(os.path.join(assets_dir, name))
+                removed += 1
+        return removed
+
+
+# Copia las fuentes de static/fonts (si se han generado) junto a assets/, en la ruta relativa
+# que usan las reglas @font-face de la hoja de estilos
+def copy_fonts(output_dir):
+    copied = []
+    for filename, _, _ in FONT_FACES:
+        source = os.path.join(FONTS_DIR, filename)
+        if os.path.exists(source):
+            target = os.path.join(output_dir, FONTS_SUBDIR, filename)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(source, target)
+            copied.append(target)
+    return copied
+
+
+# Genera el sitio estático y devuelve las rutas de las páginas escritas
+def prerender(output_dir=OUTPUT_DIR, app_url=DEFAULT_APP_URL, blog_path=None):
+    from PIL import Image
+
+    assets = SiteAssets(output_dir)
+
+    def app_link(page):
+        return f"{app_url}?{urlencode({'pagina': page})}"
+
+    def figure(path, caption):
+        variant = best_variant(path, PAGE_IMAGE_WIDTH, build=True)
+        with Image.open(variant) as image:
+            width, height = image.size
+        return STATIC_FIGURE_HTML.format(src=assets.publish_file(variant), width=width, height=height,
+                                         caption=caption)
+
+    # La hoja referencia la imagen de fondo por su nombre: ambas se publican en assets/
+    fondo_url = assets.publish_file(best_variant("Logos/cabecera.png", HEADER_DISPLAY_WIDTH, build=True))
+    css = stylesheet_css(os.path.basename(fondo_url)) + minify_css(STATIC_SITE_CSS)
+    layout = {
+        "stylesheet_url": assets.publish(css.encode(), ".css"),
+        "favicon_url": assets.publish_file("Logos/favicon.ico"),
+        "sidebar_logo": SIDEBAR_LOGO_HTML.format(
+            logo_url=assets.publish_file(best_variant("Logos/AnalytIQ.png", LOGO_DISPLAY_WIDTH, build=True))),
+        "divider": DIVIDER_HTML,
+        "header": HEADER_HTML,
+    }
+
+    def write_page(filename, nav_page, title, content):
+        nav = "".join(
+            STATIC_NAV_LINK_HTML.format(active=" active" if page == nav_page else "",
+                                        href=target or app_link(page), label=page)
+            for page, target in NAV_PAGES.items()
+        )
+        html = STATIC_PAGE_HTML.format(title=title, nav=nav, content=content, **layout)
+        path = os.path.join(output_dir, filename)
+        _write_file(path, html.encode())
+        return path
+
+    written = []
+
+    # Inicio: la suscripción a la newsletter se hace en la aplicación
+    written.append(write_page("index.html", "Inicio", "Inicio", "\n".join([
+        markdown_to_html(INICIO_MD),
+        figure("Logos/inicio.png", "Visualiza el futuro de tu empresa con nuestras soluciones analíticas."),
+        markdown_to_html(TESTIMONIALS_HTML),
+        DIVIDER_HTML,
+        NEWSLETTER_BANNER_HTML,
+        STATIC_CTA_HTML.format(href=app_link("Inicio"), label="Suscribirme"),
+    ])))
+
+    # Servicios: el enlace a Demo y el formulario de contacto llevan a la aplicación
+    written.append(write_page("servicios.html", "Servicios", "Nuestros Servicios", "\n".join([
+        SERVICES_HTML,
+        DEMO_LINK_HTML.replace('href="#demo"', f'href="{app_link("Demo")}"'),
+        STATIC_CTA_HTML.format(href=app_link("Contacto"), label="¡Contáctanos para Más Información!"),
+    ])))
+
+    # Blog: una página estática por cada BLOG_PAGE_SIZE publicaciones, con el contenido desplegable
+    store = BlogStore(blog_path)
+    _, _, pages = store.page(0, BLOG_PAGE_SIZE)
+    filenames = ["blog.html"] + [f"blog-{page + 1}.html" for page in range(1, pages)]
+    for page, filename in enumerate(filenames):
+        posts, _, _ = store.page(page, BLOG_PAGE_SIZE)
+        content = ["<h3>Publicaciones Recientes</h3>"]
+        for post in posts:
+            card = BLOG_CARD_HTML.format(title=post["title"], emoji=post.get("emoji", ""), date=post["date"],
+                                         summary=post["summary"])
+            content.append(STATIC_BLOG_POST_HTML.format(
+                slug=post["slug"], card=card, title=post["title"],
+                content=BLOG_CONTENT_HTML.format(content=store.get(post["slug"])["content_html"])))
+        if pages > 1:
+            content.append(STATIC_PAGER_HTML.format(
+                previous=f'<a href="{filenames[page - 1]}">← Anterior</a>' if page > 0 else "<span></span>",
+                next=f'<a href="{filenames[page + 1]}">Siguiente →</a>' if page < pages - 1 else "<span></span>",
+                page=page + 1, pages=pages))
+        content.append(STATIC_CTA_HTML.format(href=app_link("Blog"), label="Buscar en el blog"))
+        written.append(write_page(filename, "Blog", "Blog", "\n".join(content)))
+    # Páginas del blog de generaciones anteriores con más publicaciones
+    for name in os.listdir(output_dir):
+        if re.fullmatch(r"blog-\d+\.html", name) and name not in filenames:
+            os.remove(os.path.join(output_dir, name))
+
+    written.append(write_page("politica.html", "Política y Términos", "Política de Privacidad y Términos de Uso",
+                              "\n".join([markdown_to_html(PRIVACY_MD), markdown_to_html(TERMS_MD)])))
+
+    written.extend(copy_fonts(output_dir))
+    assets.prune()
+    written.extend(os.path.join(output_dir, ASSETS_SUBDIR, name) for name in sorted(assets.written))
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera la versión estática de las páginas sin formularios")
+    parser.add_argument("--output", default=OUTPUT_DIR, help="carpeta de salida")
+    parser.add_argument("--app-url", default=DEFAULT_APP_URL,
+                        help="URL de la aplicación Streamlit a la que enlazan los formularios")
+    parser.add_argument("--blog", help="entradas del blog (por defecto blog.snapshot si existe o blog_entries.json)")
+    args = parser.parse_args()
+
+    for path in prerender(args.output, args.app_url, args.blog):
+        print(f"{os.path.getsize(path):>9} {path}")
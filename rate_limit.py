@@ -0,0 +1,151 @@
+import hashlib
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from metrics import is_enabled as metrics_enabled
+from metrics import registry
+from validation import normalize_email
+
+# Límites de los formularios de contacto, aplicados en memoria antes de llegar a SQLite.
+# Cada límite es un cubo de fichas: admite ráfagas de `capacity` envíos y recupera una ficha
+# cada `refill_seconds`.
+SESSION_CAPACITY = 3
+SESSION_REFILL_SECONDS = 60.0
+EMAIL_CAPACITY = 5
+EMAIL_REFILL_SECONDS = 600.0
+
+# Un mensaje idéntico (mismo correo y mismo texto) dentro de esta ventana se descarta
+DUPLICATE_WINDOW_SECONDS = 600.0
+
+# Máximo de claves en memoria por estructura (sesiones, correos, mensajes recientes)
+MAX_TRACKED_KEYS = 10_000
+
+# Resultado de la comprobación de un envío
+ACCEPTED = "accepted"
+REJECTED_SESSION = "rate-limited-session"
+REJECTED_EMAIL = "rate-limited-email"
+REJECTED_DUPLICATE = "duplicate"
+
+
+# Diccionario LRU acotado en el que cada entrada caduca a los `ttl` segundos de su última escritura
+class TTLCache:
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()
+
+    def get(self, key, now):
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires = item
+        if expires <= now:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value, now):
+        self._data[key] = (value, now + self.ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+# Cubos de fichas por clave. Un cubo que lleva `capacity * refill_seconds` sin usarse vuelve a
+# estar lleno, que es el estado por defecto, así que en ese momento se puede olvidar (TTL).
+class RateLimiter:
+    def __init__(self, capacity, refill_seconds, max_keys=MAX_TRACKED_KEYS):
+        self.capacity = capacity
+        self.refill_seconds = refill_seconds
+        self._buckets = TTLCache(max_keys, capacity * refill_seconds)
+        self._lock = threading.Lock()
+
+    # Consume una ficha de `key`; devuelve False si el cubo está vacío
+    def allow(self, key, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            state = self._buckets.get(key, now)
+            if state is None:
+                tokens = float(self.capacity)
+            else:
+                tokens, last = state
+                tokens = min(self.capacity, tokens + (now - last) / self.refill_seconds)
+            if tokens < 1:
+                return False
+            self._buckets.set(key, (tokens - 1, now), now)
+            return True
+
+    # Devuelve la ficha consumida por un allow() cuyo envío se ha rechazado después por otro límite
+    def refund(self, key, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            state = self._buckets.get(key, now)
+            if state is None:
+                return
+            tokens, last = state
+            self._buckets.set(key, (min(self.capacity, tokens + 1), last), now)
+
+
+# Mensajes aceptados recientemente, por hash de su contenido
+class DuplicateFilter:
+    def __init__(self, window_seconds, max_keys=MAX_TRACKED_KEYS):
+        self._seen = TTLCache(max_keys, window_seconds)
+        self._lock = threading.Lock()
+
+    def is_duplicate(self, digest, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return self._seen.get(digest, now) is not None
+
+    def remember(self, digest, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._seen.set(digest, True, now)
+
+
+# Hash del contenido de un mensaje: el mismo texto con otros espacios o mayúsculas cuenta como idéntico
+def message_digest(email, message):
+    text = " ".join(message.split()).casefold()
+    return hashlib.blake2b(f"{normalize_email(email)}\0{text}".encode(), digest_size=16).digest()
+
+
+session_limiter = RateLimiter(SESSION_CAPACITY, SESSION_REFILL_SECONDS)
+email_limiter = RateLimiter(EMAIL_CAPACITY, EMAIL_REFILL_SECONDS)
+duplicates = DuplicateFilter(DUPLICATE_WINDOW_SECONDS)
+
+_outcomes = Counter()
+_outcomes_lock = threading.Lock()
+
+
+# Decide si un envío de contacto llega a la base de datos. Devuelve ACCEPTED o el motivo del rechazo.
+# Los duplicados se comprueban primero para que repetir el mismo mensaje no gaste fichas, y un envío
+# rechazado por el límite del correo devuelve la ficha de la sesión (si no, alguien que rota correos
+# dejaría sin envíos a la sesión).
+def check_contact(session_key, email, message):
+    digest = message_digest(email, message)
+    if duplicates.is_duplicate(digest):
+        outcome = REJECTED_DUPLICATE
+    elif not session_limiter.allow(session_key):
+        outcome = REJECTED_SESSION
+    elif not email_limiter.allow(normalize_email(email)):
+        session_limiter.refund(session_key)
+        outcome = REJECTED_EMAIL
+    else:
+        duplicates.remember(digest)
+        outcome = ACCEPTED
+    with _outcomes_lock:
+        _outcomes[outcome] += 1
+    if metrics_enabled():
+        registry.increment("analytiq_contact_submissions_total", outcome=outcome)
+    return outcome
+
+
+# Envíos aceptados y rechazados (por motivo) desde el arranque del proceso
+def outcome_counts():
+    with _outcomes_lock:
+        return dict(_outcomes)
@@ -0,0 +1,172 @@
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+
+# Palabras vacías del español que no aportan relevancia a la búsqueda (ya sin acentos)
+STOPWORDS = frozenset("""
+a al algo algunas algunos ante antes como con contra cual cuando de del desde donde durante e el
+ella ellas ellos en entre era es esa esas ese eso esos esta estas este esto estos fue ha hasta hay
+la las le les lo los mas me mi mis mucho muy nada ni no nos o os otra otro para pero poco por porque
+que quien se sea ser si sin sobre solo son su sus tambien te ti tu tus un una unas uno unos y ya yo
+""".split())
+
+# Peso de cada campo al puntuar (el título cuenta más que el cuerpo)
+FIELD_WEIGHTS = {"title": 3, "summary": 2, "content": 1}
+
+# Parámetros de BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+# Quita acentos y diéresis (también la tilde de la ñ) y pasa a minúsculas
+def fold_accents(text):
+    return unicodedata.normalize("NFKD", text.casefold()).encode("ascii", "ignore").decode("ascii")
+
+
+# Reducción ligera de plurales del español (clientes -> cliente, automatizaciones -> automatizacion)
+@lru_cache(maxsize=65536)
+def _stem(token):
+    if len(token) > 5 and token.endswith("ones"):
+        return token[:-2]
+    if len(token) > 4 and token.endswith("es") and token[-3] in "lrndzj":
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s"):
+        return token[:-1]
+    return token
+
+
+# Tokenización para el índice y las consultas: acentos plegados, sin palabras vacías y con plurales reducidos
+def tokenize(text):
+    return [_stem(token) for token in _TOKEN_PATTERN.findall(fold_accents(text)) if token not in STOPWORDS]
+
+
+# Índice invertido en memoria con puntuación BM25 y altas/bajas incrementales por documento
+class SearchIndex:
+    def __init__(self):
+        self._postings = {}
+        self._doc_terms = {}
+        self._doc_lengths = {}
+        self._total_length = 0
+        self._norms = None
+        self._impacts = {}
+        self._lock = threading.Lock()
+
+    # Añade (o reemplaza) un documento a partir de sus campos de texto
+    def add(self, doc_id, fields):
+        counts = Counter()
+        for field, text in fields.items():
+            weight = FIELD_WEIGHTS.get(field, 1)
+            for token in tokenize(text or ""):
+                counts[token] += weight
+        with self._lock:
+            self._remove(doc_id)
+            for term, tf in counts.items():
+                self._postings.setdefault(term, {})[doc_id] = tf
+            self._doc_terms[doc_id] = tuple(counts)
+            length = sum(counts.values())
+            self._doc_lengths[doc_id] = length
+            self._total_length += length
+            self._invalidate()
+
+    # Elimina un documento del índice
+    def remove(self, doc_id):
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id):
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        self._invalidate()
+
+    # Los valores precalculados dependen de la longitud media, que cambia con cada alta o baja
+    def _invalidate(self):
+        self._norms = None
+        self._impacts = {}
+
+    # Normalización BM25 por longitud de documento; se recalcula solo cuando cambia el índice
+    def _length_norms(self):
+        if self._norms is None:
+            avg_length = self._total_length / len(self._doc_lengths)
+            self._norms = {
+                doc_id: BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                for doc_id, length in self._doc_lengths.items()
+            }
+        return self._norms
+
+    # Lista de un término ordenada por impacto decreciente (tf saturado y normalizado); se calcula al primer uso
+    def _impact_list(self, term, postings):
+        impacts = self._impacts.get(term)
+        if impacts is None:
+            norms = self._length_norms()
+            impacts = sorted(((tf / (tf + norms[doc_id]), doc_id) for doc_id, tf in postings.items()), reverse=True)
+            self._impacts[term] = impacts
+        return impacts
+
+    # Precalcula normalizaciones y listas por impacto para que ninguna consulta pague el primer uso
+    def warm(self):
+        with self._lock:
+            if self._doc_lengths:
+                for term, postings in self._postings.items():
+                    self._impact_list(term, postings)
+
+    # Devuelve los `limit` documentos más relevantes como lista de (doc_id, puntuación).
+    # Recorre las listas por impacto (algoritmo de umbral) y se detiene en cuanto ningún documento
+    # pendiente puede superar al peor del top, sin puntuar todos los documentos que contienen el término.
+    def search(self, query, limit=20):
+        terms = set(tokenize(query))
+        if not terms or limit <= 0:
+            return []
+        with self._lock:
+            doc_count = len(self._doc_lengths)
+            if not doc_count:
+                return []
+            norms = self._length_norms()
+            lists = []
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings:
+                    idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                    lists.append((idf * (BM25_K1 + 1), postings, self._impact_list(term, postings)))
+            if not lists:
+                return []
+
+            top = []
+            seen = set()
+            for depth in range(max(len(impacts) for _, _, impacts in lists)):
+                threshold = 0.0
+                for weight, _, impacts in lists:
+                    if depth >= len(impacts):
+                        continue
+                    impact, doc_id = impacts[depth]
+                    threshold += weight * impact
+                    if doc_id in seen:
+                        continue
+                    seen.add(doc_id)
+                    score = 0.0
+                    for other_weight, other_postings, _ in lists:
+                        tf = other_postings.get(doc_id)
+                        if tf:
+                            score += other_weight * tf / (tf + norms[doc_id])
+                    if len(top) < limit:
+                        heapq.heappush(top, (score, doc_id))
+                    elif score > top[0][0]:
+                        heapq.heapreplace(top, (score, doc_id))
+                if len(top) >= limit and top[0][0] >= threshold:
+                    break
+        return [(doc_id, score) for score, doc_id in sorted(top, reverse=True)]
+
+    def __len__(self):
+        return len(self._doc_lengths)
@@ -0,0 +1,533 @@
+# Contenido estático de las páginas de AnalytIQ.
+# Las plantillas con campos ({...}) usan llaves dobles para el CSS literal.
+# Los estilos (*_CSS) no se inyectan por separado: bundle.py los une en una sola hoja minificada.
+
+# Hoja de estilos de la web (plantilla: recibe la URL de la hoja publicada en static/)
+STYLESHEET_LINK_HTML = '<link rel="stylesheet" href="{href}">'
+
+# Estilos en línea, si el servidor no sirve estáticos (plantilla: recibe el CSS minificado)
+INLINE_STYLE_HTML = "<style>{css}</style>"
+
+# Estilos globales (plantilla: recibe la URL de la imagen de fondo de la cabecera)
+GLOBAL_CSS = """
+/* Fondo del encabezado con imagen */
+.dark-background {{
+    background-image: url("{fondo_url}");
+    background-size: cover;
+    background-position: center;
+    padding: 60px 20px;
+    border-radius: 10px;
+    text-align: center;
+    color: white;
+}}
+
+/* Estilo del título principal */
+.custom-title {{
+    font-family: 'Nunito Sans', sans-serif;
+    font-style: italic;
+    font-weight: 900;
+    font-size: 48px;
+    margin: 0;
+}}
+
+/* Texto destacado */
+.highlight {{
+    color: #00ADB5; /* Color destacado del logo (personalizable) */
+}}
+
+/* Subtítulo */
+.custom-subtitle {{
+    font-family: 'Nunito Sans', sans-serif;
+    font-weight: 300;
+    font-size: 18px;
+    margin-top: 10px;
+}}
+"""
+
+# Encabezado con fondo de imagen
+HEADER_HTML = """
+<div class="dark-background">
+    <h1 class="custom-title">Bienvenido a <span class="highlight">AnalytIQ</span></h1>
+    <p class="custom-subtitle" style="background-color:hsla(0, 0.00%, 1.20%, 0.74); color: white; display: inline; padding: 3px;">Automatización y optimización al alcance de tu negocio.</p>
+</div>
+"""
+
+# Línea divisoria decorativa
+DIVIDER_HTML = """
+<div style="margin: 40px 0;">
+    <hr style="border: none; height: 2px; background: linear-gradient(to right, #00ADB5, #FFFFFF, #00ADB5);">
+</div>
+"""
+
+# Logo centrado de la barra lateral (plantilla: recibe la URL del logo)
+SIDEBAR_LOGO_HTML = """
+<div style="text-align: center; margin-bottom: 20px;">
+    <img src="{logo_url}" style="max-width: 120px; border-radius: 10px;"/>
+</div>
+"""
+
+# Estilos de la barra lateral
+SIDEBAR_CSS = """
+.sidebar .sidebar-content {
+    padding: 20px;
+    background-color: #f7f9fc;
+    border-radius: 10px;
+    box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
+}
+"""
+
+# Texto de presentación de la página de Inicio
+INICIO_MD = """
+En **AnalytIQ**, ofrecemos servicios innovadores en **Inteligencia Artificial**, **Automatización de Procesos**, 
+**Business Intelligence** y **Data Science**. Nuestro objetivo es ayudarte a optimizar tu negocio, 
+mejorar la toma de decisiones y prepararte para el futuro tecnológico.
+
+Ya seas una **empresa interesada en soluciones tecnológicas personalizadas**, 
+o una **persona que busca aprender sobre IA y Data Science mediante clases individuales**,
+¡tenemos algo para ti!
+
+### **¿Qué hacemos?**
+- **Servicios de IA y Automatización**: Implementamos soluciones inteligentes para optimizar procesos empresariales.
+- **Business Intelligence (BI)**: Diseñamos sistemas que convierten tus datos en decisiones estratégicas.
+- **Data Science**: Te ayudamos a explorar, analizar y aprovechar el poder de tus datos.
+- **Capacitación Individual**: Ofrecemos clases personalizadas de IA, BI y Data Science para particulares o equipos de empresas.
+- **Desarrollo de Proyectos**: Trabajamos contigo en la creación de proyectos innovadores adaptados a tus necesidades.
+
+### **¿A quién va dirigido?**
+- **Empresas:** Optimización y soluciones a medida para mejorar la eficiencia y productividad.
+- **Profesionales y estudiantes:** Formación práctica en herramientas y conceptos clave de IA, BI y Data Science.
+- **Emprendedores:** Desarrollo de proyectos que maximicen el impacto de tus ideas.
+
+### **Nuestro Compromiso**
+En AnalytIQ, nos enfocamos en entregar resultados prácticos y tangibles, combinando innovación, profesionalismo y cercanía. Creemos que la tecnología debe ser accesible y útil para todos.
+
+### **Contáctanos**
+Descubre cómo podemos ayudarte a transformar tus ideas en realidad. Explora más en las secciones de Servicios y Demo.
+"""
+
+# Testimonios de clientes
+TESTIMONIALS_HTML = """
+### Lo que dicen nuestros clientes
+<div style="background-color: #393E46; padding: 20px; border-radius: 10px; margin-bottom: 20px; box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);">
+    <p style="font-style: italic; color: #EEEEEE;">"Gracias a AnalytIQ, he podido gestionar mejor mi tiempo y aumentar la eficiencia de mi negocio."</p>
+    <p style="text-align: right; font-weight: bold; color: #00ADB5;">— Juan Pérez, Autónomo</p>
+</div>
+
+<div style="background-color: #393E46; padding: 20px; border-radius: 10px; margin-bottom: 20px; box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);">
+    <p style="font-style: italic; color: #EEEEEE;">"El análisis de datos personalizado nos ayudó a entender mejor el comportamiento de nuestros clientes y a incrementar nuestras ventas en un 25%."</p>
+    <p style="text-align: right; font-weight: bold; color: #00ADB5;">— María López, Dueña de una pequeña tienda de ropa</p>
+</div>
+"""
+
+# Cabecera de la sección de Newsletter
+NEWSLETTER_BANNER_HTML = """
+<div style="background-color: #00ADB5; padding: 30px; border-radius: 10px; text-align: center; box-shadow: 0 4px 8px rgba(0, 0, 0, 0.2);">
+    <h2 style="color: white; font-family: 'Nunito Sans', sans-serif; font-weight: bold; margin-bottom: 15px;">
+        💌 ¡Únete a Nuestra Newsletter!
+    </h2>
+    <p style="color: #EEEEEE; font-family: 'Nunito Sans', sans-serif; font-size: 18px; line-height: 1.6; margin-bottom: 25px;">
+        Sé el primero en recibir actualizaciones exclusivas, consejos prácticos sobre IA y automatización, y contenido diseñado 
+        para ayudarte a optimizar tu negocio.
+    </p>
+</div>
+"""
+
+# Estilos de los bloques de servicios (también los usa la página Demo)
+SERVICES_CSS = """
+.service-box {
+    background-color: #393E46;
+    padding: 20px;
+    border-radius: 10px;
+    margin-bottom: 20px;
+    box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
+}
+.service-title {
+    color: #00ADB5;
+    font-family: 'Nunito Sans', sans-serif;
+    font-size: 20px;
+    font-weight: bold;
+    margin-bottom: 10px;
+}
+.service-description {
+    color: #EEEEEE;
+    font-family: 'Nunito Sans', sans-serif;
+    font-size: 16px;
+    line-height: 1.6;
+}
+.cta-button {
+    display: inline-block;
+    background-color: #00ADB5;
+    color: white;
+    font-family: 'Nunito Sans', sans-serif;
+    font-size: 16px;
+    font-weight: bold;
+    text-align: center;
+    padding: 10px 20px;
+    border-radius: 5px;
+    text-decoration: none;
+    transition: background-color 0.3s ease;
+}
+.cta-button:hover {
+    background-color: #007A7E;
+}
+"""
+
+# Bloques de servicios
+SERVICES_HTML = """
+<div class="service-box">
+    <p class="service-title">🤖 Aprender a usar la IA y GPTs Personalizados</p>
+    <p class="service-description">Aprende a usar ChatGPT de forma eficiente y configura asistentes personalizados para automatizar tareas y mejorar tu productividad.</p>
+</div>
+<div class="service-box">
+    <p class="service-title">🔄 Creación de Modelos Automatizados</p>
+    <p class="service-description">Automatiza tareas repetitivas con soluciones personalizadas que optimizan tu tiempo y mejoran la eficiencia.</p>
+</div>
+<div class="service-box">
+    <p class="service-title">💬 Creación de Chatbots</p>
+    <p class="service-description">Desarrollamos chatbots personalizados para tu página web o plataformas de mensajería, ofreciendo atención rápida y eficiente a tus clientes.</p>
+</div>
+<div class="service-box">
+    <p class="service-title">📊 Diseño de Dashboards Interactivos</p>
+    <p class="service-description">Visualiza el rendimiento de tu negocio en tiempo real con dashboards personalizados para la toma de decisiones estratégicas.</p>
+</div>
+<div class="service-box">
+    <p class="service-title">📈 Modelos de Machine Learning</p>
+    <p class="service-description">Implementamos modelos predictivos y de segmentación para optimizar tus decisiones estratégicas y maximizar resultados.</p>
+</div>
+<div class="service-box">
+    <p class="service-title">🛠️ Auditoría Tecnológica y Consultoría</p>
+    <p class="service-description">Identificamos áreas de mejora en tus procesos y te proponemos soluciones tecnológicas adaptadas a las necesidades de tu negocio.</p>
+</div>
+"""
+
+# Enlace a la sección Demo
+DEMO_LINK_HTML = """
+<div style="text-align: center; margin-top: 30px;">
+    <p style="color: #EEEEEE; font-size: 18px;">
+        ¿Quieres ver ejemplos en acción? Visita nuestra sección <a href="#demo" style="color: #00ADB5; text-decoration: none; font-weight: bold;">Demo</a> para descubrir cómo funcionan nuestras automatizaciones y soluciones personalizadas.
+    </p>
+</div>
+"""
+
+# Cabecera de los formularios de contacto de Servicios y Demo
+CONTACT_BANNER_HTML = """
+<div style="background-color: #00ADB5; padding: 20px; border-radius: 10px; text-align: center; color: white;">
+    <h3>Déjanos tus datos de contacto</h3>
+    <p>Completa el siguiente formulario y nos pondremos en contacto contigo lo antes posible.</p>
+</div>
+"""
+
+# Introducción de la página Demo
+DEMO_INTRO_MD = """
+En esta sección, te mostramos ejemplos prácticos de nuestras soluciones en acción.
+Descubre cómo nuestras automatizaciones pueden transformar tu día a día.
+"""
+
+# Ejemplo 1: Automatización de WhatsApp
+DEMO_WHATSAPP_HTML = """
+<div class="service-box">
+    <p class="service-title">🌟 Gestión de Mensajes de WhatsApp</p>
+    <p class="service-description">
+        Con este flujo de trabajo automatizado:
+        <ul>
+            <li>Los mensajes que recibes en WhatsApp se procesan automáticamente.</li>
+            <li>El sistema interpreta el contenido (texto, audio o imágenes) y crea un evento en tu calendario.</li>
+            <li>Recibirás notificaciones de confirmación y recordatorios automáticos.</li>
+        </ul>
+        Este tipo de automatización ahorra tiempo y garantiza que nunca pierdas una tarea o cita importante.
+    </p>
+</div>
+"""
+
+# Ejemplo 2: Dashboards interactivos
+DEMO_DASHBOARDS_HTML = """
+<div class="service-box">
+    <p class="service-title">📊 Dashboards Interactivos</p>
+    <p class="service-description">
+        Descubre cómo nuestros dashboards pueden mostrarte datos clave de tu negocio en tiempo real.
+    </p>
+</div>
+"""
+
+# Tarjeta de una publicación del blog (plantilla: título, emoji, fecha y resumen)
+BLOG_CARD_HTML = """
+<div style="background-color: #00ADB5; padding: 30px; border-radius: 10px; text-align: center; box-shadow: 0 4px 8px rgba(0, 0, 0, 0.2); margin-bottom: 20px;">
+    <h2 style="color: white; font-family: 'Nunito Sans', sans-serif; font-weight: bold;">{title} {emoji}</h2>
+    <p style="color: #EEEEEE; font-family: 'Nunito Sans', sans-serif;">{date}</p>
+    <p style="color: #EEEEEE; font-family: 'Nunito Sans', sans-serif;">{summary}</p>
+</div>
+"""
+
+# Contenido completo de una publicación del blog (plantilla: cuerpo ya convertido a HTML)
+BLOG_CONTENT_HTML = """
+<div style="background-color: #222831; padding: 20px; border-radius: 10px; margin-bottom: 20px; color: #EEEEEE;">
+    <div style="font-family: 'Nunito Sans', sans-serif; font-size: 16px; line-height: 1.6;">{content}</div>
+</div>
+"""
+
+# Estilos de la página de Contacto
+CONTACT_CSS = """
+    .contact-form {
+        background-color: #393E46;
+        padding: 20px;
+        border-radius: 10px;
+        box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
+        color: #EEEEEE;
+        font-family: 'Nunito Sans', sans-serif;
+    }
+    .contact-form h2 {
+        color: #00ADB5;
+        margin-bottom: 20px;
+    }
+    .contact-form label {
+        font-weight: bold;
+    }
+    .contact-form input, .contact-form textarea {
+        width: 100%;
+        padding: 10px;
+        margin-bottom: 15px;
+        border: 1px solid #00ADB5;
+        border-radius: 5px;
+        background-color: #222831;
+        color: white;
+        font-family: 'Nunito Sans', sans-serif;
+    }
+    .contact-form button {
+        background-color: #00ADB5;
+        color: white;
+        font-weight: bold;
+        border: none;
+        padding: 10px 20px;
+        border-radius: 5px;
+        cursor: pointer;
+        font-size: 16px;
+        transition: background-color 0.3s ease;
+    }
+    .contact-form button:hover {
+        background-color: #007A7E;
+    }
+"""
+
+# Presentación del formulario de contacto
+CONTACT_INTRO_HTML = """
+<div class="contact-form">
+    <h2>Estamos aquí para ayudarte</h2>
+    <p>Déjanos tu información y nos pondremos en contacto contigo lo antes posible.</p>
+</div>
+"""
+
+# Información adicional de contacto
+CONTACT_INFO_HTML = """
+<div class="contact-form">
+    <h2>Otras formas de contacto</h2>
+    <p>📧 Email: analytiq.es@gmail.com</p>
+    <p>📞 Teléfono: +34 655 312 243</p>
+</div>
+"""
+
+# Política de Privacidad
+PRIVACY_MD = """
+## Política de Privacidad
+AnalytIQ se compromete a proteger tu privacidad. Recopilamos información personal, como tu nombre y correo electrónico, exclusivamente para responder a tus consultas y mejorar nuestros servicios.
+- **Datos recopilados:** Información de contacto y datos relacionados con el uso de este sitio web.
+- **Uso de datos:** Los datos se utilizarán únicamente para comunicación y análisis interno.
+- **Protección de datos:** Implementamos medidas de seguridad para proteger tu información.
+Si tienes alguna pregunta sobre nuestra política de privacidad, contáctanos en: **analytiq.es@gmail.com**
+"""
+
+# Términos de Uso
+TERMS_MD = """
+## Términos de Uso
+Al usar este sitio web, aceptas los siguientes términos:
+- **Propiedad intelectual:** Todo el contenido de este sitio, incluidos textos, imágenes y diseños, es propiedad de AnalytIQ y está protegido por derechos de autor.
+- **Uso permitido:** Puedes utilizar este sitio únicamente con fines personales y no comerciales.
+- **Limitación de responsabilidad:** AnalytIQ no se hace responsable de cualquier daño derivado del uso de este sitio.
+- **Modificaciones:** Nos reservamos el derecho de actualizar estos términos en cualquier momento.
+Si tienes alguna duda sobre los términos, contáctanos en: **analytiq.es@gmail.com**
+"""
+
+# ---------------------------------------------------------------------------
+# Páginas pre-renderizadas (prerender.py)
+# ---------------------------------------------------------------------------
+
+# Documento HTML de una página estática (plantilla)
+STATIC_PAGE_HTML = """<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title} · AnalytIQ</title>
+<link rel="icon" href="{favicon_url}">
+<link rel="stylesheet" href="{stylesheet_url}">
+</head>
+<body>
+<aside class="site-sidebar">
+{sidebar_logo}
+{divider}
+<nav>{nav}</nav>
+</aside>
+<main class="site-main">
+{header}
+{divider}
+<h1>{title}</h1>
+{content}
+</main>
+</body>
+</html>
+"""
+
+# Enlace de la navegación (plantilla)
+STATIC_NAV_LINK_HTML = '<a class="site-nav-link{active}" href="{href}">{label}</a>'
+
+# Imagen de una página con su pie (plantilla)
+STATIC_FIGURE_HTML = """
+<figure class="site-figure">
+    <img src="{src}" width="{width}" height="{height}" alt="{caption}" loading="lazy" decoding="async">
+    <figcaption>{caption}</figcaption>
+</figure>
+"""
+
+# Botón que lleva a un formulario de la aplicación Streamlit (plantilla)
+STATIC_CTA_HTML = """
+<p class="site-cta"><a href="{href}">{label}</a></p>
+"""
+
+# Publicación del blog con su contenido completo desplegable (plantilla)
+STATIC_BLOG_POST_HTML = """
+<article id="{slug}">
+{card}
+<details class="site-details">
+<summary>Leer más - {title}</summary>
+{content}
+</details>
+</article>
+"""
+
+# Navegación entre páginas del blog (plantilla)
+STATIC_PAGER_HTML = """
+<nav class="site-pager">{previous}<span>Página {page} de {pages}</span>{next}</nav>
+"""
+
+# Maquetación de las páginas estáticas (lo que en la aplicación pone Streamlit)
+STATIC_SITE_CSS = """
+body {
+    margin: 0;
+    background-color: #0E1117;
+    color: #FAFAFA;
+    font-family: 'Nunito Sans', 'Source Sans Pro', sans-serif;
+    line-height: 1.6;
+}
+.site-sidebar {
+    position: fixed;
+    top: 0;
+    bottom: 0;
+    left: 0;
+    width: 244px;
+    padding: 40px 20px;
+    box-sizing: border-box;
+    background-color: #262730;
+    overflow-y: auto;
+}
+.site-nav-link {
+    display: block;
+    padding: 6px 10px;
+    border-radius: 6px;
+    color: #FAFAFA;
+    text-decoration: none;
+}
+.site-nav-link:hover, .site-nav-link.active {
+    background-color: #00ADB5;
+}
+.site-main {
+    margin-left: 244px;
+    padding: 40px 60px;
+    max-width: 1100px;
+}
+.site-figure {
+    margin: 20px 0;
+    text-align: center;
+}
+.site-figure img {
+    max-width: 100%;
+    height: auto;
+}
+.site-figure figcaption {
+    color: #A3A8B8;
+    font-size: 14px;
+}
+.site-cta {
+    text-align: center;
+    margin: 25px 0;
+}
+.site-cta a {
+    display: inline-block;
+    padding: 10px 24px;
+    border-radius: 8px;
+    background-color: #00ADB5;
+    color: white;
+    font-weight: bold;
+    text-decoration: none;
+}
+.site-details summary {
+    cursor: pointer;
+    margin-bottom: 20px;
+    color: #00ADB5;
+}
+.site-pager {
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    margin: 30px 0;
+}
+.site-pager a {
+    color: #00ADB5;
+}
+@media (max-width: 800px) {
+    .site-sidebar {
+        position: static;
+        width: auto;
+    }
+    .site-main {
+        margin-left: 0;
+        padding: 20px;
+    }
+}
+"""
+
+# ---------------------------------------------------------------------------
+# Números de la newsletter (dispatch.py)
+# ---------------------------------------------------------------------------
+
+# Versión HTML de un número (plantilla: nombre, título, emoji, fecha, resumen, cuerpo y URL de la web)
+NEWSLETTER_ISSUE_HTML = """<!DOCTYPE html>
+<html lang="es">
+<body style="margin: 0; padding: 20px; background-color: #222831; font-family: 'Nunito Sans', Arial, sans-serif;">
+<div style="max-width: 640px; margin: 0 auto; background-color: #393E46; border-radius: 10px; padding: 30px; color: #EEEEEE;">
+    <p style="font-size: 16px;">Hola {name},</p>
+    <h1 style="color: #00ADB5; font-size: 26px;">{title} {emoji}</h1>
+    <p style="color: #AAAAAA; font-size: 14px;">{date}</p>
+    <p style="font-size: 18px; font-style: italic;">{summary}</p>
+    <div style="font-size: 16px; line-height: 1.6;">{content}</div>
+    <p style="text-align: center; margin-top: 30px;">
+        <a href="{site_url}" style="background-color: #00ADB5; color: white; padding: 10px 24px; border-radius: 8px; text-decoration: none; font-weight: bold;">Visita AnalytIQ</a>
+    </p>
+    <p style="color: #AAAAAA; font-size: 12px; margin-top: 30px;">Recibes este correo porque te suscribiste a la newsletter de AnalytIQ. Para darte de baja, responde a este correo con el asunto «baja».</p>
+</div>
+</body>
+</html>
+"""
+
+# Versión de texto de un número (misma plantilla con el cuerpo en texto plano)
+NEWSLETTER_ISSUE_TEXT = """Hola {name},
+
+{title} {emoji}
+{date}
+
+{summary}
+
+{content}
+
+Visita AnalytIQ: {site_url}
+
+Recibes este correo porque te suscribiste a la newsletter de AnalytIQ. Para darte de baja, responde a este correo con el asunto «baja».
+"""
@@ -0,0 +1,24 @@
+import threading
+from functools import lru_cache
+
+# Inicialización del proceso. Streamlit vuelve a ejecutar web.py entero en cada rerun, pero este
+# módulo se importa una sola vez, así que lo que se memoiza aquí se hace una vez por proceso.
+
+
+# Variables de entorno de .env (solo la primera vez; load_dotenv no sobrescribe las ya definidas)
+@lru_cache(maxsize=None)
+def load_environment():
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+# Genera en segundo plano los derivados de imagen que falten (assets.build_all_variants), una vez por
+# proceso. Hasta que terminan, best_variant sirve los originales: ninguna petición espera a la codificación.
+@lru_cache(maxsize=None)
+def prepare_images():
+    from assets import build_all_variants
+
+    thread = threading.Thread(target=build_all_variants, name="analytiq-images", daemon=True)
+    thread.start()
+    return thread
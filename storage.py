@@ -0,0 +1,374 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from metrics import count_query, is_enabled as metrics_enabled
+from migrations import ensure_schema
+from postgres import connect as postgres_connect
+from postgres import database_error, is_postgres_url, operational_error
+from validation import clean_name, normalize_email, valid_email
+
+# Ruta del archivo de la base de datos SQLite. Con DATABASE_URL=postgresql://... (entorno o .env) todas
+# las réplicas de la aplicación comparten una base de datos PostgreSQL (postgres.py).
+# Cualquier función que reciba db_path acepta también una URL de PostgreSQL.
+DB_PATH = "newsletter.db"
+
+# Parámetros del pool de conexiones
+POOL_SIZE = 8
+BUSY_TIMEOUT_SECONDS = 5.0
+CACHED_STATEMENTS = 64
+
+# Sentencias fijas: al reutilizar siempre el mismo texto SQL, cada conexión del pool
+# guarda la sentencia preparada en su caché y no la vuelve a compilar
+# Alta en la newsletter en una sola sentencia atómica: devuelve el id si es nuevo y nada si ya existía
+UPSERT_SUBSCRIBER = """
+INSERT INTO newsletter (name, email, email_normalized) VALUES (?, ?, ?)
+ON CONFLICT DO NOTHING
+RETURNING id;
+"""
+FIND_SUBSCRIBER = "SELECT 1 FROM newsletter WHERE email_normalized = ? LIMIT 1;"
+INSERT_CONTACT = """
+INSERT INTO contacts (name, email, message, signature, near_duplicate) VALUES (?, ?, ?, ?, ?);
+"""
+
+# Tablas consultables desde el panel de administración y columnas que se muestran y exportan
+ADMIN_TABLES = {
+    "newsletter": ("id", "name", "email", "created_at"),
+    "contacts": ("id", "name", "email", "message", "near_duplicate", "created_at"),
+}
+
+# Filas por lectura al recorrer una tabla completa (exportaciones)
+EXPORT_CHUNK_SIZE = 5000
+
+# Resultados posibles de un alta en la newsletter
+SUBSCRIBE_NEW = "new"
+SUBSCRIBE_EXISTING = "already-subscribed"
+SUBSCRIBE_INVALID = "invalid"
+
+# Pool de conexiones seguro entre hilos (una instancia por base de datos y proceso).
+# Con una URL de PostgreSQL las conexiones son PostgresConnection, con la misma interfaz que sqlite3.
+class ConnectionPool:
+    def __init__(self, db_path, size=POOL_SIZE):
+        self.db_path = db_path
+        self.size = size
+        self.server = is_postgres_url(db_path)
+        # Excepción base de la base de datos, para capturar sus errores sin depender del backend
+        self.error = database_error() if self.server else sqlite3.Error
+        # Subclase de self.error que se lanza cuando el pool está agotado, como un bloqueo de la base de datos
+        self.busy_error = operational_error() if self.server else sqlite3.OperationalError
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._created = 0
+        self._lock = threading.Lock()
+
+    # Abre una conexión nueva con WAL, espera ante bloqueos y caché de sentencias
+    def _open(self):
+        if self.server:
+            return postgres_connect(self.db_path)
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=BUSY_TIMEOUT_SECONDS,
+            check_same_thread=False,
+            cached_statements=CACHED_STATEMENTS,
+        )
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        conn.execute(f"PRAGMA busy_timeout={int(BUSY_TIMEOUT_SECONDS * 1000)};")
+        if metrics_enabled():
+            conn.set_trace_callback(count_query)
+        return conn
+
+    # Toma una conexión libre (o crea una si aún no se ha llegado al tamaño del pool). Si todas siguen
+    # ocupadas tras BUSY_TIMEOUT_SECONDS lanza self.busy_error, que el escritor y los formularios ya capturan.
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+        if create:
+            try:
+                return self._open()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        try:
+            return self._idle.get(timeout=BUSY_TIMEOUT_SECONDS)
+        except queue.Empty:
+            raise self.busy_error(
+                f"pool de conexiones agotado: {self.size} conexiones ocupadas durante {BUSY_TIMEOUT_SECONDS:g} s"
+            ) from None
+
+    # Devuelve la conexión al pool, descartando cualquier transacción a medias.
+    # Una conexión rota con el servidor se cierra y deja su hueco para abrir otra.
+    def release(self, conn):
+        if getattr(conn, "broken", False):
+            conn.close()
+            with self._lock:
+                self._created -= 1
+            return
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put_nowait(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    # Cierra todas las conexiones inactivas
+    def close(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+# Base de datos efectiva: la indicada, la de DATABASE_URL o newsletter.db
+def database_location(db_path=None):
+    return db_path or os.getenv("DATABASE_URL") or DB_PATH
+
+
+# Pool compartido por todo el proceso para la ruta indicada.
+# Al crearlo se aplican las migraciones pendientes: el esquema se comprueba una vez por proceso, no en cada rerun.
+def get_pool(db_path=None):
+    db_path = database_location(db_path)
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            ensure_schema(db_path)
+            pool = _pools[db_path] = ConnectionPool(db_path)
+        return pool
+
+
+# Función para conectarse a la base de datos SQLite (conexión prestada por el pool)
+@contextmanager
+def connect_to_database(db_path=None):
+    with get_pool(db_path).connection() as conn:
+        yield conn
+
+
+# Ejecuta varias sentencias (sql, params, interpret) en la transacción abierta y devuelve interpret(cursor)
+# de cada una (None para las que no tienen sql). En PostgreSQL van todas en un solo viaje al servidor.
+def execute_batch(conn, statements):
+    pipeline = getattr(conn, "execute_batch", None)
+    if pipeline is not None:
+        return pipeline(statements)
+    return [None if sql is None else interpret(conn.execute(sql, params)) for sql, params, interpret in statements]
+
+
+# Comprueba si el correo ya está registrado en la newsletter (búsqueda por índice)
+def is_email_registered(email, db_path=None):
+    with connect_to_database(db_path) as conn:
+        return conn.execute(FIND_SUBSCRIBER, (normalize_email(email),)).fetchone() is not None
+
+
+# Parámetros del alta o None si el correo o el nombre no son válidos.
+# El nombre se limpia (clean_name): acaba en la cabecera To de cada número de la newsletter.
+def subscriber_params(name, email):
+    normalized = valid_email(email)
+    name = clean_name(name)
+    if normalized is None or not name:
+        return None
+    return (name, email.strip(), normalized)
+
+
+# Parámetros de un mensaje de contacto o None si no hay que guardarlo (correo no válido o casi
+# duplicado de un mensaje reciente con CONTACT_NEAR_DUPLICATES=drop)
+def contact_params(name, email, message, db_path=None):
+    if valid_email(email) is None:
+        return None
+    # Import diferido: numpy solo se carga al recibir el primer mensaje de contacto
+    from near_duplicates import classify_message
+
+    signature, near_duplicate, drop = classify_message(message, db_path)
+    if drop:
+        return None
+    return (clean_name(name), email.strip(), message, signature, near_duplicate)
+
+
+# Interpreta el resultado del UPSERT: una fila devuelta significa alta nueva
+def subscribe_result(cursor):
+    return SUBSCRIBE_NEW if cursor.fetchone() is not None else SUBSCRIBE_EXISTING
+
+
+# Alta en la newsletter con una única sentencia. Devuelve SUBSCRIBE_NEW, SUBSCRIBE_EXISTING o SUBSCRIBE_INVALID
+def subscribe(name, email, db_path=None):
+    params = subscriber_params(name, email)
+    if params is None:
+        return SUBSCRIBE_INVALID
+    with connect_to_database(db_path) as conn:
+        with conn:
+            return subscribe_result(conn.execute(UPSERT_SUBSCRIBER, params))
+
+
+# Guardar un mensaje de contacto (ruta única para los formularios de Servicios, Demo y Contacto).
+# Devuelve False si no se ha guardado nada (correo no válido o casi duplicado descartado).
+def save_contact(name, email, message, db_path=None):
+    params = contact_params(name, email, message, db_path)
+    if params is None:
+        return False
+    with connect_to_database(db_path) as conn:
+        with conn:
+            conn.execute(INSERT_CONTACT, params)
+    from near_duplicates import index_contact
+
+    index_contact(params[3], db_path)
+    return True
+
+
+# Columnas de una tabla del panel de administración (solo se admiten las de ADMIN_TABLES)
+def admin_columns(table):
+    try:
+        return ADMIN_TABLES[table]
+    except KeyError:
+        raise ValueError(f"Tabla no permitida: {table}") from None
+
+
+# Altas por día calculadas en SQLite (usa el índice de created_at): lista de (día, número)
+def daily_counts(table, since=None, db_path=None):
+    admin_columns(table)
+    sql = f"SELECT substr(created_at, 1, 10) AS day, COUNT(*) FROM {table}"
+    params = ()
+    if since is not None:
+        sql += " WHERE created_at >= ?"
+        params = (since,)
+    sql += " GROUP BY day ORDER BY day;"
+    with connect_to_database(db_path) as conn:
+        return conn.execute(sql, params).fetchall()
+
+
+# Número total de filas de una tabla
+def count_rows(table, db_path=None):
+    admin_columns(table)
+    with connect_to_database(db_path) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table};").fetchone()[0]
+
+
+# Página de filas de la más reciente a la más antigua con paginación por clave (keyset):
+# `before_id` es el id de la última fila de la página anterior, así que cada página cuesta lo
+# mismo sin importar lo lejos que esté. Devuelve las filas y el cursor de la siguiente página.
+def page_rows(table, before_id=None, limit=50, db_path=None):
+    columns = admin_columns(table)
+    sql = f"SELECT {', '.join(columns)} FROM {table}"
+    params = ()
+    if before_id is not None:
+        sql += " WHERE id < ?"
+        params = (before_id,)
+    sql += " ORDER BY id DESC LIMIT ?;"
+    with connect_to_database(db_path) as conn:
+        rows = conn.execute(sql, params + (limit,)).fetchall()
+    next_cursor = rows[-1][0] if len(rows) == limit else None
+    return rows, next_cursor
+
+
+# Recorre una tabla completa por orden de id en bloques de `chunk_size` filas.
+# Cada bloque es una consulta independiente por clave, así que la memoria no depende del tamaño
+# de la tabla y no se mantiene abierta una transacción de lectura durante toda la exportación.
+def iter_row_chunks(table, chunk_size=EXPORT_CHUNK_SIZE, db_path=None):
+    columns = admin_columns(table)
+    sql = f"SELECT {', '.join(columns)} FROM {table} WHERE id > ? ORDER BY id LIMIT ?;"
+    last_id = 0
+    while True:
+        with connect_to_database(db_path) as conn:
+            rows = conn.execute(sql, (last_id, chunk_size)).fetchall()
+        if not rows:
+            return
+        yield rows
+        if len(rows) < chunk_size:
+            return
+        last_id = rows[-1][0]
+
+
+# ---------------------------------------------------------------------------
+# Envíos de la newsletter (dispatch.py)
+# ---------------------------------------------------------------------------
+
+# Estado de cada destinatario de un número de la newsletter
+DELIVERY_SENDING = "sending"    # entregado al envío; sin confirmar si el proceso se interrumpe
+DELIVERY_SENT = "sent"
+DELIVERY_DEFERRED = "deferred"  # error temporal: se reintenta en la siguiente ejecución
+DELIVERY_FAILED = "failed"      # rechazo permanente del servidor: no se reintenta
+
+# Suscriptores pendientes de un número por orden de id (paginación por clave). Los que ya tienen
+# una fila de entrega solo vuelven si quedaron aplazados (o sin confirmar, si se pide).
+PENDING_RECIPIENTS = """
+SELECT n.id, n.name, n.email FROM newsletter AS n
+WHERE n.id > ? AND NOT EXISTS (
+    SELECT 1 FROM newsletter_deliveries AS d
+    WHERE d.issue_id = ? AND d.subscriber_id = n.id AND d.status NOT IN (?, ?)
+)
+ORDER BY n.id LIMIT ?;
+"""
+UPSERT_DELIVERY = """
+INSERT INTO newsletter_deliveries (issue_id, subscriber_id, status, attempts, error)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (issue_id, subscriber_id) DO UPDATE SET
+    status = excluded.status,
+    attempts = newsletter_deliveries.attempts + excluded.attempts,
+    error = excluded.error,
+    updated_at = excluded.updated_at;
+"""
+
+
+# Id del número de la newsletter para una publicación (lo crea la primera vez)
+def ensure_issue(slug, subject, db_path=None):
+    with connect_to_database(db_path) as conn:
+        with conn:
+            conn.execute("INSERT INTO newsletter_issues (slug, subject) VALUES (?, ?) ON CONFLICT DO NOTHING;",
+                         (slug, subject))
+        return conn.execute("SELECT id FROM newsletter_issues WHERE slug = ?;", (slug,)).fetchone()[0]
+
+
+# Destinatarios pendientes de un número en bloques de `chunk_size` filas (id, nombre, correo).
+# Con `resend_unconfirmed` también vuelven los que quedaron en DELIVERY_SENDING al interrumpirse un envío.
+def iter_pending_recipients(issue_id, chunk_size=EXPORT_CHUNK_SIZE, resend_unconfirmed=False, db_path=None):
+    retry = (DELIVERY_DEFERRED, DELIVERY_SENDING if resend_unconfirmed else DELIVERY_DEFERRED)
+    last_id = 0
+    while True:
+        with connect_to_database(db_path) as conn:
+            rows = conn.execute(PENDING_RECIPIENTS, (last_id, issue_id) + retry + (chunk_size,)).fetchall()
+        if not rows:
+            return
+        yield rows
+        if len(rows) < chunk_size:
+            return
+        last_id = rows[-1][0]
+
+
+# Guarda el estado de varios destinatarios en una sola transacción: filas (subscriber_id, estado, error).
+# Cada paso a DELIVERY_SENDING cuenta como un intento.
+def record_deliveries(issue_id, rows, db_path=None):
+    params = [
+        (issue_id, subscriber_id, status, 1 if status == DELIVERY_SENDING else 0, error)
+        for subscriber_id, status, error in rows
+    ]
+    with connect_to_database(db_path) as conn:
+        with conn:
+            conn.executemany(UPSERT_DELIVERY, params)
+
+
+# Número de destinatarios de un número por estado
+def delivery_counts(issue_id, db_path=None):
+    with connect_to_database(db_path) as conn:
+        return dict(conn.execute(
+            "SELECT status, COUNT(*) FROM newsletter_deliveries WHERE issue_id = ? GROUP BY status;", (issue_id,)
+        ).fetchall())
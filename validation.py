@@ -0,0 +1,96 @@
+import os
+import re
+from functools import lru_cache
+
+# Validación y normalización de correos y nombres, compartida por los cuatro formularios y por la capa
+# de almacenamiento para que ninguna fila con un correo inválido llegue a la base de datos.
+
+# Fichero con la lista de dominios de correo desechable (uno por línea), junto a este módulo
+DISPOSABLE_DOMAINS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "disposable_domains.txt")
+
+# Patrón de validación del correo electrónico (compilado una sola vez).
+# Se aplica a la forma ASCII del correo: los dominios internacionales se validan ya en punycode.
+EMAIL_PATTERN = re.compile(r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$")
+
+# Longitud máxima del nombre (va en la cabecera To de la newsletter; el límite de línea de SMTP es 998 bytes)
+MAX_NAME_LENGTH = 100
+
+# Caracteres de control y separadores de línea: en un nombre permitirían inyectar cabeceras de correo
+_CONTROL_CHARACTERS = re.compile(r"[\x00-\x1f\x7f-\x9f\u2028\u2029]+")
+_SPACES = re.compile(r"\s+")
+
+# Veredictos posibles
+EMAIL_VALID = "valid"
+EMAIL_INVALID = "invalid"
+EMAIL_DISPOSABLE = "disposable"
+
+
+# Lista de dominios desechables, leída una sola vez al importar el módulo.
+# Si falta el fichero la aplicación no arranca: sin él se aceptarían los correos desechables sin avisar.
+def _load_disposable_domains(path=DISPOSABLE_DOMAINS_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return frozenset(
+                line.strip().lower() for line in f
+                if line.strip() and not line.lstrip().startswith("#")
+            )
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Falta la lista de dominios desechables: {path}") from None
+
+
+DISPOSABLE_DOMAINS = _load_disposable_domains()
+
+
+# Dominio en su forma ASCII (punycode para los internacionales) y en minúsculas; None si no es válido
+def _ascii_domain(domain):
+    try:
+        return domain.encode("idna").decode("ascii").lower()
+    except UnicodeError:
+        return None
+
+
+# ¿Es el dominio, o alguno de sus dominios padre, un proveedor de correo desechable?
+def _is_disposable(domain):
+    labels = domain.split(".")
+    return any(".".join(labels[i:]) in DISPOSABLE_DOMAINS for i in range(len(labels) - 1))
+
+
+# Comprueba un correo y devuelve (veredicto, correo normalizado o None).
+# La forma normalizada es la clave de duplicados: parte local sin distinguir mayúsculas y
+# dominio en ASCII. Se guardan en caché los últimos veredictos (los reintentos repiten correo).
+@lru_cache(maxsize=4096)
+def check_email(email):
+    email = email.strip()
+    local, at, domain = email.rpartition("@")
+    if not at or not local:
+        return EMAIL_INVALID, None
+    domain = _ascii_domain(domain)
+    if domain is None:
+        return EMAIL_INVALID, None
+    ascii_email = f"{local}@{domain}"
+    if not EMAIL_PATTERN.match(ascii_email):
+        return EMAIL_INVALID, None
+    if _is_disposable(domain):
+        return EMAIL_DISPOSABLE, None
+    return EMAIL_VALID, f"{local.casefold()}@{domain}"
+
+
+# Forma canónica del correo (sin validar): sin espacios, sin distinguir mayúsculas y con el dominio en ASCII
+def normalize_email(email):
+    local, at, domain = email.strip().rpartition("@")
+    if not at:
+        return email.strip().casefold()
+    return f"{local.casefold()}@{_ascii_domain(domain) or domain.casefold()}"
+
+
+# Correo normalizado si es válido y aceptable, o None
+def valid_email(email):
+    verdict, normalized = check_email(email)
+    return normalized if verdict == EMAIL_VALID else None
+
+
+# Nombre tal como se guarda: sin caracteres de control, con los espacios seguidos reducidos a uno
+# y como mucho MAX_NAME_LENGTH caracteres
+def clean_name(name):
+    name = _SPACES.sub(" ", _CONTROL_CHARACTERS.sub(" ", name)).strip()
+    return name[:MAX_NAME_LENGTH].rstrip()
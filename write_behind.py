@@ -0,0 +1,200 @@
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from metrics import stage
+from storage import (
+    INSERT_CONTACT,
+    SUBSCRIBE_INVALID,
+    UPSERT_SUBSCRIBER,
+    contact_params,
+    execute_batch,
+    get_pool,
+    subscribe_result,
+    subscriber_params,
+)
+
+# Umbrales de vaciado: se escribe un lote al llegar a BATCH_SIZE envíos o tras MAX_DELAY segundos
+BATCH_SIZE = 100
+MAX_DELAY_SECONDS = 0.05
+QUEUE_SIZE = 10_000
+ENQUEUE_TIMEOUT_SECONDS = 1.0
+
+_STOP = object()
+
+
+# Resultado por defecto de una escritura: True si se insertó alguna fila
+def _inserted(cursor):
+    return cursor.rowcount > 0
+
+
+# Escritor en segundo plano: agrupa los INSERT de newsletter y contactos en transacciones por lotes.
+# Cada envío devuelve un Future que se resuelve cuando su lote se ha confirmado en disco.
+class BackgroundWriter:
+    def __init__(self, db_path=None, batch_size=BATCH_SIZE, max_delay=MAX_DELAY_SECONDS, queue_size=QUEUE_SIZE):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._warm_thread = None
+        self._lock = threading.Lock()
+
+    # Arranca el hilo escritor la primera vez que se necesita
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="analytiq-writer", daemon=True)
+                self._thread.start()
+
+    # Encola una sentencia; si la cola está llena se escribe de forma síncrona para no perder el envío.
+    # `interpret` convierte el cursor de la sentencia en el resultado del Future.
+    def submit(self, sql, params, interpret=_inserted):
+        future = Future()
+        job = (sql, params, interpret, future)
+        self._ensure_started()
+        try:
+            self._queue.put(job, timeout=ENQUEUE_TIMEOUT_SECONDS)
+        except queue.Full:
+            self._write([job])
+        return future
+
+    # Alta en la newsletter: el Future devuelve SUBSCRIBE_NEW, SUBSCRIBE_EXISTING o SUBSCRIBE_INVALID
+    def submit_subscriber(self, name, email):
+        params = subscriber_params(name, email)
+        if params is None:
+            future = Future()
+            future.set_result(SUBSCRIBE_INVALID)
+            return future
+        return self.submit(UPSERT_SUBSCRIBER, params, subscribe_result)
+
+    # Mensaje de contacto: el Future devuelve True cuando se ha guardado (False si el correo no es válido
+    # o es un casi duplicado descartado). Una vez guardado, el mensaje entra en el índice de casi duplicados.
+    def submit_contact(self, name, email, message):
+        params = contact_params(name, email, message, self.db_path)
+        if params is None:
+            future = Future()
+            future.set_result(False)
+            return future
+        future = self.submit(INSERT_CONTACT, params)
+        signature = params[3]
+        if signature is not None:
+            future.add_done_callback(lambda done: self._index_contact(done, signature))
+        return future
+
+    def _index_contact(self, future, signature):
+        if future.exception() is None and future.result():
+            from near_duplicates import index_contact
+
+            index_contact(signature, self.db_path)
+
+    # Carga en segundo plano el índice de casi duplicados (numpy y los contactos recientes), una vez por
+    # escritor: los formularios de contacto lo piden al mostrarse, así el primer envío no espera a la carga
+    def warm_contacts(self):
+        with self._lock:
+            if self._warm_thread is not None:
+                return
+            self._warm_thread = threading.Thread(target=self._warm_contacts, name="analytiq-near-duplicates",
+                                                 daemon=True)
+            self._warm_thread.start()
+
+    def _warm_contacts(self):
+        from near_duplicates import warm_index
+
+        warm_index(self.db_path)
+
+    # Espera a que se escriba todo lo encolado hasta ahora (los errores de escritura llegan a cada Future)
+    def flush(self, timeout=None):
+        if self._thread is None:
+            return
+        self.submit(None, None).exception(timeout=timeout)
+
+    # Vacía la cola y detiene el hilo escritor
+    def shutdown(self, timeout=None):
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                return
+            batch = [job]
+            stop = False
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    job = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if job is _STOP:
+                    stop = True
+                    break
+                batch.append(job)
+            self._write(batch)
+            if stop:
+                return
+
+    # Escribe un lote completo en una única transacción y resuelve los Futures.
+    # Cualquier error acaba en los Futures del lote: el hilo escritor nunca muere con envíos pendientes.
+    def _write(self, batch):
+        try:
+            pool = get_pool(self.db_path)
+        except Exception as e:
+            # No se puede abrir la base de datos o fallan las migraciones
+            self._fail(batch, e)
+            return
+        try:
+            with stage("db_write"), pool.connection() as conn:
+                with conn:
+                    results = execute_batch(conn, [(sql, params, interpret) for sql, params, interpret, _ in batch])
+        except pool.error as e:
+            # Si falla un lote, se reintenta envío a envío para aislar la fila problemática
+            if len(batch) > 1:
+                for job in batch:
+                    self._write([job])
+            else:
+                self._fail(batch, e)
+            return
+        except Exception as e:
+            self._fail(batch, e)
+            return
+        for (_, _, _, future), result in zip(batch, results):
+            future.set_result(result)
+
+    @staticmethod
+    def _fail(batch, error):
+        for _, _, _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+# Escritor compartido por todo el proceso para la ruta indicada
+def get_writer(db_path=None):
+    with _writers_lock:
+        writer = _writers.get(db_path)
+        if writer is None:
+            writer = _writers[db_path] = BackgroundWriter(db_path)
+        return writer
+
+
+# Al salir del proceso se vacían las colas pendientes
+@atexit.register
+def _shutdown_writers():
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.shutdown(timeout=10)